@@ -0,0 +1,131 @@
+"""
+Benchmark the sync WSGI and async ASGI servers against a slow database.
+
+Serves the same code twice, on gunicorn threads (``config.wsgi``) and on uvicorn
+(``config.asgi``), with ``--latency`` milliseconds added to every query (see
+slow_db.py), and loads one read endpoint from ``--concurrency`` client threads.
+WSGI can run at most workers x threads requests at once. ASGI does not lift
+that bound for database-heavy endpoints: Django's async ORM runs every query
+through thread-sensitive ``sync_to_async``, so the queries still execute one at
+a time on executor threads, and only the waiting between them moves to the event
+loop.
+
+Measured on a 1-CPU container (2 workers, 8 gunicorn threads, GET /activities/,
+100 ms per query, 50 clients) the two servers are level: 38.3 req/s on WSGI,
+39.3 req/s on ASGI. Run it before expecting ASGI to raise throughput.
+
+	python benchmarks/async_views.py --latency 20 --concurrency 200
+	python benchmarks/async_views.py --path /today/ --workers 1
+
+The data lives in a throwaway SQLite file; both servers read the same rows.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+from harness import http_load, report_http, serve, setup_django
+
+BENCH_DIR = Path(__file__).resolve().parent
+
+
+def _seed(activities: int) -> str:
+	"""Create the benchmark user with ``activities`` activities of 3 subtasks; return a token."""
+	setup_django(sqlite=False)
+
+	from datetime import date, timedelta
+
+	from django.core.management import call_command
+	from rest_framework_simplejwt.tokens import RefreshToken
+
+	from planner.models import Activity, Subtask, User
+
+	call_command("migrate", verbosity=0)
+	user = User.objects.create_user(username="bench", email="bench@example.com", password="x")
+	today = date.today()
+	created = Activity.objects.bulk_create(
+		Activity(
+			user=user,
+			title=f"Activity {i}",
+			course_name="Course",
+			description="",
+			due_date=today + timedelta(days=i),
+			status="pending",
+		)
+		for i in range(activities)
+	)
+	Subtask.objects.bulk_create(
+		Subtask(
+			activity_id=activity,
+			name=f"Task {j}",
+			estimated_hours=1,
+			target_date=today + timedelta(days=j),
+			status="pending",
+			ordering=j,
+		)
+		for activity in created
+		for j in range(3)
+	)
+	return str(RefreshToken.for_user(user).access_token)
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+	parser.add_argument("--path", default="/activities/", help="endpoint to load")
+	parser.add_argument("--latency", type=float, default=20.0, help="ms added to every query")
+	parser.add_argument("--workers", type=int, default=2, help="server worker processes")
+	parser.add_argument("--threads", type=int, default=8, help="gunicorn threads per worker")
+	parser.add_argument("--concurrency", type=int, default=200, help="client threads")
+	parser.add_argument("--duration", type=float, default=10.0, help="seconds per server")
+	parser.add_argument("--activities", type=int, default=20)
+	parser.add_argument("--port", type=int, default=8766)
+	args = parser.parse_args()
+
+	with tempfile.TemporaryDirectory() as tmp:
+		os.environ["SUPABASE_DATABASE_URL"] = f"sqlite:///{Path(tmp) / 'bench.sqlite3'}"
+		token = _seed(args.activities)
+
+		env = {
+			key: value for key, value in os.environ.items() if key != "DJANGO_USE_SQLITE_FOR_TESTS"
+		}
+		env |= {
+			"PYTHONPATH": os.pathsep.join(filter(None, [str(BENCH_DIR), env.get("PYTHONPATH")])),
+			"DJANGO_SETTINGS_MODULE": "config.settings",
+			"DJANGO_DEBUG": "False",
+			"BENCH_DB_LATENCY_MS": str(args.latency),
+		}
+		bind = f"127.0.0.1:{args.port}"
+		servers = {
+			"sync WSGI (gunicorn)": [
+				*("-m", "gunicorn", "slow_db:wsgi_application", f"--bind={bind}"),
+				f"--workers={args.workers}",
+				f"--threads={args.threads}",
+				"--log-level=warning",
+			],
+			"async ASGI (uvicorn)": [
+				*("-m", "uvicorn", "slow_db:asgi_application", "--host=127.0.0.1"),
+				f"--port={args.port}",
+				f"--workers={args.workers}",
+				"--log-level=warning",
+			],
+		}
+
+		url = f"http://{bind}{args.path}"
+		headers = {"Authorization": f"Bearer {token}"}
+		results = {}
+		for name, command in servers.items():
+			with serve([sys.executable, *command], env, url, headers):
+				http_load(url, headers, args.concurrency, min(args.duration, 2.0))  # warm-up
+				results[name] = http_load(url, headers, args.concurrency, args.duration)
+
+	report_http(
+		f"GET {args.path}, {args.latency:.0f} ms per query, {args.workers} workers, "
+		f"{args.concurrency} clients, {args.duration:.0f}s per server",
+		results,
+	)
+
+
+if __name__ == "__main__":
+	main()
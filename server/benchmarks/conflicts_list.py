@@ -0,0 +1,150 @@
+"""
+Benchmark GET /conflicts/ for a user with a year of planned days.
+
+"before" replays the old request path, which re-evaluated and wrote the
+conflict of every planned date (one aggregate, one lookup and one write per
+date) before listing. "after" is the current path: reconcile only the dates
+queued as dirty, then list with one indexed SELECT. Both are measured with a
+clean queue (steady polling) and with one date changed since the last read.
+
+	python benchmarks/conflicts_list.py --days 365 --rounds 30
+"""
+
+import argparse
+from datetime import date, timedelta
+
+from harness import measure, report, setup_django, test_database
+
+
+def _legacy_evaluate_day(user, target_date):
+	"""The per-date evaluation GET /conflicts/ used to run for every planned date."""
+	from django.db.models import Sum
+
+	from planner.models import Conflict, Subtask
+
+	total = int(
+		Subtask.objects.filter(
+			activity_id__user=user,
+			target_date=target_date,
+			status__in=["pending", "in_progress"],
+		).aggregate(total=Sum("estimated_hours"))["total"]
+		or 0
+	)
+	if total > user.max_daily_hours:
+		conflict = Conflict.objects.filter(user=user, affected_date=target_date).first()
+		if conflict:
+			conflict.planned_hours = total
+			conflict.max_allowed_hours = user.max_daily_hours
+			conflict.status = "pending"
+			conflict.save(update_fields=["planned_hours", "max_allowed_hours", "status"])
+		else:
+			Conflict.objects.create(
+				user=user,
+				affected_date=target_date,
+				type="overload",
+				planned_hours=total,
+				max_allowed_hours=user.max_daily_hours,
+				status="pending",
+			)
+	else:
+		Conflict.objects.filter(user=user, affected_date=target_date, status="pending").update(
+			status="resolved"
+		)
+
+
+def _seed(days: int):
+	from planner import conflicts, ledger
+	from planner.models import Activity, Subtask, User
+
+	user = User.objects.create_user(
+		username="bench", email="bench@example.com", password="x", max_daily_hours=6
+	)
+	start = date(2099, 1, 1)
+	activity = Activity.objects.create(
+		user=user,
+		title="Year plan",
+		course_name="Bench",
+		description="",
+		due_date=start + timedelta(days=days),
+		status="pending",
+	)
+	# Two subtasks a day; every other day is overloaded.
+	Subtask.objects.bulk_create(
+		[
+			Subtask(
+				activity_id=activity,
+				name=f"Day {i} #{n}",
+				estimated_hours=4 if i % 2 else 2,
+				target_date=start + timedelta(days=i),
+				status="pending",
+				ordering=2 * i + n,
+			)
+			for i in range(days)
+			for n in range(2)
+		],
+		batch_size=500,
+	)
+	ledger.rebuild(user)
+	conflicts.reconcile(user)
+	return user, activity
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+	parser.add_argument("--days", type=int, default=365, help="Planned days for the user.")
+	parser.add_argument("--rounds", type=int, default=30, help="Calls per measured case.")
+	args = parser.parse_args()
+
+	setup_django()
+
+	with test_database():
+		from planner import conflicts
+		from planner.models import Conflict, Subtask
+		from planner.serializers import ConflictSerializer
+
+		user, activity = _seed(args.days)
+		moved = Subtask.objects.filter(activity_id=activity).first()
+
+		def listing():
+			qs = Conflict.objects.filter(user=user, status="pending").order_by("affected_date")
+			return ConflictSerializer(qs, many=True).data
+
+		def before():
+			dates = (
+				Subtask.objects.filter(activity_id__user=user)
+				.values_list("target_date", flat=True)
+				.distinct()
+			)
+			for day in list(dates):
+				_legacy_evaluate_day(user, day)
+			return listing()
+
+		def after():
+			conflicts.reconcile(user)
+			return listing()
+
+		def touch_one_date():
+			# What a single subtask PATCH leaves behind for the next read.
+			conflicts.mark_dirty([(user.id, moved.target_date)])
+
+		def before_dirty():
+			touch_one_date()
+			return before()
+
+		def after_dirty():
+			touch_one_date()
+			return after()
+
+		report(
+			f"GET /conflicts/ data path, {args.days} planned days",
+			{
+				"before (clean)": measure(before, args.rounds),
+				"after (clean)": measure(after, args.rounds),
+				"before (1 dirty date)": measure(before_dirty, args.rounds),
+				"after (1 dirty date)": measure(after_dirty, args.rounds),
+			},
+		)
+
+
+if __name__ == "__main__":
+	main()
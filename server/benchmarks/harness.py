@@ -0,0 +1,142 @@
+"""
+Shared helpers for the benchmark scripts in this directory.
+
+Each script boots Django against a throwaway test database (SQLite unless the
+script says otherwise), builds its dataset, and reports timings with
+``report``. loadtest.py is the exception: it drives a running server over HTTP
+and only needs the standard library. Run them from ``server/``::
+
+	python benchmarks/<script>.py --help
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+SERVER_DIR = Path(__file__).resolve().parent.parent
+
+
+def setup_django(*, sqlite: bool = True) -> None:
+	"""Make ``server/`` importable and configure Django for a benchmark run."""
+	sys.path.insert(0, str(SERVER_DIR))
+	os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+	if sqlite:
+		os.environ["DJANGO_USE_SQLITE_FOR_TESTS"] = "True"
+
+	import django
+
+	django.setup()
+
+
+@contextmanager
+def test_database():
+	"""Create a fresh test database for the duration of the block, then drop it."""
+	from django.db import connection
+	from django.test.utils import setup_test_environment, teardown_test_environment
+
+	setup_test_environment()
+	old_name = connection.settings_dict["NAME"]
+	connection.creation.create_test_db(verbosity=0, autoclobber=True)
+	try:
+		yield
+	finally:
+		connection.creation.destroy_test_db(old_name, verbosity=0)
+		teardown_test_environment()
+
+
+def measure(fn, rounds: int) -> dict:
+	"""Call ``fn`` ``rounds`` times; return latency percentiles (ms) and queries per call."""
+	from django.db import connection
+	from django.test.utils import CaptureQueriesContext
+
+	samples = []
+	query_counts = []
+	for _ in range(rounds):
+		connection.queries_log.clear()
+		with CaptureQueriesContext(connection) as queries:
+			start = time.perf_counter()
+			fn()
+			samples.append((time.perf_counter() - start) * 1000)
+		query_counts.append(len(queries))
+	samples.sort()
+	return {
+		"p50_ms": statistics.median(samples),
+		"p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+		"queries": statistics.mean(query_counts),
+	}
+
+
+def report(title: str, results: dict[str, dict]) -> None:
+	"""Write a small fixed-width table of ``measure`` results to stdout."""
+	sys.stdout.write(f"\n{title}\n")
+	sys.stdout.write(f"{'case':<36}{'p50 ms':>10}{'p95 ms':>10}{'queries':>10}\n")
+	for name, stats in results.items():
+		sys.stdout.write(
+			f"{name:<36}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}{stats['queries']:>10.1f}\n"
+		)
+
+
+def _get(url: str, headers: dict) -> float:
+	request = urllib.request.Request(url, headers=headers)
+	start = time.perf_counter()
+	with urllib.request.urlopen(request, timeout=60) as response:
+		response.read()
+	return (time.perf_counter() - start) * 1000
+
+
+@contextmanager
+def serve(command: list[str], env: dict, probe_url: str, headers: dict):
+	"""Run a server ``command`` from ``server/`` for the block, once ``probe_url`` answers."""
+	server = subprocess.Popen(command, cwd=SERVER_DIR, env=env)
+	try:
+		deadline = time.monotonic() + 30
+		while True:
+			if server.poll() is not None:
+				raise SystemExit(f"{command[2]} exited during startup")
+			try:
+				_get(probe_url, headers)
+				break
+			except OSError:  # refused until the server listens
+				if time.monotonic() > deadline:
+					raise SystemExit(f"{command[2]} did not come up within 30s") from None
+				time.sleep(0.2)
+		yield
+	finally:
+		server.terminate()
+		server.wait()
+
+
+def http_load(url: str, headers: dict, concurrency: int, duration: float) -> dict:
+	"""GET ``url`` from ``concurrency`` threads for ``duration`` seconds; return req/s and ms."""
+	deadline = time.monotonic() + duration
+
+	def client() -> list[float]:
+		samples = []
+		while time.monotonic() < deadline:
+			samples.append(_get(url, headers))
+		return samples
+
+	with ThreadPoolExecutor(concurrency) as pool:
+		batches = list(pool.map(lambda _: client(), range(concurrency)))
+	samples = sorted(sample for batch in batches for sample in batch)
+	return {
+		"rps": len(samples) / duration,
+		"p50_ms": statistics.median(samples),
+		"p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+	}
+
+
+def report_http(title: str, results: dict[str, dict]) -> None:
+	"""Write a fixed-width table of ``http_load`` results to stdout."""
+	sys.stdout.write(f"\n{title}\n")
+	sys.stdout.write(f"{'case':<24}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}\n")
+	for name, stats in results.items():
+		sys.stdout.write(
+			f"{name:<24}{stats['rps']:>10.1f}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}\n"
+		)
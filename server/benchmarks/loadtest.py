@@ -0,0 +1,353 @@
+"""
+HTTP load test: scripted planner sessions against a running server.
+
+Each virtual user logs in through /api/token/, loads the dashboard (/me/,
+/activities/, /today/, /conflicts/, /subjects/), patches one of its subtasks,
+resolves a pending conflict when it has one, and starts over until
+``--duration`` runs out. Latencies are grouped by endpoint; throughput and
+p50/p95/p99 are printed and, with ``--output``, written as JSON that a later run
+reads back with ``--compare``::
+
+	python manage.py runserver 8000  # or gunicorn config.wsgi / uvicorn config.asgi:application
+	python benchmarks/loadtest.py --setup --users 20
+	python benchmarks/loadtest.py --users 20 --duration 60 --output before.json
+	python benchmarks/loadtest.py --users 20 --duration 60 --compare before.json
+
+``--setup`` registers the accounts loadtest-0 ... loadtest-<users - 1> through
+/register/ and gives each ``--activities`` activities whose subtasks overload
+some days; accounts that already exist are left as they are. For accounts with
+thousands of rows, seed them instead with ``python manage.py seed_planner
+--prefix loadtest --password loadtest-password``. ``--server``
+starts runserver, gunicorn or uvicorn on ``--base-url`` for the run instead of
+using one that is already up; it uses the database the environment configures.
+"""
+
+import argparse
+import json
+import math
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from datetime import UTC, date, datetime, timedelta
+from http import HTTPStatus
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from harness import SERVER_DIR, serve
+
+PASSWORD = "loadtest-password"
+STATUSES = ("pending", "in_progress", "completed")
+# Share of subtask edits that change the estimate (and may overload a day again).
+REPLAN_SHARE = 0.5
+
+
+class Recorder:
+	"""Latency samples (ms) and error counts per endpoint, shared by the session threads."""
+
+	def __init__(self):
+		self.samples = defaultdict(list)
+		self.errors = defaultdict(int)
+		self._lock = threading.Lock()
+
+	def add(self, endpoint: str, ms: float, ok: bool) -> None:
+		with self._lock:
+			self.samples[endpoint].append(ms)
+			if not ok:
+				self.errors[endpoint] += 1
+
+
+class Session:
+	"""One virtual user's HTTP client; every request is timed under its endpoint name."""
+
+	def __init__(self, base_url: str, recorder: Recorder | None = None):
+		self.base_url = base_url.rstrip("/")
+		self.recorder = recorder
+		self.token = None
+
+	def request(self, method: str, path: str, endpoint: str | None = None, body=None):
+		headers = {"Content-Type": "application/json"}
+		if self.token:
+			headers["Authorization"] = f"Bearer {self.token}"
+		data = json.dumps(body).encode() if body is not None else None
+		request = urllib.request.Request(
+			self.base_url + path, data=data, method=method, headers=headers
+		)
+		start = time.perf_counter()
+		try:
+			with urllib.request.urlopen(request, timeout=60) as response:
+				status, payload = response.status, response.read()
+		except urllib.error.HTTPError as err:
+			status, payload = err.code, err.read()
+		ms = (time.perf_counter() - start) * 1000
+		if self.recorder is not None:
+			self.recorder.add(endpoint or f"{method} {path}", ms, status < HTTPStatus.BAD_REQUEST)
+		return status, json.loads(payload) if payload else None
+
+	def login(self, username: str) -> None:
+		_, body = self.request(
+			"POST", "/api/token/", body={"identifier": username, "password": PASSWORD}
+		)
+		self.token = body["access"]
+
+
+# Setup
+
+
+def _plan(rng: random.Random, index: int) -> dict:
+	today = date.today()
+	due = today + timedelta(days=rng.randint(7, 30))
+	return {
+		"title": f"Load test activity {index}",
+		"course_name": f"Course {index % 5}",
+		"description": "",
+		"due_date": due.isoformat(),
+		"status": "pending",
+		"subtasks": [
+			{
+				"name": f"Step {step}",
+				"estimated_hours": rng.randint(1, 5),
+				"target_date": (today + timedelta(days=rng.randint(0, 6))).isoformat(),
+			}
+			for step in range(rng.randint(2, 6))
+		],
+	}
+
+
+def setup(base_url: str, users: int, activities: int, seed: int) -> None:
+	"""Register the load-test accounts that do not exist yet and plan their week."""
+	rng = random.Random(seed)
+	for i in range(users):
+		username = f"loadtest-{i}"
+		client = Session(base_url)
+		status, _ = client.request(
+			"POST",
+			"/register/",
+			body={
+				"username": username,
+				"email": f"{username}@example.com",
+				"password": PASSWORD,
+				"password_confirm": PASSWORD,
+			},
+		)
+		if status != HTTPStatus.CREATED:
+			continue
+		client.login(username)
+		for index in range(activities):
+			client.request("POST", "/activities/", body=_plan(rng, index))
+
+
+# Sessions
+
+
+def _resolve_one(client: Session, conflicts: list, activities: list, rng: random.Random) -> None:
+	conflict = rng.choice(conflicts)
+	candidates = [
+		subtask
+		for activity in activities
+		for subtask in activity["subtasks"]
+		if subtask["target_date"] == conflict["affected_date"] and subtask["status"] != "completed"
+	]
+	if candidates:
+		client.request(
+			"POST",
+			f"/conflicts/{conflict['id']}/resolve/",
+			"POST /conflicts/{id}/resolve/",
+			body={
+				"subtask_id": rng.choice(candidates)["id"],
+				"action_type": "reduce_hours",
+				"new_hours": 1,
+			},
+		)
+
+
+def run_session(client: Session, username: str, rng: random.Random, think: float) -> None:
+	"""One scripted visit: log in, load the dashboard, edit a subtask, resolve a conflict."""
+	client.login(username)
+	_, activities = client.request("GET", "/activities/")
+	_, _ = client.request("GET", "/me/")
+	_, _ = client.request("GET", "/today/")
+	_, conflicts = client.request("GET", "/conflicts/")
+	_, _ = client.request("GET", "/subjects/")
+	time.sleep(think)
+
+	subtasks = [(a["id"], s) for a in activities or [] for s in a["subtasks"]]
+	if subtasks:
+		activity_id, subtask = rng.choice(subtasks)
+		# Mix progress with re-planning, which brings conflicts back.
+		change = (
+			{"estimated_hours": rng.randint(1, 6)}
+			if rng.random() < REPLAN_SHARE
+			else {"status": rng.choice(STATUSES)}
+		)
+		client.request(
+			"PATCH",
+			f"/activities/{activity_id}/subtasks/{subtask['id']}/",
+			"PATCH /activities/{id}/subtasks/{id}/",
+			body=change,
+		)
+		time.sleep(think)
+
+	if conflicts:
+		_resolve_one(client, conflicts, activities or [], rng)
+		time.sleep(think)
+
+
+def run(base_url: str, users: int, duration: float, think: float, seed: int) -> Recorder:
+	recorder = Recorder()
+	deadline = time.monotonic() + duration
+
+	def virtual_user(index: int) -> None:
+		rng = random.Random(seed + index)
+		client = Session(base_url, recorder)
+		while time.monotonic() < deadline:
+			run_session(client, f"loadtest-{index}", rng, think)
+
+	threads = [threading.Thread(target=virtual_user, args=(i,)) for i in range(users)]
+	for thread in threads:
+		thread.start()
+	for thread in threads:
+		thread.join()
+	return recorder
+
+
+# Reporting
+
+
+def _percentile(samples: list[float], p: float) -> float:
+	"""Nearest-rank percentile of sorted ``samples``."""
+	return samples[max(0, math.ceil(p / 100 * len(samples)) - 1)]
+
+
+def _stats(samples: list[float], errors: int, elapsed: float) -> dict:
+	samples = sorted(samples)
+	return {
+		"requests": len(samples),
+		"errors": errors,
+		"rps": round(len(samples) / elapsed, 2),
+		**{f"p{p}_ms": round(_percentile(samples, p), 2) for p in (50, 95, 99)},
+	}
+
+
+def summarize(recorder: Recorder, elapsed: float, meta: dict) -> dict:
+	everything = [ms for samples in recorder.samples.values() for ms in samples]
+	return {
+		"meta": meta,
+		"total": _stats(everything, sum(recorder.errors.values()), elapsed),
+		"endpoints": {
+			endpoint: _stats(samples, recorder.errors[endpoint], elapsed)
+			for endpoint, samples in sorted(recorder.samples.items())
+		},
+	}
+
+
+def print_summary(result: dict, baseline: dict | None = None) -> None:
+	write = sys.stdout.write
+	meta = result["meta"]
+	write(
+		f"\n{meta['base_url']}, {meta['users']} users, {meta['duration_s']:.0f}s, "
+		f"commit {meta['git_commit'] or '?'}\n"
+	)
+	write(
+		f"{'endpoint':<40}{'reqs':>7}{'err':>5}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+	)
+	write(f"{'p95 before':>12}\n" if baseline else "\n")
+	rows = {**result["endpoints"], "TOTAL": result["total"]}
+	for endpoint, stats in rows.items():
+		write(
+			f"{endpoint:<40}{stats['requests']:>7}{stats['errors']:>5}{stats['rps']:>9.1f}"
+			f"{stats['p50_ms']:>9.1f}{stats['p95_ms']:>9.1f}{stats['p99_ms']:>9.1f}"
+		)
+		if baseline:
+			before = (
+				baseline["total"] if endpoint == "TOTAL" else baseline["endpoints"].get(endpoint)
+			)
+			write(f"{before['p95_ms']:>12.1f}" if before else f"{'-':>12}")
+		write("\n")
+
+
+def _git_commit() -> str | None:
+	try:
+		done = subprocess.run(
+			["git", "rev-parse", "--short", "HEAD"],
+			cwd=SERVER_DIR,
+			capture_output=True,
+			text=True,
+			check=False,
+		)
+	except OSError:  # git is not installed
+		return None
+	return done.stdout.strip() if done.returncode == 0 else None
+
+
+def _server_command(server: str, base_url: str) -> list[str]:
+	address = urlsplit(base_url)
+	host, port = address.hostname, str(address.port or 80)
+	return {
+		"runserver": [sys.executable, "manage.py", "runserver", f"{host}:{port}", "--noreload"],
+		"gunicorn": [
+			*(sys.executable, "-m", "gunicorn", "config.wsgi", f"--bind={host}:{port}"),
+			"--workers=2",
+			"--threads=8",
+		],
+		"uvicorn": [
+			*(sys.executable, "-m", "uvicorn", "config.asgi:application"),
+			*(f"--host={host}", f"--port={port}", "--workers=2"),
+		],
+	}[server]
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+	parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+	parser.add_argument("--server", choices=("runserver", "gunicorn", "uvicorn"))
+	parser.add_argument("--setup", action="store_true", help="create the accounts and exit")
+	parser.add_argument("--users", type=int, default=10, help="concurrent virtual users")
+	parser.add_argument("--activities", type=int, default=10, help="activities per account")
+	parser.add_argument("--duration", type=float, default=30.0, help="seconds to run")
+	parser.add_argument("--think", type=float, default=0.0, help="seconds between steps")
+	parser.add_argument("--seed", type=int, default=1)
+	parser.add_argument("--output", help="write the results to this JSON file")
+	parser.add_argument("--compare", help="JSON results of an earlier run to compare with")
+	args = parser.parse_args()
+
+	def go() -> None:
+		if args.setup:
+			setup(args.base_url, args.users, args.activities, args.seed)
+			return
+		started_at = datetime.now(UTC)
+		recorder = run(args.base_url, args.users, args.duration, args.think, args.seed)
+		elapsed = (datetime.now(UTC) - started_at).total_seconds()
+		meta = {
+			"started_at": started_at.isoformat(),
+			"git_commit": _git_commit(),
+			"base_url": args.base_url,
+			"server": args.server,
+			"users": args.users,
+			"duration_s": elapsed,
+			"think_s": args.think,
+			"seed": args.seed,
+		}
+		result = summarize(recorder, elapsed, meta)
+		baseline = None
+		if args.compare:
+			baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+		print_summary(result, baseline)
+		if args.output:
+			Path(args.output).write_text(json.dumps(result, indent=2), encoding="utf-8")
+
+	if not args.server:
+		go()
+		return
+	# The Swagger UI page is a static template: ready as soon as Django answers.
+	probe = f"{args.base_url.rstrip('/')}/api/docs/"
+	with serve(_server_command(args.server, args.base_url), None, probe, {}):
+		go()
+
+
+if __name__ == "__main__":
+	main()
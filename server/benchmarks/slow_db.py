@@ -0,0 +1,42 @@
+"""
+The project's WSGI and ASGI applications with an artificial delay before every
+database query, for benchmark servers::
+
+	gunicorn slow_db:wsgi_application
+	uvicorn slow_db:asgi_application
+
+``BENCH_DB_LATENCY_MS`` is slept in the thread running each query, like a round
+trip to a remote database would be. Each application is imported on first use:
+config.asgi sets ``PLANNER_ASGI``, which must not leak into the WSGI server.
+"""
+
+import importlib
+import os
+import time
+
+from django.db.backends.signals import connection_created
+
+_MODULES = {"asgi_application": "config.asgi", "wsgi_application": "config.wsgi"}
+
+__all__ = list(_MODULES)
+
+LATENCY = float(os.environ.get("BENCH_DB_LATENCY_MS", "0")) / 1000
+
+
+def _delay(execute, sql, params, many, context):
+	time.sleep(LATENCY)
+	return execute(sql, params, many, context)
+
+
+def _add_delay(connection, **_kwargs):
+	if LATENCY and _delay not in connection.execute_wrappers:
+		connection.execute_wrappers.append(_delay)
+
+
+connection_created.connect(_add_delay)
+
+
+def __getattr__(name):
+	if name not in _MODULES:
+		raise AttributeError(name)
+	return importlib.import_module(_MODULES[name]).application
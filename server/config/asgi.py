@@ -2,6 +2,11 @@
 ASGI config for config project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it with ``uvicorn config.asgi:application --workers N`` (``make run-back-asgi``);
+the read-heavy endpoints then run as coroutines, see planner/async_views.py.
+Persistent database connections are not reused under ASGI, so this entry point
+turns them off; set ``PLANNER_DB_POOL=True`` to keep reusing connections (see
+config/database.py).
 
 For more information on this file, see
 https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
@@ -12,5 +17,6 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+os.environ["PLANNER_ASGI"] = "True"
 
 application = get_asgi_application()
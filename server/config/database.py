@@ -0,0 +1,60 @@
+"""
+Connection settings for the Postgres (Supabase) database.
+
+Opening a connection to the remote database costs a TLS and a Postgres
+handshake, so connections are reused in one of two ways:
+
+* persistent (default): every worker thread keeps its connection for
+  ``DJANGO_DB_CONN_MAX_AGE`` seconds (600) and checks it before reuse;
+* pooled (``PLANNER_DB_POOL=True``): every worker process shares a psycopg
+  pool; connections are checked on checkout.
+
+Under ASGI (config/asgi.py sets ``PLANNER_ASGI=True``) Django runs each
+request's database work through ``sync_to_async`` on an executor thread that is
+not kept from one request to the next, so a persistent connection would stay
+open, unused, on a thread no later request runs on. There the persistent mode
+falls back to closing connections after every request; use the pool to reuse
+them.
+
+A pool belongs to one worker process, so its default maximum size is the
+connection budget ``PLANNER_DB_POOL_MAX_CONNECTIONS`` (20) split across
+``WEB_CONCURRENCY`` workers (gunicorn reads the same variable).
+``PLANNER_DB_POOL_MAX_SIZE``, ``PLANNER_DB_POOL_MIN_SIZE`` (2) and
+``PLANNER_DB_POOL_TIMEOUT`` (seconds to wait for a free connection, 10) override
+the defaults. GET /health/db-pool/ reports the pool counters of the worker that
+serves it.
+"""
+
+from collections.abc import Mapping
+
+import dj_database_url
+
+
+def pool_options(environ: Mapping[str, str]) -> dict | None:
+	"""Keyword arguments for psycopg's ConnectionPool, or None when pooling is off."""
+	if environ.get("PLANNER_DB_POOL", "False") != "True":
+		return None
+	workers = max(1, int(environ.get("WEB_CONCURRENCY", "1")))
+	budget = int(environ.get("PLANNER_DB_POOL_MAX_CONNECTIONS", "20"))
+	max_size = int(environ.get("PLANNER_DB_POOL_MAX_SIZE") or max(1, budget // workers))
+	return {
+		"min_size": min(int(environ.get("PLANNER_DB_POOL_MIN_SIZE", "2")), max_size),
+		"max_size": max_size,
+		"timeout": float(environ.get("PLANNER_DB_POOL_TIMEOUT", "10")),
+	}
+
+
+def database(url: str, environ: Mapping[str, str]) -> dict:
+	"""The ``DATABASES["default"]`` entry for ``url``."""
+	pool = pool_options(environ)
+	# Django hands pooled connections back after every request, and ASGI requests
+	# cannot reuse a persistent one.
+	persistent = not pool and environ.get("PLANNER_ASGI", "False") != "True"
+	config = dj_database_url.parse(
+		url,
+		conn_max_age=int(environ.get("DJANGO_DB_CONN_MAX_AGE", "600")) if persistent else 0,
+		conn_health_checks=True,
+	)
+	if pool:
+		config.setdefault("OPTIONS", {})["pool"] = pool
+	return config
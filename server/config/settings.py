@@ -6,9 +6,10 @@ import os
 import sys
 from pathlib import Path
 
-import dj_database_url
 from dotenv import load_dotenv
 
+from config.database import database
+
 load_dotenv()
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -76,7 +77,8 @@ if RUNNING_TESTS:
 		}
 	}
 elif DATABASE_URL:
-	DATABASES = {"default": dj_database_url.parse(DATABASE_URL)}
+	# Persistent or pooled connections, see config/database.py.
+	DATABASES = {"default": database(DATABASE_URL, os.environ)}
 else:
 	# Fallback to SQLite for local development without Supabase
 	DATABASES = {
@@ -107,6 +109,34 @@ SPECTACULAR_SETTINGS = {
 
 CORS_ALLOW_ALL_ORIGINS = True  # For development only
 
+# How writes trigger overload-conflict evaluation:
+# "deferred" queues a check that `manage.py run_conflict_worker` (or the next
+# read of /conflicts/) evaluates; "sync" evaluates inside the write request.
+PLANNER_CONFLICT_EVALUATION = os.environ.get("PLANNER_CONFLICT_EVALUATION", "deferred")
+
+# Set by config/asgi.py: the read-heavy views dispatch as coroutines only when
+# served over ASGI (see planner/async_views.py).
+PLANNER_ASGI = os.environ.get("PLANNER_ASGI", "False") == "True"
+
+# Response cache for GET /today/, keyed by user, data version, filters and date
+# (see planner/today_cache.py). Local memory by default; set
+# PLANNER_TODAY_CACHE_DIR to share a file-based cache between worker processes.
+PLANNER_TODAY_CACHE_DIR = os.environ.get("PLANNER_TODAY_CACHE_DIR")
+CACHES = {
+	"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+	"today": {
+		"BACKEND": (
+			"django.core.cache.backends.filebased.FileBasedCache"
+			if PLANNER_TODAY_CACHE_DIR
+			else "django.core.cache.backends.locmem.LocMemCache"
+		),
+		"LOCATION": PLANNER_TODAY_CACHE_DIR or "planner-today",
+		# Bounds staleness after writes made outside the API (e.g. the admin).
+		"TIMEOUT": 300,
+		"OPTIONS": {"MAX_ENTRIES": 5000},
+	},
+}
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
 	{"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
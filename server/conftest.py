@@ -1,8 +1,64 @@
+import time
+import traceback
+from contextlib import contextmanager
+from pathlib import Path
+
 import pytest
+from django.core.cache import caches
+from django.db import connection
 from rest_framework.test import APIClient
 
+from planner import today_cache
 from planner.models import User
 
+SERVER_DIR = Path(__file__).resolve().parent
+# Project frames shown for each statement of a query budget report, innermost first.
+ORIGIN_FRAMES = 3
+
+
+def _in_project(filename: str) -> bool:
+	"""Application code: under server/, but not a test, this file or an installed package."""
+	path = Path(filename)
+	return (
+		path.is_relative_to(SERVER_DIR)
+		and path != Path(__file__).resolve()
+		and not {"tests", ".venv", "site-packages"} & set(path.parts)
+	)
+
+
+class QueryRecorder:
+	"""Execute wrapper keeping each SQL statement with its duration and project call site."""
+
+	def __init__(self):
+		self.queries = []
+
+	def __call__(self, execute, sql, params, many, context):
+		start = time.perf_counter()
+		try:
+			return execute(sql, params, many, context)
+		finally:
+			ms = (time.perf_counter() - start) * 1000
+			self.queries.append((sql, ms, self._origin()))
+
+	@staticmethod
+	def _origin() -> list[str]:
+		frames = [frame for frame in traceback.extract_stack() if _in_project(frame.filename)]
+		return [
+			f"{Path(frame.filename).relative_to(SERVER_DIR)}:{frame.lineno} in {frame.name}"
+			for frame in reversed(frames[-ORIGIN_FRAMES:])
+		]
+
+	@property
+	def total_ms(self) -> float:
+		return sum(ms for _, ms, _ in self.queries)
+
+	def report(self, title: str) -> str:
+		lines = [title]
+		for number, (sql, ms, origin) in enumerate(self.queries, start=1):
+			lines.append(f"{number:>3}. [{ms:.1f} ms] {sql}")
+			lines.extend(f"       from {site}" for site in origin or ["(outside the project)"])
+		return "\n".join(lines)
+
 
 @pytest.fixture
 def user(db):
@@ -40,3 +96,47 @@ def auth_client(user):
 def unauth_client():
 	"""Return an unauthenticated API client."""
 	return APIClient()
+
+
+@pytest.fixture
+def sync_conflicts(settings):
+	"""Evaluate conflicts inside each write instead of queueing a check."""
+	settings.PLANNER_CONFLICT_EVALUATION = "sync"
+
+
+@pytest.fixture(autouse=True)
+def _clear_caches():
+	"""Start every test with empty caches and counters; ids (and thus cache keys) repeat."""
+	for cache in caches.all():
+		cache.clear()
+	today_cache.reset_stats()
+
+
+@pytest.fixture
+def query_budget():
+	"""
+	Context manager that fails the test when its block runs more than ``queries``
+	SQL statements (or spends more than ``ms`` milliseconds in them), listing every
+	statement with where in the project it was issued. Yields the QueryRecorder.
+	"""
+
+	@contextmanager
+	def check(queries: int, *, ms: float | None = None, label: str = "block"):
+		recorder = QueryRecorder()
+		with connection.execute_wrapper(recorder):
+			yield recorder
+		count = len(recorder.queries)
+		if count > queries:
+			pytest.fail(
+				recorder.report(f"{label} ran {count} queries, over its budget of {queries}:"),
+				pytrace=False,
+			)
+		if ms is not None and recorder.total_ms > ms:
+			pytest.fail(
+				recorder.report(
+					f"{label} spent {recorder.total_ms:.1f} ms in SQL, over its budget of {ms} ms:"
+				),
+				pytrace=False,
+			)
+
+	return check
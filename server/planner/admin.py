@@ -3,8 +3,12 @@ from django.contrib import admin
 from .models import (
 	Activity,
 	Conflict,
+	ConflictCheck,
 	ConflictResolution,
+	DailyLoad,
+	DataVersion,
 	Progress,
+	ProgressRollup,
 	Subject,
 	Subtask,
 	User,
@@ -18,4 +22,8 @@ admin.site.register(Activity)
 admin.site.register(Subtask)
 admin.site.register(Progress)
 admin.site.register(Conflict)
+admin.site.register(ConflictCheck)
 admin.site.register(ConflictResolution)
+admin.site.register(DailyLoad)
+admin.site.register(DataVersion)
+admin.site.register(ProgressRollup)
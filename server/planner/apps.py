@@ -1,5 +1,15 @@
 from django.apps import AppConfig
+from django.db.models.signals import pre_delete
 
 
 class PlannerConfig(AppConfig):
 	name = "planner"
+
+	def ready(self):
+		from . import signals
+
+		pre_delete.connect(
+			signals.fold_subject_rollups,
+			sender=self.get_model("Subject"),
+			dispatch_uid="planner.fold_subject_rollups",
+		)
@@ -0,0 +1,197 @@
+"""
+Overload conflict evaluation.
+
+A user's date is overloaded when the planned hours recorded in the DailyLoad
+ledger exceed ``user.max_daily_hours``. Evaluating a date creates or refreshes
+its pending Conflict, or auto-resolves it once the load fits again.
+
+Writes do not evaluate conflicts themselves: they mark the (user, date) pairs
+they touch as dirty by queueing a ConflictCheck and return immediately. The
+queue is drained in the background by ``manage.py run_conflict_worker``, and
+``reconcile`` evaluates whatever is still queued for a user right before their
+conflicts are read. Setting ``PLANNER_CONFLICT_EVALUATION = "sync"`` evaluates
+inside the write instead, which is handy in tests.
+"""
+
+from collections import defaultdict
+from datetime import date
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+
+from . import versions
+from .models import Conflict, ConflictCheck, DailyLoad, User
+
+CONFLICT_FIELDS = ["planned_hours", "max_allowed_hours", "status"]
+
+
+def evaluate_days(user, days=None) -> list[Conflict]:
+	"""
+	Create, update or auto-resolve the user's conflicts for many dates at once.
+
+	All planned totals are read with one query and all existing conflicts with
+	another; the changes are then written with one bulk INSERT and one bulk
+	UPDATE, however many dates are involved, and the user's data version is
+	bumped when anything changed. With ``days=None`` every date that
+	has planned load or a conflict is evaluated.
+
+	A user has at most one conflict per date. The INSERT is an upsert on
+	``(user, affected_date)``, so a row that a concurrent evaluation added after
+	ours was read is refreshed rather than tripping the unique constraint.
+
+	Returns the conflicts that were created or changed.
+	"""
+	loads = DailyLoad.objects.filter(user=user)
+	existing = Conflict.objects.filter(user=user).order_by("affected_date", "id")
+	if days is not None:
+		days = set(days)
+		loads = loads.filter(date__in=days)
+		existing = existing.filter(affected_date__in=days)
+
+	cap: int = user.max_daily_hours
+	overloaded: dict[date, int] = {
+		day: hours for day, hours in loads.values_list("date", "planned_hours") if hours > cap
+	}
+
+	with transaction.atomic():
+		seen: set[date] = set()
+		changed: list[Conflict] = []
+		for conflict in existing.select_for_update():
+			day = conflict.affected_date
+			if day in overloaded:
+				seen.add(day)
+				state = (overloaded[day], cap, "pending")
+				if (conflict.planned_hours, conflict.max_allowed_hours, conflict.status) != state:
+					conflict.planned_hours, conflict.max_allowed_hours, conflict.status = state
+					changed.append(conflict)
+			elif conflict.status == "pending":
+				conflict.status = "resolved"
+				changed.append(conflict)
+
+		created = Conflict.objects.bulk_create(
+			[
+				Conflict(
+					user=user,
+					affected_date=day,
+					type="overload",
+					planned_hours=hours,
+					max_allowed_hours=cap,
+					status="pending",
+				)
+				for day, hours in overloaded.items()
+				if day not in seen
+			],
+			update_conflicts=True,
+			unique_fields=["user", "affected_date"],
+			update_fields=CONFLICT_FIELDS,
+		)
+		Conflict.objects.bulk_update(changed, CONFLICT_FIELDS)
+		if created or changed:
+			versions.bump([user.pk])
+
+	return [*created, *changed]
+
+
+def _evaluate_pairs(pairs) -> None:
+	days_by_user: dict[int, set[date]] = defaultdict(set)
+	for user_id, day in pairs:
+		days_by_user[user_id].add(day)
+	users = User.objects.in_bulk(days_by_user)
+	for user_id, days in days_by_user.items():
+		if user_id in users:
+			evaluate_days(users[user_id], days)
+
+
+def _clear_checks(claimed) -> None:
+	"""
+	Delete the claimed ``(id, queued_at)`` checks.
+
+	A write that re-queued one of them after it was claimed bumped its
+	``queued_at``, so that row no longer matches and stays queued for another pass.
+	"""
+	ConflictCheck.objects.filter(
+		reduce(or_, (Q(id=check_id, queued_at=queued_at) for check_id, queued_at in claimed))
+	).delete()
+
+
+def mark_dirty(pairs) -> None:
+	"""
+	Queue a check for every ``(user_id, date)`` pair.
+
+	A pair that is already queued is not duplicated, so any number of writes to
+	the same user and date collapse into a single evaluation; its ``queued_at`` is
+	bumped instead, which keeps the check queued if a worker or ``reconcile`` has
+	claimed it and may have read the load before this write.
+	"""
+	pairs = set(pairs)
+	if settings.PLANNER_CONFLICT_EVALUATION == "sync":
+		_evaluate_pairs(pairs)
+		return
+	# A stable order keeps concurrent upserts from locking the same rows in turn.
+	ConflictCheck.objects.bulk_create(
+		[ConflictCheck(user_id=user_id, date=day) for user_id, day in sorted(pairs)],
+		update_conflicts=True,
+		unique_fields=["user", "date"],
+		update_fields=["queued_at"],
+	)
+
+
+def mark_user_dirty(user) -> None:
+	"""Queue a check for every date with planned load or a pending conflict (cap changes)."""
+	days = set(DailyLoad.objects.filter(user=user).values_list("date", flat=True))
+	days.update(
+		Conflict.objects.filter(user=user, status="pending").values_list("affected_date", flat=True)
+	)
+	mark_dirty((user.id, day) for day in days)
+
+
+def reconcile(user) -> list[Conflict]:
+	"""
+	Evaluate the user's dirty dates and clear their checks.
+
+	When nothing is dirty this is a single indexed SELECT and takes no locks.
+	Returns the conflicts that were created or changed.
+	"""
+	if not ConflictCheck.objects.filter(user=user).exists():
+		return []
+	with transaction.atomic():
+		checks = list(
+			ConflictCheck.objects.select_for_update()
+			.filter(user=user)
+			.order_by("date")
+			.values_list("id", "queued_at", "date")
+		)
+		if not checks:
+			return []
+		changed = evaluate_days(user, {day for _, _, day in checks})
+		_clear_checks((check_id, queued_at) for check_id, queued_at, _ in checks)
+	return changed
+
+
+def process_checks(limit: int = 100) -> int:
+	"""
+	Claim up to ``limit`` queued checks, evaluate them per user and delete them.
+
+	On PostgreSQL the claim is ``SELECT ... FOR UPDATE SKIP LOCKED``, so several
+	workers can drain the queue concurrently without picking the same rows. A
+	write that re-queues a claimed date may have changed the load after it was
+	read here: its upsert waits for the claim to commit and then queues the date
+	again, and a bumped ``queued_at`` keeps the row from being deleted with the
+	claim. Backends without row locks (SQLite) serialize writers anyway; there two
+	workers may at worst evaluate the same date twice, which is harmless.
+
+	Returns the number of checks processed.
+	"""
+	queue = ConflictCheck.objects.order_by("queued_at", "id")
+	if connection.features.has_select_for_update_skip_locked:
+		queue = queue.select_for_update(skip_locked=True)
+	with transaction.atomic():
+		claimed = list(queue.values_list("id", "queued_at", "user_id", "date")[:limit])
+		if not claimed:
+			return 0
+		_evaluate_pairs((user_id, day) for _, _, user_id, day in claimed)
+		_clear_checks((check_id, queued_at) for check_id, queued_at, _, _ in claimed)
+	return len(claimed)
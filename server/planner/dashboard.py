@@ -0,0 +1,86 @@
+"""
+Aggregates behind GET /dashboard/summary/.
+
+Everything is counted and summed by the database in five queries, however
+many activities and subtasks there are, so the dashboard's charts no longer
+need the full activity list.
+"""
+
+from datetime import date
+
+from django.db.models import Count, Exists, IntegerField, OuterRef, Q, Sum
+from django.db.models.functions import Coalesce
+
+from .models import Activity, Conflict, Subtask
+
+
+def _subtask_counters(today: date, path: str = "") -> dict:
+	"""
+	Subtask aggregates for any grouping; ``path`` leads from the queried model to
+	its subtasks ("subtasks" from Activity, empty from Subtask itself).
+	"""
+
+	def field(name: str) -> str:
+		return f"{path}__{name}" if path else name
+
+	done = Q(**{field("status"): "completed"})
+	rows = path or "id"
+	hours = field("estimated_hours")
+	return {
+		"total_subtasks": Count(rows),
+		"completed_subtasks": Count(rows, filter=done),
+		"total_hours": Coalesce(Sum(hours), 0, output_field=IntegerField()),
+		"completed_hours": Coalesce(Sum(hours, filter=done), 0, output_field=IntegerField()),
+		"overdue_subtasks": Count(rows, filter=Q(**{field("target_date__lt"): today}) & ~done),
+	}
+
+
+def _with_percent(row: dict) -> dict:
+	done, total = row["completed_subtasks"], row["total_subtasks"]
+	row["completion_percent"] = round(done * 100 / total) if total else 0
+	return row
+
+
+def summary(user, today: date) -> dict:
+	"""
+	Return totals, per-activity and per-subject completion and the number of
+	pending conflicts for ``user``. Subtasks are overdue when they are not
+	completed and their target date is before ``today``.
+
+	An activity counts as completed when all of its subtasks are, or when it has
+	none and its own status is "completed".
+	"""
+	activities = Activity.objects.filter(user=user)
+	counters = _subtask_counters(today, "subtasks")
+
+	per_activity = (
+		activities.annotate(**counters)
+		.order_by("due_date", "id")
+		.values("id", "title", "status", "due_date", "subject_id", "course_name", *counters)
+	)
+
+	# Activities linked to a subject are grouped by it; the rest by course name.
+	per_subject = (
+		activities.order_by()
+		.values("subject_id", "course_name")
+		.annotate(activities=Count("id", distinct=True), **counters)
+		.order_by("course_name", "subject_id")
+	)
+
+	totals = Subtask.objects.filter(user=user).live().aggregate(**_subtask_counters(today))
+	subtasks = Subtask.objects.filter(activity_id=OuterRef("pk"))
+	totals |= activities.aggregate(
+		activities=Count("id"),
+		completed_activities=Count(
+			"id",
+			filter=(Exists(subtasks) & ~Exists(subtasks.exclude(status="completed")))
+			| (~Exists(subtasks) & Q(status="completed")),
+		),
+	)
+
+	return {
+		"totals": _with_percent(totals),
+		"pending_conflicts": Conflict.objects.filter(user=user, status="pending").count(),
+		"activities": [_with_percent(row) for row in per_activity],
+		"subjects": [_with_percent(row) for row in per_subject],
+	}
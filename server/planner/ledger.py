@@ -0,0 +1,164 @@
+"""
+Maintenance of the per-user DailyLoad ledger.
+
+Every write that creates, moves, re-estimates, re-statuses or deletes a subtask
+must report the change here, inside the same transaction as the write, so the
+ledger never drifts from the live ``SUM(estimated_hours)`` over active subtasks.
+Every (user, date) whose load changes is marked dirty for conflict evaluation.
+"""
+
+from collections import defaultdict
+from datetime import date
+from functools import reduce
+from operator import or_
+
+from django.db import transaction
+from django.db.models import Case, Count, F, IntegerField, Q, Sum, Value, When
+
+from . import conflicts
+from .models import DailyLoad, Subtask
+
+# Only these statuses count towards a day's planned load (and thus conflicts).
+ACTIVE_STATUSES = ("pending", "in_progress")
+
+# (target_date, hours, count) contribution of a single subtask.
+Load = tuple[date, int, int]
+
+
+def load_of(subtask: Subtask) -> Load:
+	"""Return the contribution of ``subtask`` to its owner's ledger."""
+	if subtask.status in ACTIVE_STATUSES:
+		return subtask.target_date, int(subtask.estimated_hours or 0), 1
+	return subtask.target_date, 0, 0
+
+
+def apply_deltas(deltas: dict[tuple[int, date], list[int]]) -> None:
+	"""
+	Add ``[hours, count]`` to the ledger row of every ``(user_id, date)`` key.
+
+	Takes two statements however many keys there are: missing rows are inserted
+	empty (concurrent inserts of the same row are ignored), then every row is
+	incremented by a single UPDATE whose CASE picks each key's delta.
+	"""
+	deltas = {key: delta for key, delta in deltas.items() if any(delta)}
+	if not deltas:
+		return
+	DailyLoad.objects.bulk_create(
+		[DailyLoad(user_id=user_id, date=day) for user_id, day in deltas],
+		ignore_conflicts=True,
+	)
+	rows = {key: Q(user_id=key[0], date=key[1]) for key in deltas}
+
+	def per_row(position: int) -> Case:
+		return Case(
+			*(When(rows[key], then=Value(delta[position])) for key, delta in deltas.items()),
+			default=Value(0),
+			output_field=IntegerField(),
+		)
+
+	DailyLoad.objects.filter(reduce(or_, rows.values())).update(
+		planned_hours=F("planned_hours") + per_row(0),
+		subtask_count=F("subtask_count") + per_row(1),
+	)
+	conflicts.mark_dirty(deltas.keys())
+
+
+def record_change(user_id: int, before: Load | None = None, after: Load | None = None) -> None:
+	"""Move one subtask's contribution from ``before`` to ``after`` (either may be None)."""
+	record_changes(user_id, [(before, after)])
+
+
+def record_changes(user_id: int, changes) -> None:
+	"""Apply many ``(before, after)`` moves of the user's subtasks as one batch of deltas."""
+	deltas: dict[tuple[int, date], list[int]] = defaultdict(lambda: [0, 0])
+	for before, after in changes:
+		if before is not None:
+			day, hours, count = before
+			deltas[user_id, day][0] -= hours
+			deltas[user_id, day][1] -= count
+		if after is not None:
+			day, hours, count = after
+			deltas[user_id, day][0] += hours
+			deltas[user_id, day][1] += count
+	apply_deltas(deltas)
+
+
+def _grouped_load(subtasks) -> dict[tuple[int, date], list[int]]:
+	rows = (
+		subtasks.filter(status__in=ACTIVE_STATUSES)
+		.order_by()
+		.values("user_id", "target_date")
+		.annotate(hours=Sum("estimated_hours"), count=Count("id"))
+	)
+	return {
+		(row["user_id"], row["target_date"]): [int(row["hours"] or 0), row["count"]] for row in rows
+	}
+
+
+def add_subtasks(subtasks) -> None:
+	"""Add every active subtask of the ``subtasks`` queryset to the ledger."""
+	apply_deltas(_grouped_load(subtasks))
+
+
+def remove_subtasks(subtasks) -> None:
+	"""Subtract every active subtask of the ``subtasks`` queryset; call before deleting them."""
+	apply_deltas({key: [-hours, -count] for key, (hours, count) in _grouped_load(subtasks).items()})
+
+
+def _scoped_subtasks(user=None):
+	qs = Subtask.objects.live()
+	if user is not None:
+		qs = qs.filter(user=user)
+	return qs
+
+
+def _scoped_ledger(user=None):
+	qs = DailyLoad.objects.all()
+	if user is not None:
+		qs = qs.filter(user=user)
+	return qs
+
+
+def find_drift(user=None) -> list[dict]:
+	"""
+	Compare the ledger with the live aggregate over subtasks.
+
+	Returns one entry per (user, date) whose ledger row disagrees with the live
+	totals; an empty ledger row and a missing one are considered equal.
+	"""
+	live = _grouped_load(_scoped_subtasks(user))
+	stored = {
+		(row.user_id, row.date): [row.planned_hours, row.subtask_count]
+		for row in _scoped_ledger(user)
+	}
+	drift = []
+	for key in sorted(live.keys() | stored.keys()):
+		expected = live.get(key, [0, 0])
+		actual = stored.get(key, [0, 0])
+		if expected != actual:
+			drift.append(
+				{
+					"user_id": key[0],
+					"date": key[1],
+					"expected": tuple(expected),
+					"actual": tuple(actual),
+				}
+			)
+	return drift
+
+
+def rebuild(user=None) -> int:
+	"""Recompute the ledger from the live aggregate. Returns the number of rows written."""
+	with transaction.atomic():
+		live = _grouped_load(_scoped_subtasks(user))
+		stale = set(_scoped_ledger(user).values_list("user_id", "date"))
+		_scoped_ledger(user).delete()
+		DailyLoad.objects.bulk_create(
+			[
+				DailyLoad(user_id=user_id, date=day, planned_hours=hours, subtask_count=count)
+				for (user_id, day), (hours, count) in live.items()
+			],
+			batch_size=1000,
+		)
+		conflicts.mark_dirty(stale | live.keys())
+	return len(live)
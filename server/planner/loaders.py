@@ -0,0 +1,63 @@
+"""
+Request-scoped identity map for the objects a subtask request revolves around.
+
+A single subtask request needs its parent Activity in several places (the
+queryset, the serializer context and the handler itself). Loading through this
+module fetches each object once and hands back the same instance afterwards,
+so lookups, validation and writes all see one copy. The map lives on the
+request and is gone when the request is.
+"""
+
+from .models import Activity, Subtask
+
+_ATTR = "_planner_identity_map"
+
+
+def _identity_map(request) -> dict:
+	identity_map = getattr(request, _ATTR, None)
+	if identity_map is None:
+		identity_map = {}
+		setattr(request, _ATTR, identity_map)
+	return identity_map
+
+
+def activity(request, activity_id: int) -> Activity:
+	"""
+	Return the requesting user's activity ``activity_id``, querying at most once
+	per request. Raises ``Activity.DoesNotExist`` for unknown or foreign ids.
+	"""
+	identity_map = _identity_map(request)
+	key = (Activity, activity_id)
+	if key not in identity_map:
+		identity_map[key] = Activity.objects.get(id=activity_id, user=request.user)
+	return identity_map[key]
+
+
+def subtask(request, parent: Activity, subtask_id: int) -> Subtask:
+	"""
+	Return subtask ``subtask_id`` of ``parent``, querying at most once per
+	request. The subtask points at ``parent`` itself, so following its activity
+	does not fetch the row again. Raises ``Subtask.DoesNotExist`` when the
+	subtask does not belong to ``parent``.
+	"""
+	identity_map = _identity_map(request)
+	key = (Subtask, parent.pk, subtask_id)
+	if key not in identity_map:
+		found = Subtask.objects.get(id=subtask_id, activity_id=parent)
+		found.activity_id = parent
+		identity_map[key] = found
+	return identity_map[key]
+
+
+def lock_subtask(request, parent: Activity, subtask_id: int) -> Subtask:
+	"""
+	Re-read subtask ``subtask_id`` of ``parent`` with a row lock and make it the
+	request's copy. Call it inside the transaction that writes the subtask: a
+	concurrent write to the same subtask waits for the lock and then reads this
+	write's result, so ledger deltas computed from the returned row never start
+	from a stale load. Raises ``Subtask.DoesNotExist`` when the subtask is gone.
+	"""
+	found = Subtask.objects.select_for_update().get(id=subtask_id, activity_id=parent)
+	found.activity_id = parent
+	_identity_map(request)[Subtask, parent.pk, subtask_id] = found
+	return found
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from planner import subjects
+
+
+class Command(BaseCommand):
+	help = (
+		"Link activities that have no subject to the Subject named like their course, in "
+		"primary-key batches that each commit on their own. Safe to interrupt and re-run: "
+		"linked activities are skipped, and --after-id resumes from a reported position."
+	)
+
+	def add_arguments(self, parser):
+		parser.add_argument(
+			"--batch-size", type=int, default=1000, help="Activities per batch (default 1000)."
+		)
+		parser.add_argument(
+			"--after-id", type=int, default=0, help="Only process activities with a larger id."
+		)
+		parser.add_argument(
+			"--create-missing",
+			action="store_true",
+			help="Create a Subject for course names that have none instead of skipping them.",
+		)
+
+	def handle(self, *args, **options):
+		if options["batch_size"] < 1:
+			raise CommandError("--batch-size must be a positive integer")
+		after_id, total = options["after_id"], 0
+		while True:
+			last_id, linked = subjects.link_batch(
+				after_id, options["batch_size"], create_missing=options["create_missing"]
+			)
+			if last_id is None:
+				break
+			after_id, total = last_id, total + linked
+			self.stdout.write(f"linked={linked} last_id={last_id}")
+		self.stdout.write(self.style.SUCCESS(f"Linked {total} activity(ies) to subjects."))
@@ -0,0 +1,45 @@
+import contextlib
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from planner import purge
+
+
+class Command(BaseCommand):
+	help = (
+		"Remove deleted activities with their subtasks and progress history, "
+		"a bounded batch of rows per transaction."
+	)
+
+	def add_arguments(self, parser):
+		parser.add_argument(
+			"--batch-size", type=int, default=500, help="Rows deleted per transaction."
+		)
+		parser.add_argument(
+			"--sleep",
+			type=float,
+			default=5.0,
+			help="Seconds to wait before polling again when nothing is left to purge.",
+		)
+		parser.add_argument(
+			"--once", action="store_true", help="Exit as soon as nothing is left to purge."
+		)
+
+	def handle(self, *args, **options):
+		if options["batch_size"] < 1:
+			raise CommandError("--batch-size must be at least 1.")
+		self.total = 0
+		with contextlib.suppress(KeyboardInterrupt):
+			self._drain(options["batch_size"], options["sleep"], once=options["once"])
+		self.stdout.write(self.style.SUCCESS(f"Purged {self.total} row(s)."))
+
+	def _drain(self, batch_size: int, sleep: float, *, once: bool) -> None:
+		while True:
+			purged = purge.purge_batch(batch_size)
+			self.total += purged
+			if purged:
+				continue
+			if once:
+				return
+			time.sleep(sleep)
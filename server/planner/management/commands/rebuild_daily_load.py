@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from planner import ledger
+from planner.models import User
+
+
+class Command(BaseCommand):
+	help = (
+		"Rebuild the DailyLoad ledger from the live subtask aggregate, or with --check "
+		"report the (user, date) rows that have drifted from it."
+	)
+
+	def add_arguments(self, parser):
+		parser.add_argument("--user", type=int, help="Only process the user with this id.")
+		parser.add_argument(
+			"--check",
+			action="store_true",
+			help="Compare the ledger with the live aggregate without writing; exit 1 on drift.",
+		)
+
+	def handle(self, *args, **options):
+		user = None
+		if options["user"] is not None:
+			try:
+				user = User.objects.get(pk=options["user"])
+			except User.DoesNotExist as err:
+				raise CommandError(f"There is no user with id {options['user']}") from err
+
+		if options["check"]:
+			drift = ledger.find_drift(user)
+			for entry in drift:
+				self.stdout.write(
+					f"user={entry['user_id']} date={entry['date']} "
+					f"expected={entry['expected']} actual={entry['actual']}"
+				)
+			if drift:
+				raise CommandError(f"{len(drift)} ledger row(s) out of sync")
+			self.stdout.write(self.style.SUCCESS("DailyLoad ledger is consistent."))
+			return
+
+		written = ledger.rebuild(user)
+		self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} DailyLoad row(s)."))
@@ -0,0 +1,43 @@
+import contextlib
+import time
+
+from django.core.management.base import BaseCommand
+
+from planner import conflicts
+
+
+class Command(BaseCommand):
+	help = (
+		"Drain the queue of conflict checks written by subtask and daily-cap changes, "
+		"evaluating each queued (user, date) once."
+	)
+
+	def add_arguments(self, parser):
+		parser.add_argument(
+			"--batch-size", type=int, default=100, help="Checks claimed per transaction."
+		)
+		parser.add_argument(
+			"--sleep",
+			type=float,
+			default=1.0,
+			help="Seconds to wait before polling again when the queue is empty.",
+		)
+		parser.add_argument(
+			"--once", action="store_true", help="Exit as soon as the queue is empty."
+		)
+
+	def handle(self, *args, **options):
+		self.total = 0
+		with contextlib.suppress(KeyboardInterrupt):
+			self._drain(options["batch_size"], options["sleep"], once=options["once"])
+		self.stdout.write(self.style.SUCCESS(f"Processed {self.total} conflict check(s)."))
+
+	def _drain(self, batch_size: int, sleep: float, *, once: bool) -> None:
+		while True:
+			processed = conflicts.process_checks(batch_size)
+			self.total += processed
+			if processed:
+				continue
+			if once:
+				return
+			time.sleep(sleep)
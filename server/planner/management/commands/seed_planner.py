@@ -0,0 +1,89 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from planner import seed
+from planner.models import Subtask, User
+
+
+class Command(BaseCommand):
+	help = (
+		"Fill the database with synthetic users, activities, subtasks, progress history "
+		"and conflicts for benchmarks. The same arguments and --seed give the same data "
+		"(relative to today); rows are written in batches, with COPY on PostgreSQL."
+	)
+
+	def add_arguments(self, parser):
+		parser.add_argument("--users", type=int, default=10, help="Users to create.")
+		parser.add_argument(
+			"--activities", type=int, default=100, help="Activities per user (default 100)."
+		)
+		parser.add_argument(
+			"--subtasks", type=int, default=5, help="Subtasks per activity (default 5)."
+		)
+		parser.add_argument(
+			"--days",
+			type=int,
+			default=90,
+			help="Days around today that due and target dates spread over (default 90).",
+		)
+		parser.add_argument(
+			"--overload-ratio",
+			type=float,
+			default=0.1,
+			help="Share of each user's planned days that exceed their daily cap (default 0.1).",
+		)
+		parser.add_argument("--seed", type=int, default=0, help="Random seed (default 0).")
+		parser.add_argument(
+			"--prefix", default="seed", help="Usernames are <prefix>-0, <prefix>-1, ..."
+		)
+		parser.add_argument(
+			"--password", default=seed.PASSWORD, help="Password of every seeded user."
+		)
+		parser.add_argument(
+			"--batch-size", type=int, default=5000, help="Rows written per transaction."
+		)
+		parser.add_argument(
+			"--no-copy",
+			action="store_true",
+			help="Write with bulk_create on PostgreSQL too, instead of COPY.",
+		)
+
+	def handle(self, *args, **options):
+		for option in ("users", "days", "batch_size"):
+			if options[option] < 1:
+				raise CommandError(f"--{option.replace('_', '-')} must be a positive integer.")
+		for option in ("activities", "subtasks"):
+			if options[option] < 0:
+				raise CommandError(f"--{option} must not be negative.")
+		if not 0 <= options["overload_ratio"] <= 1:
+			raise CommandError("--overload-ratio must be between 0 and 1.")
+		prefix = options["prefix"]
+		if User.objects.filter(username__startswith=f"{prefix}-").exists():
+			raise CommandError(f"Users named {prefix}-* already exist; pick another --prefix.")
+
+		shape = seed.Shape(
+			users=options["users"],
+			activities=options["activities"],
+			subtasks=options["subtasks"],
+			days=options["days"],
+			overload_ratio=options["overload_ratio"],
+		)
+		use_copy = connection.vendor == "postgresql" and not options["no_copy"]
+		writer = seed.Writer(options["batch_size"], use_copy=use_copy)
+		started = time.monotonic()
+		for written in seed.generate(
+			shape, writer, seed=options["seed"], prefix=prefix, password=options["password"]
+		):
+			if options["verbosity"] > 1:
+				elapsed = time.monotonic() - started
+				self.stdout.write(f"{written[Subtask]} subtasks after {elapsed:.1f}s")
+
+		for model, count in written.items():
+			self.stdout.write(f"{model.__name__}: {count}")
+		self.stdout.write(
+			self.style.SUCCESS(
+				f"Seeded {sum(written.values())} row(s) in {time.monotonic() - started:.1f}s."
+			)
+		)
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:22
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def _backfill_daily_load(apps, schema_editor):
+    Subtask = apps.get_model("planner", "Subtask")
+    DailyLoad = apps.get_model("planner", "DailyLoad")
+    rows = (
+        Subtask.objects.filter(status__in=["pending", "in_progress"])
+        .order_by()
+        .values("activity_id__user_id", "target_date")
+        .annotate(hours=Sum("estimated_hours"), count=Count("id"))
+    )
+    DailyLoad.objects.bulk_create(
+        [
+            DailyLoad(
+                user_id=row["activity_id__user_id"],
+                date=row["target_date"],
+                planned_hours=row["hours"] or 0,
+                subtask_count=row["count"],
+            )
+            for row in rows
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planner', '0009_alter_user_email'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyLoad',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('planned_hours', models.IntegerField(default=0)),
+                ('subtask_count', models.IntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_loads', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Daily Load',
+                'verbose_name_plural': 'Daily Loads',
+                'unique_together': {('user', 'date')},
+            },
+        ),
+        migrations.RunPython(_backfill_daily_load, migrations.RunPython.noop),
+    ]
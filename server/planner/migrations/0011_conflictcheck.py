@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:28
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planner', '0010_dailyload'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConflictCheck',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('queued_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Conflict Check',
+                'verbose_name_plural': 'Conflict Checks',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='conflict',
+            index=models.Index(fields=['user', 'status', 'affected_date'], name='planner_con_user_id_d84035_idx'),
+        ),
+        migrations.AddField(
+            model_name='conflictcheck',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='conflict_checks', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterUniqueTogether(
+            name='conflictcheck',
+            unique_together={('user', 'date')},
+        ),
+    ]
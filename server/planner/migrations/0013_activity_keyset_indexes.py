@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planner', '0012_dataversion'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='activity',
+            index=models.Index(fields=['user', 'due_date', 'id'], name='planner_act_user_id_1ac323_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='activity',
+            index=models.Index(fields=['user', 'status', 'due_date', 'id'], name='planner_act_user_id_700f9e_idx'),
+        ),
+    ]
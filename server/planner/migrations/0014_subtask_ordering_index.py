@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planner', '0013_activity_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='subtask',
+            index=models.Index(fields=['activity_id', 'ordering'], name='planner_sub_activit_cfe71d_idx'),
+        ),
+    ]
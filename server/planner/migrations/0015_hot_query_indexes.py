@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:12
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def _drop_duplicate_conflicts(apps, schema_editor):
+    # Conflict evaluation has always kept the oldest row of a (user, date) in
+    # sync and ignored any later duplicates, so those are the ones to drop.
+    Conflict = apps.get_model("planner", "Conflict")
+    duplicated = (
+        Conflict.objects.order_by()
+        .values("user_id", "affected_date")
+        .annotate(rows=Count("id"), keep=Min("id"))
+        .filter(rows__gt=1)
+    )
+    for row in duplicated:
+        Conflict.objects.filter(
+            user_id=row["user_id"], affected_date=row["affected_date"]
+        ).exclude(id=row["keep"]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planner', '0014_subtask_ordering_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(_drop_duplicate_conflicts, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='conflict',
+            name='planner_con_user_id_d84035_idx',
+        ),
+        migrations.AddIndex(
+            model_name='conflict',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['user', 'affected_date'], name='planner_conflict_pending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='progress',
+            index=models.Index(fields=['subtask', 'recorded_at'], name='planner_pro_subtask_b80ac9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subtask',
+            index=models.Index(fields=['activity_id', 'target_date', 'status'], name='planner_sub_activit_30ea32_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='conflict',
+            constraint=models.UniqueConstraint(fields=('user', 'affected_date'), name='planner_conflict_user_date_uniq'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:17
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models, transaction
+from django.db.models import OuterRef, Subquery
+
+BACKFILL_BATCH = 5000
+
+
+def _backfill_subtask_user(apps, schema_editor):
+    # Walk the table in primary-key batches, each committed on its own, so the
+    # backfill never holds row locks on every subtask at once.
+    Activity = apps.get_model("planner", "Activity")
+    Subtask = apps.get_model("planner", "Subtask")
+    owner = Activity.objects.filter(pk=OuterRef("activity_id_id")).values("user_id")[:1]
+    last_id = 0
+    while True:
+        ids = list(
+            Subtask.objects.filter(pk__gt=last_id)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:BACKFILL_BATCH]
+        )
+        if not ids:
+            return
+        with transaction.atomic():
+            Subtask.objects.filter(pk__in=ids, user__isnull=True).update(
+                user_id=Subquery(owner)
+            )
+        last_id = ids[-1]
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('planner', '0015_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='subtask',
+            name='user',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='subtasks', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(_backfill_subtask_user, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='subtask',
+            name='user',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='subtasks', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='subtask',
+            index=models.Index(fields=['user', 'target_date'], name='planner_sub_user_id_2fbdd9_idx'),
+        ),
+    ]
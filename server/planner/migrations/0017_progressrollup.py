@@ -0,0 +1,83 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:21
+
+from collections import defaultdict
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def _backfill_progress_rollups(apps, schema_editor):
+    # Replay each subtask's history in order. Progress rows do not store the
+    # status they replaced or the hours at the time, so an entry is a
+    # transition when it differs from the subtask's previous entry (a new
+    # subtask starts out pending), and completions count today's estimate.
+    Progress = apps.get_model("planner", "Progress")
+    ProgressRollup = apps.get_model("planner", "ProgressRollup")
+    totals = defaultdict(lambda: [0, 0, 0])
+    entries = Progress.objects.order_by("subtask_id", "recorded_at", "id").values_list(
+        "subtask_id",
+        "user_id",
+        "activity__subject_id",
+        "status",
+        "recorded_at",
+        "subtask__estimated_hours",
+    )
+    current_subtask, previous = None, None
+    for subtask_id, user_id, subject_id, status, recorded_at, hours in entries.iterator(
+        chunk_size=2000
+    ):
+        if subtask_id != current_subtask:
+            current_subtask, previous = subtask_id, "pending"
+        if status == previous:
+            continue
+        previous = status
+        row = totals[user_id, timezone.localdate(recorded_at), subject_id]
+        row[2] += 1
+        if status == "completed":
+            row[0] += 1
+            row[1] += hours or 0
+    ProgressRollup.objects.bulk_create(
+        [
+            ProgressRollup(
+                user_id=user_id,
+                date=day,
+                subject_id=subject_id,
+                completed_subtasks=completed,
+                hours_completed=hours,
+                transitions=transitions,
+            )
+            for (user_id, day, subject_id), (completed, hours, transitions) in totals.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planner', '0016_subtask_user'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProgressRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('completed_subtasks', models.IntegerField(default=0)),
+                ('hours_completed', models.IntegerField(default=0)),
+                ('transitions', models.IntegerField(default=0)),
+                ('subject', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='progress_rollups', to='planner.subject')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='progress_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Progress Rollup',
+                'verbose_name_plural': 'Progress Rollups',
+                'indexes': [models.Index(fields=['user', 'date'], name='planner_pro_user_id_56874d_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('subject__isnull', False)), fields=('user', 'date', 'subject'), name='planner_rollup_user_date_subject_uniq'), models.UniqueConstraint(condition=models.Q(('subject__isnull', True)), fields=('user', 'date'), name='planner_rollup_user_date_nosubject_uniq')],
+            },
+        ),
+        migrations.RunPython(_backfill_progress_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planner', '0017_progressrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='activity',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='activity',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', False)), fields=['deleted_at'], name='planner_activity_deleted_idx'),
+        ),
+    ]
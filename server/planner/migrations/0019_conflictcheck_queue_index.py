@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 05:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planner', '0018_activity_soft_delete'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='conflictcheck',
+            index=models.Index(fields=['queued_at', 'id'], name='planner_con_queued__8d77a7_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 05:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planner', '0019_conflictcheck_queue_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='progressrollup',
+            name='subject',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='progress_rollups', to='planner.subject'),
+        ),
+    ]
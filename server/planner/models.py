@@ -1,5 +1,5 @@
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.db import models, transaction
 
 
 class User(AbstractUser):
@@ -49,6 +49,13 @@ class UserSubject(models.Model):
 		return f"{self.user.username} - {self.subject.name}"
 
 
+class LiveActivityManager(models.Manager):
+	"""Activities that have not been deleted; see planner/purge.py."""
+
+	def get_queryset(self):
+		return super().get_queryset().filter(deleted_at__isnull=True)
+
+
 class Activity(models.Model):
 	user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="activities")
 	subject = models.ForeignKey(
@@ -66,13 +73,99 @@ class Activity(models.Model):
 	status = models.CharField(max_length=50)
 	created_at = models.DateTimeField(auto_now_add=True)
 	updated_at = models.DateTimeField(auto_now=True)
+	# Set when the activity is deleted; the rows are removed later, in batches.
+	deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+	objects = LiveActivityManager()
+	all_objects = models.Manager()
+
+	@classmethod
+	def from_db(cls, db, field_names, values):
+		activity = super().from_db(db, field_names, values)
+		if "user_id" in activity.__dict__:
+			activity._loaded_user_id = activity.user_id
+		return activity
+
+	def save(self, *args, **kwargs):
+		loaded_user_id = getattr(self, "_loaded_user_id", self.user_id)
+		if loaded_user_id == self.user_id:
+			super().save(*args, **kwargs)
+		else:
+			with transaction.atomic():
+				super().save(*args, **kwargs)
+				self._move_subtasks(loaded_user_id)
+		self._loaded_user_id = self.user_id
+
+	def _move_subtasks(self, from_user_id):
+		"""
+		Hand the subtasks to the new owner with their load: subtasks carry their
+		owner, and the DailyLoad ledger, its conflict checks and the data versions
+		are per user. A deleted activity's subtasks are already off the ledger.
+		"""
+		from . import ledger, versions
+
+		subtasks = self.subtasks.all()
+		live = self.deleted_at is None
+		if live:
+			# Lock the rows so no concurrent write moves their load in between.
+			list(subtasks.select_for_update().order_by("pk").values_list("pk", flat=True))
+			ledger.remove_subtasks(subtasks)
+		subtasks.update(user_id=self.user_id)
+		if live:
+			ledger.add_subtasks(subtasks)
+		versions.bump([from_user_id, self.user_id])
+
+	class Meta:
+		# Keyset pagination of /activities/ walks (due_date, id) within a user,
+		# optionally narrowed by status.
+		indexes = [
+			models.Index(fields=["user", "due_date", "id"]),
+			models.Index(fields=["user", "status", "due_date", "id"]),
+			# The purger's queue of deleted activities.
+			models.Index(
+				fields=["deleted_at"],
+				condition=models.Q(deleted_at__isnull=False),
+				name="planner_activity_deleted_idx",
+			),
+		]
 
 	def __str__(self):
 		return self.title
 
 
+def _activity_loaded(subtask) -> bool:
+	return Subtask.activity_id.is_cached(subtask)
+
+
+class SubtaskQuerySet(models.QuerySet):
+	def live(self):
+		"""Subtasks whose activity has not been deleted."""
+		return self.filter(activity_id__deleted_at__isnull=True)
+
+	def bulk_create(self, objs, *args, **kwargs):
+		# bulk_create skips save(), so fill in the owner from the activity here.
+		objs = list(objs)
+		unowned = [obj for obj in objs if obj.user_id is None]
+		unloaded = {obj.activity_id_id for obj in unowned if not _activity_loaded(obj)}
+		owners = dict(
+			Activity.all_objects.filter(pk__in=unloaded).values_list("pk", "user_id")
+			if unloaded
+			else ()
+		)
+		for obj in unowned:
+			obj.user_id = (
+				obj.activity_id.user_id if _activity_loaded(obj) else owners.get(obj.activity_id_id)
+			)
+		return super().bulk_create(objs, *args, **kwargs)
+
+
 class Subtask(models.Model):
 	activity_id = models.ForeignKey(Activity, on_delete=models.CASCADE, related_name="subtasks")
+	# Copy of activity_id.user, so per-user subtask queries need no join to Activity.
+	# Set from the activity on save/bulk_create and updated when the activity changes hands.
+	user = models.ForeignKey(
+		User, on_delete=models.CASCADE, related_name="subtasks", editable=False
+	)
 	name = models.CharField(max_length=200)
 	estimated_hours = models.PositiveIntegerField()
 	target_date = models.DateField()
@@ -81,6 +174,23 @@ class Subtask(models.Model):
 	created_at = models.DateTimeField(auto_now_add=True)
 	updated_at = models.DateTimeField(auto_now=True)
 
+	objects = SubtaskQuerySet.as_manager()
+
+	class Meta:
+		indexes = [
+			# Backs the ordered sibling list (see planner/ordering.py).
+			models.Index(fields=["activity_id", "ordering"]),
+			# The has_overdue filter of /activities/.
+			models.Index(fields=["activity_id", "target_date", "status"]),
+			# Per-user date windows: /today/ buckets, ledger rebuilds.
+			models.Index(fields=["user", "target_date"]),
+		]
+
+	def save(self, *args, **kwargs):
+		if self.user_id is None:
+			self.user_id = self.activity_id.user_id
+		super().save(*args, **kwargs)
+
 	def __str__(self):
 		return self.name
 
@@ -95,10 +205,80 @@ class Progress(models.Model):
 	note = models.TextField()
 	recorded_at = models.DateTimeField(auto_now_add=True)
 
+	class Meta:
+		# A subtask's history, newest or oldest first.
+		indexes = [models.Index(fields=["subtask", "recorded_at"])]
+
 	def __str__(self):
 		return f"Progress {self.id}"
 
 
+class ProgressRollup(models.Model):
+	"""
+	Per-user, per-day, per-subject totals of the Progress history: status
+	transitions, subtasks completed and the estimated hours they carried.
+	Incremented in the same transaction as the Progress rows it summarizes (see
+	planner/rollups.py); activities without a subject roll up under a null one.
+	"""
+
+	user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="progress_rollups")
+	date = models.DateField()
+	# Deleting a subject folds its rows into the null subject first (planner/signals.py).
+	subject = models.ForeignKey(
+		Subject,
+		on_delete=models.SET_NULL,
+		null=True,
+		blank=True,
+		related_name="progress_rollups",
+	)
+	completed_subtasks = models.IntegerField(default=0)
+	hours_completed = models.IntegerField(default=0)
+	transitions = models.IntegerField(default=0)
+
+	class Meta:
+		# NULL subjects never clash in a unique index, so they get their own.
+		constraints = [
+			models.UniqueConstraint(
+				fields=["user", "date", "subject"],
+				condition=models.Q(subject__isnull=False),
+				name="planner_rollup_user_date_subject_uniq",
+			),
+			models.UniqueConstraint(
+				fields=["user", "date"],
+				condition=models.Q(subject__isnull=True),
+				name="planner_rollup_user_date_nosubject_uniq",
+			),
+		]
+		indexes = [models.Index(fields=["user", "date"])]
+		verbose_name = "Progress Rollup"
+		verbose_name_plural = "Progress Rollups"
+
+	def __str__(self):
+		return f"{self.user_id} @ {self.date} ({self.subject_id}): {self.completed_subtasks} done"
+
+
+class DailyLoad(models.Model):
+	"""
+	Ledger of the active (pending / in progress) subtask load a user has planned
+	for a given date. It is kept up to date by deltas written in the same
+	transaction as each subtask change, so conflict checks read a single row
+	instead of re-aggregating every subtask of the day.
+	"""
+
+	user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="daily_loads")
+	date = models.DateField()
+	planned_hours = models.IntegerField(default=0)
+	subtask_count = models.IntegerField(default=0)
+
+	class Meta:
+		unique_together = ("user", "date")
+		verbose_name = "Daily Load"
+		verbose_name_plural = "Daily Loads"
+
+	def __str__(self):
+		return f"{self.user_id} @ {self.date}: {self.planned_hours}h"
+
+
 class Conflict(models.Model):
 	user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="conflicts")
 	affected_date = models.DateField()
@@ -108,10 +288,70 @@ class Conflict(models.Model):
 	status = models.CharField(max_length=50)
 	detected_at = models.DateTimeField(auto_now_add=True)
 
+	class Meta:
+		# One conflict per user and date: evaluation reopens or refreshes the
+		# existing row instead of adding another. Reads only ever list the
+		# pending ones, so their index leaves resolved history out.
+		constraints = [
+			models.UniqueConstraint(
+				fields=["user", "affected_date"], name="planner_conflict_user_date_uniq"
+			),
+		]
+		indexes = [
+			models.Index(
+				fields=["user", "affected_date"],
+				condition=models.Q(status="pending"),
+				name="planner_conflict_pending_idx",
+			),
+		]
+
 	def __str__(self):
 		return f"Conflict {self.id} ({self.type})"
 
 
+class ConflictCheck(models.Model):
+	"""
+	A (user, date) pair whose conflict state is stale ("dirty") because its planned
+	load or the user's daily cap changed. Queued checks are drained by the conflict
+	worker, or reconciled in bulk the next time the user's conflicts are read; at
+	most one exists per user and date, so repeated writes collapse into one job.
+	"""
+
+	user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="conflict_checks")
+	date = models.DateField()
+	queued_at = models.DateTimeField(auto_now_add=True)
+
+	class Meta:
+		unique_together = ("user", "date")
+		# The worker claims the oldest checks first (see conflicts.process_checks).
+		indexes = [models.Index(fields=["queued_at", "id"])]
+		verbose_name = "Conflict Check"
+		verbose_name_plural = "Conflict Checks"
+
+	def __str__(self):
+		return f"Check {self.user_id} @ {self.date}"
+
+
+class DataVersion(models.Model):
+	"""
+	Per-user counter bumped by every write that can change the user's activities,
+	today view or conflicts. Conditional GETs derive their ETag from it, so an
+	unchanged payload is answered with 304 without being queried or serialized.
+	"""
+
+	user = models.OneToOneField(
+		User, on_delete=models.CASCADE, primary_key=True, related_name="data_version"
+	)
+	version = models.PositiveBigIntegerField(default=0)
+
+	class Meta:
+		verbose_name = "Data Version"
+		verbose_name_plural = "Data Versions"
+
+	def __str__(self):
+		return f"{self.user_id} v{self.version}"
+
+
 class ConflictResolution(models.Model):
 	conflict = models.OneToOneField(Conflict, on_delete=models.CASCADE, related_name="resolution")
 	action = models.CharField(max_length=100)
@@ -0,0 +1,54 @@
+"""
+Sparse ordering keys for the subtasks of an activity.
+
+Siblings are ordered by ``(ordering, id)``. Keys are spaced ``GAP`` apart when
+rebalanced, so moving a subtask usually just gives it the midpoint between its
+new neighbours: one row UPDATE, no matter how many siblings there are. Only when
+two neighbours have no free key between them are all siblings renumbered, with a
+single bulk UPDATE.
+"""
+
+from .models import Subtask
+
+GAP = 1024
+
+
+def _siblings(subtask) -> list[Subtask]:
+	return list(
+		Subtask.objects.filter(activity_id=subtask.activity_id_id)
+		.exclude(pk=subtask.pk)
+		.order_by("ordering", "id")
+		.only("id", "ordering")
+	)
+
+
+def move(subtask: Subtask, after: int | None) -> bool:
+	"""
+	Place ``subtask`` right after its sibling with id ``after``, or first when
+	``after`` is None. Raises ``Subtask.DoesNotExist`` when ``after`` is not a
+	sibling.
+
+	Returns True when the siblings had to be rebalanced.
+	"""
+	siblings = _siblings(subtask)
+	if after is None:
+		index = 0
+	else:
+		ids = [sibling.pk for sibling in siblings]
+		if after not in ids:
+			raise Subtask.DoesNotExist(after)
+		index = ids.index(after) + 1
+
+	lower = siblings[index - 1].ordering if index > 0 else -1
+	upper = siblings[index].ordering if index < len(siblings) else None
+	key = lower + GAP if upper is None else (lower + upper) // 2
+	if lower < key and (upper is None or key < upper):
+		subtask.ordering = key
+		subtask.save(update_fields=["ordering", "updated_at"])
+		return False
+
+	siblings.insert(index, subtask)
+	for position, sibling in enumerate(siblings, start=1):
+		sibling.ordering = position * GAP
+	Subtask.objects.bulk_update(siblings, ["ordering"])
+	return True
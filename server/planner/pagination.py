@@ -0,0 +1,136 @@
+"""
+Keyset (seek) pagination.
+
+A page is "the next ``limit`` rows after the last row the client saw" in a fixed,
+unique ordering, so each page costs an index range scan of ``limit`` rows no
+matter how deep the client is. Cursors are the ordering values of that last row,
+joined with ``|`` and base64url-encoded; they are opaque to clients.
+"""
+
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import date
+
+from django.db.models import Q
+from rest_framework.exceptions import ParseError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def encode_cursor(values) -> str:
+	"""Opaque cursor for a row whose ordering values are ``values``."""
+	raw = "|".join(value.isoformat() if isinstance(value, date) else str(value) for value in values)
+	return urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str, parsers) -> tuple:
+	"""Parse ``cursor`` with one parser per ordering field; raises ValueError when malformed."""
+	raw_values = urlsafe_b64decode(cursor.encode()).decode().split("|")
+	if len(raw_values) != len(parsers):
+		raise ValueError(cursor)
+	return tuple(parse(raw) for parse, raw in zip(parsers, raw_values, strict=True))
+
+
+def rows_after(fields, values) -> Q:
+	"""Filter for the rows strictly after ``values`` in ascending ``fields`` order."""
+	condition = Q()
+	for i, field in enumerate(fields):
+		equal = dict(zip(fields[:i], values, strict=False))
+		condition |= Q(**equal, **{f"{field}__gt": values[i]})
+	return condition
+
+
+def parse_limit(raw: str | None, default: int, maximum: int) -> int:
+	"""Return the page size in ``raw``; raises ValueError unless it is in 1..maximum."""
+	if raw is None:
+		return default
+	limit = int(raw)
+	if not 1 <= limit <= maximum:
+		raise ValueError(raw)
+	return limit
+
+
+class KeysetPagination(BasePagination):
+	"""
+	Opt-in keyset pagination for a viewset's list action.
+
+	Without ``limit`` or ``cursor`` query parameters the full list is returned as
+	before. With either of them the response is ``{"next", "previous",
+	"results"}``; ``next`` is the URL of the following page, or null on the last
+	one. ``previous`` is always null because the pages only go forward.
+	"""
+
+	ordering: tuple[str, ...] = ("id",)
+	parsers: tuple = (int,)
+	default_limit = 50
+	max_limit = 200
+
+	def paginate_queryset(self, queryset, request, view=None):
+		page = self._page_query(queryset, request)
+		if page is None:
+			return None
+		queryset, limit = page
+		return self._page(list(queryset), limit, request)
+
+	async def apaginate_queryset(self, queryset, request, view=None):
+		"""``paginate_queryset`` for async views, fetching the page with the async ORM."""
+		page = self._page_query(queryset, request)
+		if page is None:
+			return None
+		queryset, limit = page
+		return self._page([row async for row in queryset], limit, request)
+
+	def _page_query(self, queryset, request):
+		"""The query for one page (plus a look-ahead row) and its limit, or None if unpaged."""
+		params = request.query_params
+		if "limit" not in params and "cursor" not in params:
+			return None
+
+		try:
+			limit = parse_limit(params.get("limit"), self.default_limit, self.max_limit)
+		except ValueError as err:
+			raise ParseError(
+				{"errors": {"limit": f"Must be an integer between 1 and {self.max_limit}."}}
+			) from err
+
+		queryset = queryset.order_by(*self.ordering)
+		if "cursor" in params:
+			try:
+				after = decode_cursor(params["cursor"], self.parsers)
+			except ValueError as err:
+				raise ParseError({"errors": {"cursor": "Invalid cursor."}}) from err
+			queryset = queryset.filter(rows_after(self.ordering, after))
+		return queryset[: limit + 1], limit
+
+	def _page(self, rows, limit, request):
+		self.next_url = None
+		if len(rows) > limit:
+			rows = rows[:limit]
+			last = rows[-1]
+			cursor = encode_cursor(getattr(last, field) for field in self.ordering)
+			self.next_url = replace_query_param(request.build_absolute_uri(), "cursor", cursor)
+		return rows
+
+	def get_paginated_response(self, data):
+		return Response({"next": self.next_url, "previous": None, "results": data})
+
+	def get_paginated_response_schema(self, schema):
+		return {
+			"type": "object",
+			"required": ["next", "previous", "results"],
+			"properties": {
+				"next": {
+					"type": "string",
+					"nullable": True,
+					"format": "uri",
+					"example": "http://api.example.org/activities/?limit=50&cursor=MjAyNi0wMy0wMXw0Mg==",
+				},
+				"previous": {"type": "string", "nullable": True, "format": "uri", "example": None},
+				"results": schema,
+			},
+		}
+
+
+class ActivityPagination(KeysetPagination):
+	ordering = ("due_date", "id")
+	parsers = (date.fromisoformat, int)
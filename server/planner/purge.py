@@ -0,0 +1,52 @@
+"""
+Deferred removal of deleted activities.
+
+Deleting an activity (or a subject, with its activities) only stamps
+``Activity.deleted_at``: the default ``Activity.objects`` manager and
+``Subtask.objects.live()`` stop returning the rows at once, and their load
+leaves the DailyLoad ledger in the same transaction, queueing each affected
+date for one conflict check. The rows themselves, which can number in the
+thousands for a subject, are removed afterwards by ``manage.py purge_deleted``
+in short transactions of at most ``batch_size`` rows each: Progress history
+first, then subtasks, then the activities.
+"""
+
+from django.db import transaction
+from django.utils import timezone
+
+from . import ledger, versions
+from .models import Activity, Progress, Subtask
+
+
+def soft_delete(activities) -> None:
+	"""Hide an Activity queryset now and take its load off the ledger; rows are purged later."""
+	with transaction.atomic():
+		versions.bump(activities.values_list("user_id", flat=True))
+		ledger.remove_subtasks(Subtask.objects.filter(activity_id__in=activities))
+		activities.update(deleted_at=timezone.now())
+
+
+def purge_batch(batch_size: int) -> int:
+	"""
+	Delete at most ``batch_size`` rows belonging to deleted activities, in one
+	transaction, and return how many were deleted (0 once nothing is left).
+	"""
+	with transaction.atomic():
+		deleted = list(
+			Activity.all_objects.filter(deleted_at__isnull=False)
+			.order_by("deleted_at", "id")
+			.values_list("id", flat=True)[:batch_size]
+		)
+		if not deleted:
+			return 0
+		# Children first, so no single statement cascades over an unbounded set.
+		for owned in (
+			Progress.objects.filter(activity__in=deleted),
+			Subtask.objects.filter(activity_id__in=deleted),
+		):
+			pks = list(owned.values_list("pk", flat=True)[:batch_size])
+			if pks:
+				owned.model.objects.filter(pk__in=pks).delete()
+				return len(pks)
+		Activity.all_objects.filter(pk__in=deleted).delete()
+		return len(deleted)
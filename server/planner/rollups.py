@@ -0,0 +1,101 @@
+"""
+Daily progress rollups.
+
+Every Progress entry records a subtask's status at the moment it was updated.
+The ProgressRollup table keeps, per user, local day and subject, how many status
+transitions happened, how many of them completed a subtask and the estimated
+hours those subtasks carried. Writes that insert Progress rows report them here
+in the same transaction, so /progress/ reads a handful of pre-aggregated rows
+per day instead of the history itself.
+
+Rollups count events: deleting a subtask (and with it its Progress history)
+later does not take back work that was completed. Deleting a subject does not
+either: ``fold_subject``, run on the subject's pre_delete, moves its rows to the
+null subject first.
+"""
+
+from collections import defaultdict
+from datetime import date
+from functools import reduce
+from operator import or_
+
+from django.db.models import Case, F, IntegerField, Q, Value, When
+from django.utils import timezone
+
+from .models import Progress, ProgressRollup
+
+# (user_id, day, subject_id) a rollup row is kept for; subject_id may be None.
+Key = tuple[int, date, int | None]
+
+COUNTERS = ("completed_subtasks", "hours_completed", "transitions")
+
+
+def _key_filter(key: Key) -> Q:
+	user_id, day, subject_id = key
+	return Q(user_id=user_id, date=day, subject_id=subject_id)
+
+
+def record(entries: list[Progress], previous_statuses: dict[int, str]) -> None:
+	"""
+	Add freshly inserted Progress ``entries`` to the rollups.
+
+	``previous_statuses`` maps each entry's subtask id to the status it had
+	before the write; an entry whose status differs from it is a transition.
+	Takes two statements however many entries there are, like the DailyLoad
+	ledger: missing rows are inserted empty, then one UPDATE adds every row's
+	deltas.
+	"""
+	deltas: dict[Key, list[int]] = defaultdict(lambda: [0, 0, 0])
+	for entry in entries:
+		if entry.status == previous_statuses.get(entry.subtask_id):
+			continue
+		day = timezone.localdate(entry.recorded_at) if entry.recorded_at else timezone.localdate()
+		delta = deltas[entry.user_id, day, entry.activity.subject_id]
+		delta[2] += 1
+		if entry.status == "completed":
+			delta[0] += 1
+			delta[1] += int(entry.subtask.estimated_hours or 0)
+	if deltas:
+		_add(deltas)
+
+
+def fold_subject(subject_id: int) -> None:
+	"""
+	Add the subject's rollups to the null-subject rows of the same user and day
+	and delete them, so /progress/ totals survive the subject being deleted.
+	planner/signals.py calls it in the transaction that deletes the subject.
+	Takes at most four statements however many rows the subject has.
+	"""
+	rows = ProgressRollup.objects.filter(subject_id=subject_id)
+	deltas: dict[Key, list[int]] = {
+		(user_id, day, None): list(counters)
+		for user_id, day, *counters in rows.select_for_update().values_list(
+			"user_id", "date", *COUNTERS
+		)
+	}
+	if deltas:
+		_add(deltas)
+		rows.delete()
+
+
+def _add(deltas: dict[Key, list[int]]) -> None:
+	"""Add each key's deltas (in COUNTERS order) to its rollup row, creating missing rows."""
+	ProgressRollup.objects.bulk_create(
+		[
+			ProgressRollup(user_id=user_id, date=day, subject_id=subject_id)
+			for user_id, day, subject_id in deltas
+		],
+		ignore_conflicts=True,
+	)
+	rows = {key: _key_filter(key) for key in deltas}
+
+	def per_row(position: int) -> Case:
+		return Case(
+			*(When(rows[key], then=Value(delta[position])) for key, delta in deltas.items()),
+			default=Value(0),
+			output_field=IntegerField(),
+		)
+
+	ProgressRollup.objects.filter(reduce(or_, rows.values())).update(
+		**{field: F(field) + per_row(position) for position, field in enumerate(COUNTERS)}
+	)
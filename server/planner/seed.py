@@ -0,0 +1,417 @@
+"""
+Synthetic planner data for benchmarks and load tests.
+
+``generate`` creates complete users as the API would leave them: a few subjects
+each, activities whose subtasks are spread over a window of days around today,
+and the Progress history of every subtask that was started. The derived tables
+(DailyLoad ledger, pending overload Conflicts, ProgressRollups) are computed
+from the generated rows rather than replayed through the write path, so a
+seeded database passes ``rebuild_daily_load --check``. The output depends only
+on the parameters, the seed and today's date.
+
+Rows are buffered per table and written, a whole user at a time, once
+``batch_size`` of them are pending; each batch is one transaction. On
+PostgreSQL every table of a batch is streamed with ``COPY``, and the primary
+keys other rows refer to are drawn from the table's sequence beforehand.
+Elsewhere (or with ``use_copy=False``) batches go through ``bulk_create``.
+"""
+
+import itertools
+import random
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta
+from typing import NamedTuple
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .ledger import ACTIVE_STATUSES
+from .models import (
+	Activity,
+	Conflict,
+	DailyLoad,
+	Progress,
+	ProgressRollup,
+	Subject,
+	Subtask,
+	User,
+	UserSubject,
+)
+from .ordering import GAP
+
+SUBJECT_NAMES = (
+	"Algebra",
+	"Biology",
+	"Chemistry",
+	"History",
+	"Literature",
+	"Physics",
+	"Programming",
+	"Statistics",
+)
+SUBJECTS_PER_USER = 4
+DAILY_CAPS = (6, 8, 10)
+# Subtasks are planned up to this many days before their activity is due.
+LEAD_DAYS = 14
+# Share of past subtasks that were completed; the rest are overdue.
+PAST_COMPLETED_SHARE = 0.8
+# Shares of upcoming subtasks that are already completed / in progress.
+FUTURE_COMPLETED_SHARE = 0.05
+FUTURE_STARTED_SHARE = 0.1
+# An overloaded day carries up to this many hours over the user's cap.
+MAX_OVERLOAD_HOURS = 4
+MAX_COMPLETED_HOURS = 4
+
+PASSWORD = "seed-password"
+
+# Tables in foreign-key order, which is the order a batch writes them in.
+MODELS = (User, UserSubject, Activity, Subtask, Progress, DailyLoad, Conflict, ProgressRollup)
+# Models whose primary keys other rows refer to; they are assigned before writing.
+KEYED = (User, Activity, Subtask)
+
+
+class Shape(NamedTuple):
+	"""How much ``generate`` creates and how it spreads over the calendar."""
+
+	users: int
+	# Per user.
+	activities: int
+	# Per activity.
+	subtasks: int
+	# Width of the window around today that due and target dates fall in.
+	days: int
+	# Share of each user's days with active work that are planned over their cap.
+	overload_ratio: float
+
+
+def _columns(model) -> dict[str, object]:
+	"""Every column a row of ``model`` fills, by attname, with the field default."""
+	return {
+		field.attname: None if field.primary_key else field.get_default()
+		for field in model._meta.concrete_fields
+		if model in KEYED or not field.primary_key
+	}
+
+
+@contextmanager
+def _explicit_timestamps():
+	"""Make bulk_create keep the generated auto_now(_add) values instead of stamping now."""
+	fields = [
+		(field, field.auto_now, field.auto_now_add)
+		for model in MODELS
+		for field in model._meta.concrete_fields
+		if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False)
+	]
+	for field, _, _ in fields:
+		field.auto_now = field.auto_now_add = False
+	try:
+		yield
+	finally:
+		for field, auto_now, auto_now_add in fields:
+			field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Writer:
+	"""
+	Buffers rows per table and writes them in batches of at least ``batch_size``
+	rows; ``use_copy`` (PostgreSQL only) streams them with COPY.
+	"""
+
+	def __init__(self, batch_size: int = 5000, *, use_copy: bool | None = None):
+		self.batch_size = batch_size
+		self.use_copy = connection.vendor == "postgresql" if use_copy is None else use_copy
+		self.columns = {model: _columns(model) for model in MODELS}
+		self.rows = defaultdict(list)
+		self.pending = 0
+		self.written = Counter()
+		self._ids = {}
+
+	def next_id(self, model) -> int:
+		ids = self._ids.get(model)
+		pk = next(ids, None) if ids is not None else None
+		if pk is None:
+			self._ids[model] = ids = self._reserve(model)
+			pk = next(ids)
+		return pk
+
+	def _reserve(self, model):
+		if connection.vendor == "postgresql":
+			# Taken from the sequence, so later inserts through the ORM never collide.
+			with connection.cursor() as cursor:
+				cursor.execute(
+					"SELECT nextval(pg_get_serial_sequence(%s, %s)) FROM generate_series(1, %s)",
+					[model._meta.db_table, model._meta.pk.column, self.batch_size],
+				)
+				return iter([pk for (pk,) in cursor.fetchall()])
+		last = model._base_manager.aggregate(last=Max("pk"))["last"] or 0
+		return itertools.count(last + 1)
+
+	def add(self, model, **values) -> None:
+		self.rows[model].append({**self.columns[model], **values})
+		self.pending += 1
+
+	def end_user(self) -> bool:
+		"""Write the buffered rows if a batch is full; returns whether it did."""
+		if self.pending < self.batch_size:
+			return False
+		self.flush()
+		return True
+
+	def flush(self) -> None:
+		with transaction.atomic():
+			for model in MODELS:
+				rows = self.rows.pop(model, None)
+				if rows:
+					(self._copy if self.use_copy else self._bulk_create)(model, rows)
+					self.written[model] += len(rows)
+		self.pending = 0
+
+	def _copy(self, model, rows: list[dict]) -> None:
+		fields = [
+			field for field in model._meta.concrete_fields if field.attname in self.columns[model]
+		]
+		attnames = [field.attname for field in fields]
+		columns = ", ".join(connection.ops.quote_name(field.column) for field in fields)
+		table = connection.ops.quote_name(model._meta.db_table)
+		with (
+			connection.cursor() as cursor,
+			cursor.cursor.copy(f"COPY {table} ({columns}) FROM STDIN") as copy,
+		):
+			for row in rows:
+				copy.write_row([row[attname] for attname in attnames])
+
+	def _bulk_create(self, model, rows: list[dict]) -> None:
+		with _explicit_timestamps():
+			model._base_manager.bulk_create(
+				[model(**row) for row in rows], batch_size=self.batch_size
+			)
+
+
+def _at(day: date, hour: int) -> datetime:
+	return timezone.make_aware(datetime.combine(day, time(hour)))
+
+
+class _Planner:
+	"""Generates one user at a time into a ``Writer``."""
+
+	def __init__(self, writer: Writer, rng: random.Random, shape: Shape, password: str):
+		self.writer = writer
+		self.rng = rng
+		self.activities = shape.activities
+		self.subtasks = shape.subtasks
+		self.days = shape.days
+		self.overload_ratio = shape.overload_ratio
+		self.password = password
+		self.today = timezone.localdate()
+		self.start = self.today - timedelta(days=shape.days // 2)
+		self.now = timezone.now()
+		self.subjects = sorted(_subject_ids().items())
+
+	def user(self, username: str) -> None:
+		rng, writer = self.rng, self.writer
+		user_id = writer.next_id(User)
+		cap = rng.choice(DAILY_CAPS)
+		writer.add(
+			User,
+			id=user_id,
+			username=username,
+			email=f"{username}@example.com",
+			name=username,
+			password=self.password,
+			max_daily_hours=cap,
+			date_joined=_at(self.start, 8),
+		)
+		own_subjects = rng.sample(self.subjects, min(SUBJECTS_PER_USER, len(self.subjects)))
+		for _, subject_id in own_subjects:
+			writer.add(UserSubject, user_id=user_id, subject_id=subject_id, assigned_at=self.now)
+
+		planned = [
+			self._activity(user_id, rng.choice(own_subjects)) for _ in range(self.activities)
+		]
+		steps = [step for _, _, activity_steps in planned for step in activity_steps]
+		daily_load = self._estimate(steps, cap)
+
+		rollups = defaultdict(lambda: [0, 0, 0])
+		for activity, subject_id, activity_steps in planned:
+			statuses = {step["status"] for step in activity_steps}
+			activity["status"] = (
+				"completed"
+				if statuses == {"completed"}
+				else "pending"
+				if statuses <= {"pending"}
+				else "in_progress"
+			)
+			writer.add(Activity, **activity)
+			for step in activity_steps:
+				writer.add(Subtask, **step)
+				self._history(step, subject_id, rollups)
+
+		for day, (hours, count) in daily_load.items():
+			writer.add(
+				DailyLoad, user_id=user_id, date=day, planned_hours=hours, subtask_count=count
+			)
+			if hours > cap:
+				writer.add(
+					Conflict,
+					user_id=user_id,
+					affected_date=day,
+					type="overload",
+					planned_hours=hours,
+					max_allowed_hours=cap,
+					status="pending",
+					detected_at=self.now,
+				)
+		for (day, subject_id), (completed, hours, transitions) in rollups.items():
+			writer.add(
+				ProgressRollup,
+				user_id=user_id,
+				date=day,
+				subject_id=subject_id,
+				completed_subtasks=completed,
+				hours_completed=hours,
+				transitions=transitions,
+			)
+
+	def _activity(self, user_id: int, subject) -> tuple[dict, int, list[dict]]:
+		rng, writer = self.rng, self.writer
+		name, subject_id = subject
+		activity_id = writer.next_id(Activity)
+		due = self.start + timedelta(days=rng.randrange(self.days))
+		targets = sorted(
+			max(self.start, due - timedelta(days=rng.randint(0, LEAD_DAYS)))
+			for _ in range(self.subtasks)
+		)
+		created = _at(targets[0] if targets else due, 8)
+		steps = [
+			{
+				"id": writer.next_id(Subtask),
+				"activity_id_id": activity_id,
+				"user_id": user_id,
+				"name": f"Step {position + 1}",
+				"target_date": target,
+				"status": self._status(target),
+				"ordering": (position + 1) * GAP,
+				"created_at": created,
+				"updated_at": created,
+			}
+			for position, target in enumerate(targets)
+		]
+		activity = {
+			"id": activity_id,
+			"user_id": user_id,
+			"subject_id": subject_id,
+			"title": f"{name} assignment {activity_id}",
+			"course_name": name,
+			"description": "",
+			"due_date": due,
+			"created_at": created,
+			"updated_at": created,
+		}
+		return activity, subject_id, steps
+
+	def _status(self, target: date) -> str:
+		roll = self.rng.random()
+		if target < self.today:
+			if roll < PAST_COMPLETED_SHARE:
+				return "completed"
+			return self.rng.choice(ACTIVE_STATUSES)
+		if roll < FUTURE_COMPLETED_SHARE:
+			return "completed"
+		if roll < FUTURE_COMPLETED_SHARE + FUTURE_STARTED_SHARE:
+			return "in_progress"
+		return "pending"
+
+	def _estimate(self, steps: list[dict], cap: int) -> dict[date, tuple[int, int]]:
+		"""
+		Set every step's estimated hours and return the active (hours, count) per day.
+
+		A share ``overload_ratio`` of the days with active work is planned over
+		the cap, the others within it; a day with more active subtasks than the
+		cap has hours is overloaded in any case, at one hour per subtask.
+		"""
+		rng = self.rng
+		active = defaultdict(list)
+		for step in steps:
+			if step["status"] in ACTIVE_STATUSES:
+				active[step["target_date"]].append(step)
+			else:
+				step["estimated_hours"] = rng.randint(1, MAX_COMPLETED_HOURS)
+		load = {}
+		for day, day_steps in sorted(active.items()):
+			count = len(day_steps)
+			if rng.random() < self.overload_ratio:
+				budget = max(count, cap + rng.randint(1, MAX_OVERLOAD_HOURS))
+			else:
+				budget = max(count, rng.randint(min(count, cap), cap))
+			hours = [1] * count
+			for _ in range(budget - count):
+				hours[rng.randrange(count)] += 1
+			for step, estimate in zip(day_steps, hours, strict=True):
+				step["estimated_hours"] = estimate
+			load[day] = (budget, count)
+		return load
+
+	def _history(self, step: dict, subject_id: int, rollups) -> None:
+		"""Add the Progress entries that brought ``step`` to its status, and their rollups."""
+		if step["status"] == "pending":
+			return
+		rng = self.rng
+		finished = min(step["target_date"], self.today)
+		entries = [(finished - timedelta(days=rng.randint(0, 2)), "in_progress")]
+		if step["status"] == "completed":
+			entries.append((finished, "completed"))
+		for day, status in entries:
+			self.writer.add(
+				Progress,
+				user_id=step["user_id"],
+				activity_id=step["activity_id_id"],
+				subtask_id=step["id"],
+				status=status,
+				note="",
+				recorded_at=_at(day, rng.randint(8, 21)),
+			)
+			rollup = rollups[day, subject_id]
+			rollup[2] += 1
+			if status == "completed":
+				rollup[0] += 1
+				rollup[1] += step["estimated_hours"]
+
+
+def _subject_ids() -> dict[str, int]:
+	def lookup():
+		rows = Subject.objects.filter(name__in=SUBJECT_NAMES).order_by("-id")
+		return dict(rows.values_list("name", "id"))
+
+	ids = lookup()
+	missing = [name for name in SUBJECT_NAMES if name not in ids]
+	if missing:
+		Subject.objects.bulk_create([Subject(name=name) for name in missing])
+		ids = lookup()
+	return ids
+
+
+def generate(
+	shape: Shape, writer: Writer, *, seed: int = 0, prefix: str = "seed", password: str = PASSWORD
+):
+	"""
+	Create ``shape.users`` users named ``<prefix>-<n>`` through ``writer``,
+	yielding its running row counts per model after every batch and once more at
+	the end.
+	"""
+	planner = _Planner(
+		writer,
+		random.Random(seed),
+		shape,
+		# Hashing is deliberately slow; every seeded user shares one hash.
+		make_password(password),
+	)
+	for index in range(shape.users):
+		planner.user(f"{prefix}-{index}")
+		if writer.end_user():
+			yield writer.written
+	if writer.pending:
+		writer.flush()
+	yield writer.written
@@ -1,7 +1,9 @@
 from datetime import date
 
+from django.db import transaction
 from rest_framework import serializers
 
+from . import subjects
 from .models import Activity, Conflict, Subject, Subtask, User
 
 
@@ -128,12 +130,24 @@ class ActivitySerializer(serializers.ModelSerializer):
 		if errors:
 			raise serializers.ValidationError({"errors": errors})
 
+		if "course_name" in attrs:
+			# The course name picks the owner's linked subject; unknown names stay unlinked.
+			owner_id = self.instance.user_id if self.instance else self.context["request"].user.id
+			attrs["subject_id"] = subjects.ids_by_name(owner_id, [attrs["course_name"]]).get(
+				attrs["course_name"]
+			)
+
 		return attrs
 
 	def get_total_estimated_hours(self, obj) -> int:
 		# Sum estimated_hours across related subtasks. If there are no subtasks,
 		# allow a client-provided hint (stored temporarily on the instance during create)
-		if obj.subtasks.exists():
+		annotated_count = getattr(obj, "_total_subtasks", None)
+		if annotated_count is not None:
+			# Use the annotated values from get_queryset when available (no extra query)
+			if annotated_count:
+				return int(obj._total_estimated_hours or 0)
+		elif obj.subtasks.exists():
 			return int(sum(s.estimated_hours for s in obj.subtasks.all()))
 		# fallback to any client-provided value stored on the instance
 		client_val = getattr(obj, "_client_total_estimated_hours", None)
@@ -173,19 +187,28 @@ class ActivitySerializer(serializers.ModelSerializer):
 			client_total = self.initial_data.get("total_estimated_hours")
 		except Exception:
 			client_total = None
-		# `user` may be supplied by the view via serializer.save(user=...)
-		activity = Activity.objects.create(**validated_data)
-		for idx, s in enumerate(subtasks_data, start=1):
-			# ensure ordering if not provided
-			ordering = s.get("ordering", idx)
-			Subtask.objects.create(
-				activity_id=activity,
-				name=s.get("name", ""),
-				estimated_hours=s.get("estimated_hours", 0) or 0,
-				target_date=s.get("target_date"),
-				status=s.get("status", "pending"),
-				ordering=ordering,
+		# The activity and its whole plan are stored together or not at all.
+		with transaction.atomic(savepoint=False):
+			# `user` may be supplied by the view via serializer.save(user=...)
+			activity = Activity.objects.create(**validated_data)
+			subtasks = Subtask.objects.bulk_create(
+				[
+					Subtask(
+						activity_id=activity,
+						name=s.get("name", ""),
+						estimated_hours=s.get("estimated_hours", 0) or 0,
+						target_date=s.get("target_date"),
+						status=s.get("status", "pending"),
+						# ensure ordering if not provided
+						ordering=s.get("ordering", idx),
+					)
+					for idx, s in enumerate(subtasks_data, start=1)
+				]
 			)
+		# Same counters get_queryset annotates, so the response needs no extra queries.
+		activity._total_subtasks = len(subtasks)
+		activity._completed_subtasks = sum(s.status == "completed" for s in subtasks)
+		activity._total_estimated_hours = sum(s.estimated_hours for s in subtasks)
 		# If no subtasks were created but the client provided a total, keep it
 		# on the instance so the SerializerMethodField can return it in the response.
 		if not subtasks_data and client_total is not None:
@@ -320,3 +343,40 @@ class ConflictResolveSerializer(serializers.Serializer):
 			raise serializers.ValidationError({"errors": errors})
 
 		return attrs
+
+
+class SubtaskOperationSerializer(serializers.Serializer):
+	ACTION_UPDATE = "update"
+	ACTION_DELETE = "delete"
+	ACTION_CHOICES = [ACTION_UPDATE, ACTION_DELETE]
+
+	id = serializers.IntegerField()
+	action = serializers.ChoiceField(choices=ACTION_CHOICES)
+	# Validated per subtask with SubtaskSerializer once the subtask is loaded.
+	changes = serializers.DictField(required=False)
+	note = serializers.CharField(required=False, allow_blank=True, default="")
+
+	def validate(self, attrs):
+		if attrs["action"] == self.ACTION_UPDATE and not attrs.get("changes"):
+			raise serializers.ValidationError(
+				{"errors": {"changes": "Required when action is 'update'."}}
+			)
+		return attrs
+
+
+class SubtaskBatchSerializer(serializers.Serializer):
+	MAX_OPERATIONS = 500
+
+	operations = SubtaskOperationSerializer(many=True, allow_empty=False, max_length=MAX_OPERATIONS)
+
+	def validate_operations(self, value):
+		ids = [operation["id"] for operation in value]
+		if len(ids) != len(set(ids)):
+			raise serializers.ValidationError("Each subtask may appear in only one operation.")
+		return value
+
+
+class SubtaskMoveSerializer(serializers.Serializer):
+	after = serializers.IntegerField(
+		allow_null=True, help_text="Sibling subtask to place it after; null to move it first."
+	)
@@ -0,0 +1,14 @@
+"""
+Model signal handlers, connected in PlannerConfig.ready.
+
+Deleting a subject from anywhere (the API, the admin, a shell) must keep its
+/progress/ history, so the rollup fold runs on pre_delete rather than in the
+view: the collector sends it inside the deleting transaction, before the
+SET_NULL update that would otherwise clash with the user's null-subject row.
+"""
+
+from . import rollups
+
+
+def fold_subject_rollups(instance, **_kwargs):
+	rollups.fold_subject(instance.id)
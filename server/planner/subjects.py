@@ -0,0 +1,86 @@
+"""
+Linking activities to their Subject row.
+
+Activities used to name their subject only through the free-text
+``course_name``. The ``subject`` foreign key is now the reference: activity
+writes link the Subject whose name matches the course name, subject renames
+propagate through the (indexed) key only, and ``course_name`` is kept as the
+cached display name of the linked subject. Rows written before that are linked
+in batches by ``manage.py link_activity_subjects``.
+
+Subjects are shared rows, so an activity is only ever linked to a subject its
+owner has (a UserSubject row); another user's namesake subject is never picked,
+and its renames and deletes never reach the activity.
+"""
+
+from collections import defaultdict
+
+from django.db import transaction
+
+from . import versions
+from .models import Activity, Subject, UserSubject
+
+
+def _owned_ids(user_ids, names) -> dict[tuple[int, str], int]:
+	"""Map ``(user_id, name)`` to the oldest subject of that user carrying the name."""
+	rows = (
+		UserSubject.objects.filter(user_id__in=set(user_ids), subject__name__in=set(names))
+		.order_by("-subject_id")
+		.values_list("user_id", "subject__name", "subject_id")
+	)
+	return {(user_id, name): subject_id for user_id, name, subject_id in rows}
+
+
+def ids_by_name(user_id: int, names) -> dict[str, int]:
+	"""Map each of ``names`` that one of the user's subjects carries to the oldest one's id."""
+	return {name: subject_id for (_, name), subject_id in _owned_ids([user_id], names).items()}
+
+
+def link_batch(after_id: int, batch_size: int, *, create_missing: bool = False):
+	"""
+	Link the next ``batch_size`` unlinked activities with a primary key above
+	``after_id`` to the Subject named like their course, in one transaction.
+
+	Only subjects the activity's owner has are considered. With
+	``create_missing`` a Subject of their own is created for every course name the
+	owner has none for; otherwise those activities stay unlinked. Returns ``(last_id, linked)``
+	where ``last_id`` is the last primary key examined (None when nothing was
+	left), so a caller can resume from it.
+	"""
+	with transaction.atomic():
+		rows = list(
+			Activity.objects.filter(subject__isnull=True, pk__gt=after_id)
+			.order_by("pk")
+			.values_list("pk", "course_name", "user_id")[:batch_size]
+		)
+		if not rows:
+			return None, 0
+
+		owned = _owned_ids((user_id for _, _, user_id in rows), (name for _, name, _ in rows))
+		if create_missing:
+			missing = sorted({(user_id, name) for _, name, user_id in rows} - owned.keys())
+			created = Subject.objects.bulk_create([Subject(name=name) for _, name in missing])
+			UserSubject.objects.bulk_create(
+				UserSubject(user_id=user_id, subject=subject)
+				for (user_id, _), subject in zip(missing, created, strict=True)
+			)
+			owned.update((key, subject.pk) for key, subject in zip(missing, created, strict=True))
+
+		by_subject, users = defaultdict(list), set()
+		for pk, name, user_id in rows:
+			if (user_id, name) in owned:
+				by_subject[owned[user_id, name]].append(pk)
+				users.add(user_id)
+		for subject_id, pks in by_subject.items():
+			Activity.objects.filter(pk__in=pks).update(subject_id=subject_id)
+		versions.bump(users)
+
+	return rows[-1][0], sum(len(pks) for pks in by_subject.values())
+
+
+def rename(subject, new_name: str) -> None:
+	"""Refresh the cached course name of every activity linked to ``subject``."""
+	activities = Activity.objects.filter(subject=subject)
+	with transaction.atomic():
+		versions.bump(activities.values_list("user_id", flat=True).distinct())
+		activities.update(course_name=new_name)
@@ -0,0 +1,22 @@
+"""
+planner/urls.py as config.asgi serves it: the views with AsyncDispatchMixin
+dispatch as coroutines. Select it with ``@pytest.mark.urls``.
+"""
+
+from django.urls import URLPattern
+
+from planner import urls
+from planner.async_views import AsyncDispatchMixin
+
+
+def _served_async(pattern):
+	view = pattern.callback
+	if not issubclass(getattr(view, "cls", object), AsyncDispatchMixin):
+		return pattern
+	initkwargs = {**view.initkwargs, "asynchronous": True}
+	actions = getattr(view, "actions", None)
+	view = view.cls.as_view(actions, **initkwargs) if actions else view.cls.as_view(**initkwargs)
+	return URLPattern(pattern.pattern, view, pattern.default_args, pattern.name)
+
+
+urlpatterns = [_served_async(pattern) for pattern in urls.urlpatterns]
@@ -0,0 +1,178 @@
+"""
+Tests for server-side filtering and keyset pagination of GET /activities/.
+"""
+
+from datetime import date, timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from planner.models import Activity, Subject, Subtask
+
+ACTIVITIES_URL = reverse("activity-list")
+PAGE_LIMIT = 2
+
+# Helpers
+
+
+def _make_activity(user, title, *, due_date="2099-12-31", status="pending", **fields):
+	return Activity.objects.create(
+		user=user,
+		title=title,
+		course_name=fields.pop("course_name", "Course"),
+		description="desc",
+		due_date=due_date,
+		status=status,
+		**fields,
+	)
+
+
+def _add_subtask(activity, *, target_date, status="pending"):
+	return Subtask.objects.create(
+		activity_id=activity,
+		name="Task",
+		estimated_hours=1,
+		target_date=target_date,
+		status=status,
+		ordering=1,
+	)
+
+
+def _titles(res):
+	rows = res.data["results"] if isinstance(res.data, dict) else res.data
+	return [row["title"] for row in rows]
+
+
+# Tests
+
+
+@pytest.mark.django_db
+class TestActivityFilters:
+	def test_unfiltered_list_is_unchanged(self, auth_client, user):
+		_make_activity(user, "A")
+		_make_activity(user, "B")
+
+		res = auth_client.get(ACTIVITIES_URL)
+
+		assert res.status_code == status.HTTP_200_OK
+		assert isinstance(res.data, list)
+		assert sorted(_titles(res)) == ["A", "B"]
+
+	def test_status_filter(self, auth_client, user):
+		_make_activity(user, "Open")
+		_make_activity(user, "Done", status="completed")
+
+		res = auth_client.get(ACTIVITIES_URL, {"status": "completed"})
+
+		assert _titles(res) == ["Done"]
+
+	def test_subject_filter_matches_the_fk_only(self, auth_client, user):
+		physics = Subject.objects.create(name="Physics")
+		_make_activity(user, "By FK", subject=physics, course_name="Old name")
+		_make_activity(user, "Namesake", course_name="Physics")
+		_make_activity(user, "Other", course_name="Math")
+
+		res = auth_client.get(ACTIVITIES_URL, {"subject": physics.id})
+
+		assert _titles(res) == ["By FK"]
+
+	def test_due_date_range(self, auth_client, user):
+		for day in (1, 10, 20):
+			_make_activity(user, f"Day {day}", due_date=date(2099, 1, day))
+
+		res = auth_client.get(ACTIVITIES_URL, {"due_from": "2099-01-05", "due_to": "2099-01-20"})
+
+		assert sorted(_titles(res)) == ["Day 10", "Day 20"]
+
+	def test_has_overdue(self, auth_client, user):
+		yesterday = timezone.localdate() - timedelta(days=1)
+		late = _make_activity(user, "Late")
+		_add_subtask(late, target_date=yesterday)
+		finished = _make_activity(user, "Finished")
+		_add_subtask(finished, target_date=yesterday, status="completed")
+		_make_activity(user, "Empty")
+
+		overdue = auth_client.get(ACTIVITIES_URL, {"has_overdue": "true"})
+		on_track = auth_client.get(ACTIVITIES_URL, {"has_overdue": "false"})
+
+		assert _titles(overdue) == ["Late"]
+		assert sorted(_titles(on_track)) == ["Empty", "Finished"]
+
+	@pytest.mark.parametrize(
+		("param", "value"),
+		[
+			("status", "archived"),
+			("subject", "abc"),
+			("subject", "0"),
+			("due_from", "tomorrow"),
+			("due_to", "2099-13-01"),
+			("has_overdue", "yes"),
+		],
+	)
+	def test_invalid_filter_returns_400(self, auth_client, param, value):
+		res = auth_client.get(ACTIVITIES_URL, {param: value})
+
+		assert res.status_code == status.HTTP_400_BAD_REQUEST
+		assert param in res.data["errors"]
+
+
+@pytest.mark.django_db
+class TestActivityKeysetPagination:
+	def test_pages_follow_due_date_then_id(self, auth_client, user):
+		for title, due in (("C", 3), ("A", 1), ("B1", 2), ("B2", 2), ("D", 4)):
+			_make_activity(user, title, due_date=date(2099, 1, due))
+		expected = ["A", "B1", "B2", "C", "D"]
+
+		seen, res = [], auth_client.get(ACTIVITIES_URL, {"limit": PAGE_LIMIT})
+		while True:
+			assert res.status_code == status.HTTP_200_OK
+			assert res.data["previous"] is None
+			seen += _titles(res)
+			if res.data["next"] is None:
+				break
+			res = auth_client.get(res.data["next"])
+
+		assert seen == expected
+
+	def test_filters_apply_across_pages(self, auth_client, user):
+		for i in range(5):
+			_make_activity(user, f"Open {i}", due_date=date(2099, 1, i + 1))
+			_make_activity(user, f"Done {i}", due_date=date(2099, 1, i + 1), status="completed")
+
+		first = auth_client.get(ACTIVITIES_URL, {"limit": PAGE_LIMIT, "status": "pending"})
+		second = auth_client.get(first.data["next"])
+
+		assert _titles(first) + _titles(second) == [f"Open {i}" for i in range(4)]
+
+	def test_page_queries_do_not_grow_with_activities(self, auth_client, user):
+		for i in range(3):
+			_make_activity(user, f"A{i}")
+		with CaptureQueriesContext(connection) as few:
+			auth_client.get(ACTIVITIES_URL, {"limit": PAGE_LIMIT})
+
+		for i in range(30):
+			_make_activity(user, f"B{i}")
+		with CaptureQueriesContext(connection) as many:
+			res = auth_client.get(ACTIVITIES_URL, {"limit": PAGE_LIMIT})
+
+		assert len(_titles(res)) == PAGE_LIMIT
+		assert len(many) == len(few)
+
+	@pytest.mark.parametrize(
+		("params", "field"),
+		[
+			({"limit": "0"}, "limit"),
+			({"limit": "201"}, "limit"),
+			({"cursor": "garbage"}, "cursor"),
+			({"cursor": "MjA5OS0wMS0wMQ=="}, "cursor"),
+		],
+	)
+	def test_invalid_page_parameters_return_400(self, auth_client, params, field):
+		res = auth_client.get(ACTIVITIES_URL, params)
+
+		assert res.status_code == status.HTTP_400_BAD_REQUEST
+		assert field in res.data["errors"]
@@ -0,0 +1,97 @@
+"""
+Query-count tests for the activity list and detail endpoints.
+
+Subtask counters and hours are annotated on the activity query and the nested
+subtasks are prefetched, so the number of queries does not depend on how many
+activities (or subtasks) the user has.
+"""
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from planner.models import Activity, Subtask
+
+ACTIVITIES_URL = reverse("activity-list")
+
+# Helpers
+
+
+def _make_activities(user, n, *, subtasks_each=3):
+	for i in range(n):
+		activity = Activity.objects.create(
+			user=user,
+			title=f"Activity {i}",
+			course_name="Course",
+			description="desc",
+			due_date="2099-12-31",
+			status="pending",
+		)
+		Subtask.objects.bulk_create(
+			[
+				Subtask(
+					activity_id=activity,
+					name=f"Subtask {j}",
+					estimated_hours=j + 1,
+					target_date="2099-06-01",
+					status="completed" if j == 0 else "pending",
+					ordering=subtasks_each - j,
+				)
+				for j in range(subtasks_each)
+			]
+		)
+
+
+def _count_list_queries(client):
+	with CaptureQueriesContext(connection) as queries:
+		res = client.get(ACTIVITIES_URL)
+	assert res.status_code == status.HTTP_200_OK
+	return len(queries)
+
+
+# Tests
+
+
+@pytest.mark.django_db
+class TestActivityListQueries:
+	def test_query_count_does_not_grow_with_activities(self, auth_client, user):
+		_make_activities(user, 2)
+		few = _count_list_queries(auth_client)
+
+		_make_activities(user, 20)
+		many = _count_list_queries(auth_client)
+
+		assert many == few
+
+	def test_annotated_fields_match_subtasks(self, auth_client, user):
+		_make_activities(user, 2)
+
+		res = auth_client.get(ACTIVITIES_URL)
+
+		for activity in res.data:
+			assert (
+				activity["total_estimated_hours"],
+				activity["total_subtasks_count"],
+				activity["subtask_count"],
+				activity["completed_subtasks_count"],
+			) == (6, 3, 3, 1)
+			assert [s["ordering"] for s in activity["subtasks"]] == [1, 2, 3]
+
+	def test_activity_without_subtasks(self, auth_client, user):
+		_make_activities(user, 1, subtasks_each=0)
+
+		res = auth_client.get(ACTIVITIES_URL)
+
+		assert (res.data[0]["total_estimated_hours"], res.data[0]["subtasks"]) == (0, [])
+
+	def test_retrieve_uses_constant_queries(self, auth_client, user, django_assert_num_queries):
+		_make_activities(user, 1, subtasks_each=10)
+		activity = Activity.objects.get(user=user)
+
+		# The activity with its aggregates, then its prefetched subtasks.
+		with django_assert_num_queries(2):
+			res = auth_client.get(reverse("activity-detail", kwargs={"pk": activity.id}))
+
+		assert res.data["total_estimated_hours"] == sum(range(1, 11))
@@ -0,0 +1,118 @@
+"""
+Tests for the async request path.
+
+The read-heavy endpoints dispatch as coroutines under ASGI and synchronously
+under WSGI (planner/async_views.py). Their async path is exercised here through
+Django's ASGI handler, with the URLconf config.asgi would build
+(planner/tests/asgi_urls.py); the rest of the suite covers the sync path through
+the WSGI test client.
+"""
+
+import pytest
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.test import AsyncClient
+from django.urls import resolve, reverse
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from planner.models import Activity, Conflict
+from planner.views import MeView
+
+ASYNC_URLS = ("/me/", "/today/", "/activities/", "/conflicts/")
+ASGI_URLCONF = "planner.tests.asgi_urls"
+
+# Helpers
+
+
+def _asgi_get(user, path, **headers):
+	token = RefreshToken.for_user(user).access_token
+	headers = {"Authorization": f"Bearer {token}", **headers}
+	return async_to_sync(AsyncClient().get)(path, headers=headers)
+
+
+# Tests
+
+
+class TestRouting:
+	@pytest.mark.parametrize("path", ASYNC_URLS)
+	def test_read_endpoints_are_sync_under_wsgi(self, path):
+		assert not iscoroutinefunction(resolve(path).func)
+
+	@pytest.mark.parametrize("path", ASYNC_URLS)
+	def test_read_endpoints_are_coroutines_under_asgi(self, path):
+		assert iscoroutinefunction(resolve(path, ASGI_URLCONF).func)
+
+	def test_write_only_views_stay_sync(self):
+		assert not iscoroutinefunction(resolve(reverse("subtask-batch"), ASGI_URLCONF).func)
+
+	def test_asgi_setting_selects_the_async_views(self, settings):
+		settings.PLANNER_ASGI = True
+
+		assert iscoroutinefunction(MeView.as_view())
+
+
+@pytest.mark.urls(ASGI_URLCONF)
+@pytest.mark.django_db(transaction=True)
+class TestAsgiRequests:
+	def test_read_endpoints(self, user):
+		activity = Activity.objects.create(
+			user=user,
+			title="Essay",
+			course_name="History",
+			description="desc",
+			due_date="2099-12-31",
+			status="pending",
+		)
+		conflict = Conflict.objects.create(
+			user=user,
+			affected_date="2099-06-01",
+			type="overload",
+			planned_hours=9,
+			max_allowed_hours=8,
+			status="pending",
+		)
+
+		assert _asgi_get(user, "/me/").json()["username"] == user.username
+		assert _asgi_get(user, "/today/").json()["meta"]["filters"] == {
+			"courseId": None,
+			"status": None,
+		}
+		assert [row["id"] for row in _asgi_get(user, "/activities/").json()] == [activity.id]
+		assert _asgi_get(user, f"/activities/{activity.id}/").json()["title"] == "Essay"
+		assert [row["id"] for row in _asgi_get(user, "/conflicts/").json()] == [conflict.id]
+		assert _asgi_get(user, f"/conflicts/{conflict.id}/").json()["id"] == conflict.id
+
+	def test_conditional_get(self, user):
+		etag = _asgi_get(user, "/today/")["ETag"]
+
+		res = _asgi_get(user, "/today/", **{"If-None-Match": etag})
+
+		assert res.status_code == status.HTTP_304_NOT_MODIFIED
+
+	def test_errors(self, user):
+		assert _asgi_get(user, "/conflicts/999/").status_code == status.HTTP_404_NOT_FOUND
+		assert _asgi_get(user, "/conflicts/abc/").status_code == status.HTTP_404_NOT_FOUND
+		assert (
+			_asgi_get(user, "/activities/?limit=0").json()["errors"]["limit"]
+			== "Must be an integer between 1 and 200."
+		)
+		res = async_to_sync(AsyncClient().get)("/me/")
+		assert res.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.urls(ASGI_URLCONF)
+@pytest.mark.django_db
+class TestSyncHandlersOnAsyncViews:
+	def test_patch_me_runs_the_sync_handler(self, auth_client, user):
+		res = auth_client.patch(reverse("me"), {"max_daily_hours": 6}, format="json")
+
+		assert res.status_code == status.HTTP_200_OK
+		user.refresh_from_db()
+		assert user.max_daily_hours == res.data["max_daily_hours"]
+
+	def test_options_and_unsupported_methods(self, auth_client):
+		assert auth_client.options(reverse("today")).status_code == status.HTTP_200_OK
+		assert auth_client.head(reverse("today")).status_code == status.HTTP_200_OK
+		assert auth_client.delete(reverse("today")).status_code == (
+			status.HTTP_405_METHOD_NOT_ALLOWED
+		)
@@ -0,0 +1,207 @@
+"""
+Tests for conditional GETs on /today/, /activities/ and /conflicts/.
+
+Responses carry an ETag derived from the user's data version and the query
+string; repeating a request with If-None-Match answers 304 until a write bumps
+the version.
+"""
+
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from planner import versions
+from planner.models import Activity, Subject, Subtask
+
+TODAY_URL = reverse("today")
+ACTIVITIES_URL = reverse("activity-list")
+CONFLICTS_URL = reverse("conflict-list")
+CONDITIONAL_URLS = (TODAY_URL, ACTIVITIES_URL, CONFLICTS_URL)
+
+# Helpers
+
+
+def _make_activity(user, *, course_name="Test Course", subject=None):
+	return Activity.objects.create(
+		user=user,
+		subject=subject,
+		title="Test Activity",
+		course_name=course_name,
+		description="desc",
+		due_date="2099-12-31",
+		status="pending",
+	)
+
+
+def _create_subtask(client, activity, *, hours=2):
+	res = client.post(
+		reverse("activity-subtasks", kwargs={"activity_id": activity.id}),
+		{"name": "Task", "estimated_hours": hours, "target_date": str(timezone.localdate())},
+		format="json",
+	)
+	assert res.status_code == status.HTTP_201_CREATED, res.data
+	return res.data["id"]
+
+
+def _revalidate(client, url, etag, params=None):
+	return client.get(url, params or {}, HTTP_IF_NONE_MATCH=etag)
+
+
+# Tests
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+	@pytest.mark.parametrize("url", CONDITIONAL_URLS)
+	def test_response_carries_private_etag(self, auth_client, url):
+		res = auth_client.get(url)
+
+		assert res.status_code == status.HTTP_200_OK
+		assert res["ETag"].startswith('"')
+		assert "private" in res["Cache-Control"]
+		assert "no-cache" in res["Cache-Control"]
+
+	@pytest.mark.parametrize("url", CONDITIONAL_URLS)
+	def test_matching_etag_returns_304(self, auth_client, url):
+		etag = auth_client.get(url)["ETag"]
+
+		res = _revalidate(auth_client, url, etag)
+
+		assert res.status_code == status.HTTP_304_NOT_MODIFIED
+		assert res["ETag"] == etag
+		assert not res.content
+
+	def test_304_skips_the_payload_query(self, auth_client, user, django_assert_num_queries):
+		_create_subtask(auth_client, _make_activity(user))
+		etag = auth_client.get(TODAY_URL)["ETag"]
+
+		with django_assert_num_queries(1):
+			res = _revalidate(auth_client, TODAY_URL, etag)
+
+		assert res.status_code == status.HTTP_304_NOT_MODIFIED
+
+	@pytest.mark.parametrize(
+		"params", [{"n_days": 3}, {"status": "hoy"}, {"courseId": 1}, {"limit": 5}]
+	)
+	def test_etag_depends_on_query_parameters(self, auth_client, params):
+		etag = auth_client.get(TODAY_URL)["ETag"]
+
+		res = _revalidate(auth_client, TODAY_URL, etag, params)
+
+		assert res.status_code == status.HTTP_200_OK
+		assert res["ETag"] != etag
+
+	def test_parameter_order_does_not_matter(self, auth_client):
+		etag = auth_client.get(f"{TODAY_URL}?n_days=3&status=hoy")["ETag"]
+
+		res = auth_client.get(f"{TODAY_URL}?status=hoy&n_days=3", HTTP_IF_NONE_MATCH=etag)
+
+		assert res.status_code == status.HTTP_304_NOT_MODIFIED
+
+	def test_today_etag_changes_with_the_date(self, auth_client):
+		etag = auth_client.get(TODAY_URL)["ETag"]
+		tomorrow = timezone.localdate() + timedelta(days=1)
+
+		with mock.patch("planner.views.timezone.localdate", return_value=tomorrow):
+			res = _revalidate(auth_client, TODAY_URL, etag)
+
+		assert res.status_code == status.HTTP_200_OK
+
+	def test_overdue_filter_etag_changes_with_the_date(self, auth_client, user):
+		activity = _make_activity(user)
+		_create_subtask(auth_client, activity)
+		params = {"has_overdue": "true"}
+		res = auth_client.get(ACTIVITIES_URL, params)
+		assert res.data == []
+		unfiltered = auth_client.get(ACTIVITIES_URL)["ETag"]
+		tomorrow = timezone.localdate() + timedelta(days=1)
+
+		with mock.patch("planner.views.timezone.localdate", return_value=tomorrow):
+			overdue = _revalidate(auth_client, ACTIVITIES_URL, res["ETag"], params)
+			other = _revalidate(auth_client, ACTIVITIES_URL, unfiltered)
+
+		assert overdue.status_code == status.HTTP_200_OK
+		assert [item["id"] for item in overdue.data] == [activity.id]
+		# Listings that do not depend on the date keep their tag.
+		assert other.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+@pytest.mark.django_db
+class TestDataVersionBumps:
+	@pytest.mark.parametrize("url", CONDITIONAL_URLS)
+	def test_subtask_write_invalidates(self, auth_client, user, url):
+		activity = _make_activity(user)
+		etag = auth_client.get(url)["ETag"]
+
+		_create_subtask(auth_client, activity)
+
+		assert _revalidate(auth_client, url, etag).status_code == status.HTTP_200_OK
+
+	def test_activity_patch_invalidates(self, auth_client, user):
+		activity = _make_activity(user)
+		etag = auth_client.get(ACTIVITIES_URL)["ETag"]
+
+		auth_client.patch(
+			reverse("activity-detail", kwargs={"pk": activity.id}), {"title": "New"}, format="json"
+		)
+
+		assert _revalidate(auth_client, ACTIVITIES_URL, etag).status_code == status.HTTP_200_OK
+
+	def test_subject_rename_invalidates_linked_users(self, auth_client, user):
+		subject = Subject.objects.create(name="Physics")
+		_make_activity(user, course_name="Physics", subject=subject)
+		etag = auth_client.get(ACTIVITIES_URL)["ETag"]
+
+		auth_client.patch(
+			reverse("subject-detail", kwargs={"pk": subject.id}), {"name": "Física"}, format="json"
+		)
+
+		res = _revalidate(auth_client, ACTIVITIES_URL, etag)
+		assert res.status_code == status.HTTP_200_OK
+		assert res.data[0]["course_name"] == "Física"
+
+	def test_cap_change_invalidates_conflicts(self, auth_client, user):
+		activity = _make_activity(user)
+		_create_subtask(auth_client, activity, hours=6)
+		etag = auth_client.get(CONFLICTS_URL)["ETag"]
+
+		auth_client.patch(reverse("me"), {"max_daily_hours": 4}, format="json")
+
+		res = _revalidate(auth_client, CONFLICTS_URL, etag)
+		assert res.status_code == status.HTTP_200_OK
+		assert len(res.data) == 1
+
+	def test_writes_behind_the_api_are_not_seen_until_bumped(self, auth_client, user):
+		activity = _make_activity(user)
+		etag = auth_client.get(TODAY_URL)["ETag"]
+		Subtask.objects.create(
+			activity_id=activity,
+			name="Direct",
+			estimated_hours=1,
+			target_date=timezone.localdate(),
+			status="pending",
+			ordering=1,
+		)
+		assert _revalidate(auth_client, TODAY_URL, etag).status_code == (
+			status.HTTP_304_NOT_MODIFIED
+		)
+
+		versions.bump([user.id])
+
+		assert _revalidate(auth_client, TODAY_URL, etag).status_code == status.HTTP_200_OK
+
+	def test_other_users_writes_do_not_invalidate(self, auth_client, other_user):
+		etag = auth_client.get(TODAY_URL)["ETag"]
+		other_client = APIClient()
+		other_client.force_authenticate(user=other_user)
+
+		_create_subtask(other_client, _make_activity(other_user))
+
+		assert _revalidate(auth_client, TODAY_URL, etag).status_code == (
+			status.HTTP_304_NOT_MODIFIED
+		)
@@ -0,0 +1,117 @@
+"""
+Tests for dirty-date tracking of conflicts.
+
+Writes only queue a ConflictCheck per (user, date) they touch; GET /conflicts/
+reconciles those dates and is a plain read when nothing is dirty.
+"""
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from planner.models import Activity, Conflict, ConflictCheck
+
+CONFLICTS_URL = reverse("conflict-list")
+
+# Helpers
+
+
+def _make_activity(user):
+	return Activity.objects.create(
+		user=user,
+		title="Test Activity",
+		course_name="Test Course",
+		description="desc",
+		due_date="2099-12-31",
+		status="pending",
+	)
+
+
+def _create_subtask(client, activity, *, hours, target_date="2099-06-01"):
+	res = client.post(
+		reverse("activity-subtasks", kwargs={"activity_id": activity.id}),
+		{"name": "Task", "estimated_hours": hours, "target_date": target_date},
+		format="json",
+	)
+	assert res.status_code == status.HTTP_201_CREATED, res.data
+	return res.data["id"]
+
+
+def _dirty_dates(user):
+	return {str(d) for d in ConflictCheck.objects.filter(user=user).values_list("date", flat=True)}
+
+
+# Tests
+
+
+@pytest.mark.django_db
+class TestConflictChecks:
+	def test_writes_queue_one_check_per_date(self, auth_client, user):
+		activity = _make_activity(user)
+		_create_subtask(auth_client, activity, hours=2)
+		_create_subtask(auth_client, activity, hours=3)
+		_create_subtask(auth_client, activity, hours=1, target_date="2099-06-02")
+
+		assert _dirty_dates(user) == {"2099-06-01", "2099-06-02"}
+		assert not Conflict.objects.filter(user=user).exists()
+
+	def test_list_reconciles_and_clears_checks(self, auth_client, user):
+		user.max_daily_hours = 4
+		user.save()
+		activity = _make_activity(user)
+		_create_subtask(auth_client, activity, hours=5)
+
+		res = auth_client.get(CONFLICTS_URL)
+
+		assert [row["affected_date"] for row in res.data] == ["2099-06-01"]
+		assert _dirty_dates(user) == set()
+
+	def test_reschedule_dirties_both_dates(self, auth_client, user):
+		activity = _make_activity(user)
+		subtask_id = _create_subtask(auth_client, activity, hours=2)
+		auth_client.get(CONFLICTS_URL)
+
+		auth_client.patch(
+			reverse(
+				"activity-subtask-detail",
+				kwargs={"activity_id": activity.id, "subtask_id": subtask_id},
+			),
+			{"target_date": "2099-06-05"},
+			format="json",
+		)
+
+		assert _dirty_dates(user) == {"2099-06-01", "2099-06-05"}
+
+	def test_cap_change_dirties_planned_dates(self, auth_client, user):
+		activity = _make_activity(user)
+		_create_subtask(auth_client, activity, hours=2)
+		_create_subtask(auth_client, activity, hours=2, target_date="2099-06-03")
+		auth_client.get(CONFLICTS_URL)
+
+		auth_client.patch(reverse("me"), {"max_daily_hours": 1}, format="json")
+
+		assert _dirty_dates(user) == {"2099-06-01", "2099-06-03"}
+		assert len(auth_client.get(CONFLICTS_URL).data) == len({"2099-06-01", "2099-06-03"})
+
+	def test_clean_list_is_a_plain_read(self, auth_client, user, django_assert_num_queries):
+		activity = _make_activity(user)
+		_create_subtask(auth_client, activity, hours=2)
+		auth_client.get(CONFLICTS_URL)
+
+		# One EXISTS on the check queue, one data-version lookup for the ETag,
+		# one SELECT of the conflicts.
+		with django_assert_num_queries(3):
+			res = auth_client.get(CONFLICTS_URL)
+
+		assert res.status_code == status.HTTP_200_OK
+
+	def test_other_users_read_leaves_checks_alone(self, auth_client, user, other_user):
+		activity = _make_activity(user)
+		_create_subtask(auth_client, activity, hours=2)
+		other_client = APIClient()
+		other_client.force_authenticate(user=other_user)
+
+		other_client.get(CONFLICTS_URL)
+
+		assert _dirty_dates(user) == {"2099-06-01"}
@@ -0,0 +1,209 @@
+"""
+Tests for the background conflict queue.
+
+Writes enqueue one ConflictCheck per (user, date), `run_conflict_worker`
+drains the queue, and the opt-in "sync" mode evaluates inside the write.
+"""
+
+import threading
+import time
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from planner import conflicts
+from planner.models import Activity, Conflict, ConflictCheck
+
+# Hours planned on 2099-06-01 once the concurrent write has added its subtask.
+OVERLOADED_HOURS = 4
+# How long a claim waits for the concurrent write to block on the claimed row.
+LOCK_WAIT_SECONDS = 5
+LOCK_POLL_SECONDS = 0.05
+
+# Helpers
+
+
+def _make_activity(user):
+	return Activity.objects.create(
+		user=user,
+		title="Test Activity",
+		course_name="Test Course",
+		description="desc",
+		due_date="2099-12-31",
+		status="pending",
+	)
+
+
+def _create_subtask(client, activity, *, hours, target_date="2099-06-01"):
+	res = client.post(
+		reverse("activity-subtasks", kwargs={"activity_id": activity.id}),
+		{"name": "Task", "estimated_hours": hours, "target_date": target_date},
+		format="json",
+	)
+	assert res.status_code == status.HTTP_201_CREATED, res.data
+
+
+def _overload(client, user, *, days=("2099-06-01",)):
+	user.max_daily_hours = 2
+	user.save()
+	activity = _make_activity(user)
+	for day in days:
+		_create_subtask(client, activity, hours=2, target_date=day)
+		_create_subtask(client, activity, hours=2, target_date=day)
+
+
+def _write_during(target, client, activity):
+	"""Patch ``target`` to run as usual, then add 2 hours on 2099-06-01 as another write."""
+	original = getattr(conflicts, target)
+
+	def evaluate_then_write(*args):
+		result = original(*args)
+		_create_subtask(client, activity, hours=2)
+		return result
+
+	return mock.patch.object(conflicts, target, side_effect=evaluate_then_write)
+
+
+def _waiting_for_a_lock() -> bool:
+	with connection.cursor() as cursor:
+		# pg_stat_activity is a per-transaction snapshot unless cleared.
+		cursor.execute("SELECT pg_stat_clear_snapshot()")
+		cursor.execute("SELECT count(*) FROM pg_stat_activity WHERE wait_event_type = 'Lock'")
+		return cursor.fetchone()[0] > 0
+
+
+# Tests
+
+
+@pytest.mark.django_db
+class TestConflictQueue:
+	def test_writes_to_same_date_coalesce_into_one_check(self, auth_client, user):
+		_overload(auth_client, user)
+
+		assert ConflictCheck.objects.filter(user=user).count() == 1
+		assert not Conflict.objects.exists()
+
+	def test_process_checks_evaluates_and_drains(self, auth_client, user):
+		days = ("2099-06-01", "2099-06-02", "2099-06-03")
+		_overload(auth_client, user, days=days)
+
+		assert conflicts.process_checks(limit=2) == len(days) - 1
+		assert conflicts.process_checks(limit=2) == 1
+		assert conflicts.process_checks(limit=2) == 0
+		assert Conflict.objects.filter(user=user, status="pending").count() == len(days)
+
+	def test_worker_command_drains_queue(self, auth_client, user, other_user):
+		_overload(auth_client, user)
+		auth_client.force_authenticate(user=other_user)
+		_overload(auth_client, other_user)
+		out = StringIO()
+
+		call_command("run_conflict_worker", "--once", stdout=out)
+
+		assert "Processed 2 conflict check(s)." in out.getvalue()
+		assert not ConflictCheck.objects.exists()
+		assert Conflict.objects.filter(status="pending").count() == len((user, other_user))
+
+	def test_worker_skips_checks_of_deleted_users(self, auth_client, user):
+		_overload(auth_client, user)
+		conflicts.mark_dirty([(user.id, "2099-07-01")])
+		user.delete()
+
+		assert conflicts.process_checks() == 0
+
+
+@pytest.mark.django_db
+class TestWritesDuringAClaim:
+	"""A write landing after a claim read the load must leave its date queued."""
+
+	def test_worker_keeps_a_date_requeued_during_its_claim(self, auth_client, user):
+		user.max_daily_hours = 2
+		user.save()
+		activity = _make_activity(user)
+		_create_subtask(auth_client, activity, hours=2)
+
+		with _write_during("_evaluate_pairs", auth_client, activity):
+			assert conflicts.process_checks() == 1
+
+		assert ConflictCheck.objects.filter(user=user).count() == 1
+		assert not Conflict.objects.exists()
+		assert conflicts.process_checks() == 1
+		assert Conflict.objects.get(user=user).planned_hours == OVERLOADED_HOURS
+
+	def test_reconcile_keeps_a_date_requeued_during_its_claim(self, auth_client, user):
+		user.max_daily_hours = 2
+		user.save()
+		activity = _make_activity(user)
+		_create_subtask(auth_client, activity, hours=2)
+
+		with _write_during("evaluate_days", auth_client, activity):
+			assert conflicts.reconcile(user) == []
+
+		assert ConflictCheck.objects.filter(user=user).exists()
+		assert [conflict.planned_hours for conflict in conflicts.reconcile(user)] == [
+			OVERLOADED_HOURS
+		]
+
+
+@pytest.mark.skipif(connection.vendor != "postgresql", reason="needs row locks")
+@pytest.mark.django_db(transaction=True)
+class TestConcurrentTransactions:
+	def test_write_committing_during_a_claim_is_evaluated(self, user):
+		user.max_daily_hours = 2
+		user.save()
+		activity = _make_activity(user)
+		client = APIClient()
+		client.force_authenticate(user=user)
+		_create_subtask(client, activity, hours=2)
+		claimed = threading.Event()
+
+		def write():
+			claimed.wait()
+			try:
+				_create_subtask(client, activity, hours=2)
+			finally:
+				connection.close()
+
+		writer = threading.Thread(target=write)
+		writer.start()
+		original = conflicts._evaluate_pairs
+
+		def evaluate_and_let_the_write_in(pairs):
+			original(pairs)
+			claimed.set()
+			# Hold the claim until the write blocks on the claimed row.
+			deadline = time.monotonic() + LOCK_WAIT_SECONDS
+			while not _waiting_for_a_lock() and time.monotonic() < deadline:
+				time.sleep(LOCK_POLL_SECONDS)
+
+		with mock.patch.object(
+			conflicts, "_evaluate_pairs", side_effect=evaluate_and_let_the_write_in
+		):
+			assert conflicts.process_checks() == 1
+		writer.join()
+
+		assert conflicts.process_checks() == 1
+		assert Conflict.objects.get(user=user).planned_hours == OVERLOADED_HOURS
+
+
+@pytest.mark.django_db
+class TestSyncMode:
+	def test_sync_mode_evaluates_inside_the_write(self, auth_client, user, sync_conflicts):
+		_overload(auth_client, user)
+
+		assert not ConflictCheck.objects.exists()
+		conflict = Conflict.objects.get(user=user)
+		assert (conflict.status, conflict.planned_hours) == ("pending", 4)
+
+	def test_sync_mode_cap_change(self, auth_client, user, sync_conflicts):
+		_overload(auth_client, user)
+
+		auth_client.patch(reverse("me"), {"max_daily_hours": 8}, format="json")
+
+		assert Conflict.objects.get(user=user).status == "resolved"
@@ -0,0 +1,145 @@
+"""
+Tests for set-based conflict re-evaluation.
+
+PATCH /me/ (daily cap change) and GET /conflicts/ re-evaluate every planned
+date of the user with a constant number of queries.
+"""
+
+from datetime import date, timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from planner import conflicts, ledger
+from planner.models import Activity, Conflict, Subtask
+
+ME_URL = reverse("me")
+CONFLICTS_URL = reverse("conflict-list")
+START = date(2099, 6, 1)
+N_DAYS = 5
+
+# Helpers
+
+
+def _plan_days(user, n_days, *, hours=4):
+	"""Give ``user`` one ``hours``-long pending subtask on each of ``n_days`` dates."""
+	activity = Activity.objects.create(
+		user=user,
+		title="Plan",
+		course_name="Course",
+		description="desc",
+		due_date=START + timedelta(days=n_days),
+		status="pending",
+	)
+	Subtask.objects.bulk_create(
+		[
+			Subtask(
+				activity_id=activity,
+				name=f"Day {i}",
+				estimated_hours=hours,
+				target_date=START + timedelta(days=i),
+				status="pending",
+				ordering=i,
+			)
+			for i in range(n_days)
+		]
+	)
+	ledger.rebuild(user)
+
+
+def _pending_dates(user):
+	return set(
+		Conflict.objects.filter(user=user, status="pending").values_list("affected_date", flat=True)
+	)
+
+
+# Tests
+
+
+@pytest.mark.django_db
+class TestEvaluateDays:
+	def test_creates_updates_and_resolves_in_bulk(self, user):
+		_plan_days(user, N_DAYS)
+		user.max_daily_hours = 3
+		changed = conflicts.evaluate_days(user)
+
+		assert len(changed) == len(_pending_dates(user)) == N_DAYS
+
+		user.max_daily_hours = 8
+		changed = conflicts.evaluate_days(user)
+
+		assert {c.status for c in changed} == {"resolved"}
+		assert _pending_dates(user) == set()
+
+	def test_unchanged_conflicts_are_not_returned(self, user):
+		_plan_days(user, 2)
+		user.max_daily_hours = 3
+		conflicts.evaluate_days(user)
+
+		assert conflicts.evaluate_days(user) == []
+
+	def test_restricts_to_given_days(self, user):
+		_plan_days(user, 3)
+		user.max_daily_hours = 3
+
+		conflicts.evaluate_days(user, [START])
+
+		assert _pending_dates(user) == {START}
+
+	def test_query_count_does_not_grow_with_dates(self, user):
+		# Both measured passes refresh existing conflicts and create new ones.
+		_plan_days(user, 2)
+		user.max_daily_hours = 3
+		conflicts.evaluate_days(user)
+		_plan_days(user, 4)
+		user.max_daily_hours = 2
+		with CaptureQueriesContext(connection) as few:
+			conflicts.evaluate_days(user)
+
+		_plan_days(user, 60)
+		user.max_daily_hours = 1
+		with CaptureQueriesContext(connection) as many:
+			conflicts.evaluate_days(user)
+
+		assert len(many) == len(few)
+
+
+@pytest.mark.django_db
+class TestBulkEvaluationCallSites:
+	def test_lowering_cap_creates_conflicts(self, auth_client, user):
+		_plan_days(user, N_DAYS)
+
+		res = auth_client.patch(ME_URL, {"max_daily_hours": 3}, format="json")
+
+		assert res.status_code == status.HTTP_200_OK
+		assert len(auth_client.get(CONFLICTS_URL).data) == N_DAYS
+
+	def test_raising_cap_resolves_conflicts(self, auth_client, user):
+		_plan_days(user, N_DAYS)
+		auth_client.patch(ME_URL, {"max_daily_hours": 3}, format="json")
+
+		auth_client.patch(ME_URL, {"max_daily_hours": 6}, format="json")
+
+		assert auth_client.get(CONFLICTS_URL).data == []
+		assert _pending_dates(user) == set()
+
+	def test_list_reflects_current_state(self, auth_client, user):
+		_plan_days(user, 4)
+		Conflict.objects.create(
+			user=user,
+			affected_date=START - timedelta(days=1),
+			type="overload",
+			planned_hours=9,
+			max_allowed_hours=8,
+			status="pending",
+		)
+		auth_client.patch(ME_URL, {"max_daily_hours": 3}, format="json")
+
+		res = auth_client.get(CONFLICTS_URL)
+
+		assert res.status_code == status.HTTP_200_OK
+		listed = {row["affected_date"] for row in res.data}
+		assert listed == {str(START + timedelta(days=i)) for i in range(4)}
@@ -0,0 +1,274 @@
+"""
+Tests for the DailyLoad ledger.
+
+Every subtask write must keep the per-user/date ledger equal to the live
+aggregate of active subtask hours, and conflict detection reads from it.
+"""
+
+import threading
+import time
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from planner import ledger, views
+from planner.models import Activity, Conflict, DailyLoad, Subject, Subtask
+
+# How long each concurrent request holds its transaction before writing the ledger.
+RACE_WINDOW_SECONDS = 0.3
+
+# Helpers
+
+
+def _make_activity(user, *, course_name="Test Course", subject=None):
+	return Activity.objects.create(
+		user=user,
+		subject=subject,
+		title="Test Activity",
+		course_name=course_name,
+		description="desc",
+		due_date="2099-12-31",
+		status="pending",
+	)
+
+
+def _subtask_url(activity_id, subtask_id=None):
+	if subtask_id is None:
+		return reverse("activity-subtasks", kwargs={"activity_id": activity_id})
+	return reverse(
+		"activity-subtask-detail",
+		kwargs={"activity_id": activity_id, "subtask_id": subtask_id},
+	)
+
+
+def _load(user, day):
+	row = DailyLoad.objects.filter(user=user, date=day).first()
+	return (row.planned_hours, row.subtask_count) if row else (0, 0)
+
+
+def _create_subtask(client, activity, *, hours=2, target_date="2099-06-01"):
+	res = client.post(
+		_subtask_url(activity.id),
+		{"name": "Task", "estimated_hours": hours, "target_date": target_date},
+		format="json",
+	)
+	assert res.status_code == status.HTTP_201_CREATED, res.data
+	return res.data["id"]
+
+
+def _concurrently(user, *requests):
+	"""
+	Send each ``(method, url, body)`` from its own thread and connection at once.
+	Ledger writes are delayed so that, without row locks, both requests would read
+	the subtask before either commits.
+	"""
+	barrier = threading.Barrier(len(requests))
+	record = views._record_subtask_change
+
+	def slow_record(*args, **kwargs):
+		time.sleep(RACE_WINDOW_SECONDS)
+		record(*args, **kwargs)
+
+	def send(method, url, body):
+		client = APIClient()
+		client.force_authenticate(user=user)
+		barrier.wait()
+		try:
+			getattr(client, method)(url, body, format="json")
+		finally:
+			connection.close()
+
+	threads = [threading.Thread(target=send, args=request) for request in requests]
+	with mock.patch.object(views, "_record_subtask_change", side_effect=slow_record):
+		for thread in threads:
+			thread.start()
+		for thread in threads:
+			thread.join()
+
+
+# Tests
+
+
+@pytest.mark.django_db
+class TestDailyLoadLedger:
+	def test_create_adds_to_ledger(self, auth_client, user):
+		activity = _make_activity(user)
+		_create_subtask(auth_client, activity, hours=3)
+		_create_subtask(auth_client, activity, hours=2)
+
+		assert _load(user, "2099-06-01") == (5, 2)
+
+	def test_reschedule_moves_load_between_dates(self, auth_client, user):
+		activity = _make_activity(user)
+		subtask_id = _create_subtask(auth_client, activity, hours=3)
+
+		auth_client.patch(
+			_subtask_url(activity.id, subtask_id), {"target_date": "2099-06-02"}, format="json"
+		)
+
+		assert _load(user, "2099-06-01") == (0, 0)
+		assert _load(user, "2099-06-02") == (3, 1)
+
+	def test_completing_subtask_removes_its_load(self, auth_client, user):
+		activity = _make_activity(user)
+		subtask_id = _create_subtask(auth_client, activity, hours=3)
+
+		auth_client.patch(
+			_subtask_url(activity.id, subtask_id), {"status": "completed"}, format="json"
+		)
+
+		assert _load(user, "2099-06-01") == (0, 0)
+
+	def test_delete_subtask_removes_its_load(self, auth_client, user):
+		activity = _make_activity(user)
+		subtask_id = _create_subtask(auth_client, activity, hours=3)
+		_create_subtask(auth_client, activity, hours=1)
+
+		auth_client.delete(_subtask_url(activity.id, subtask_id))
+
+		assert _load(user, "2099-06-01") == (1, 1)
+
+	def test_delete_activity_removes_its_load(self, auth_client, user):
+		activity = _make_activity(user)
+		_create_subtask(auth_client, activity, hours=3)
+
+		res = auth_client.delete(reverse("activity-detail", kwargs={"pk": activity.id}))
+
+		assert res.status_code == status.HTTP_204_NO_CONTENT
+		assert _load(user, "2099-06-01") == (0, 0)
+
+	def test_delete_subject_removes_load_of_its_activities(self, auth_client, user):
+		subject = Subject.objects.create(name="Physics")
+		activity = _make_activity(user, course_name="Physics", subject=subject)
+		_create_subtask(auth_client, activity, hours=4)
+
+		auth_client.delete(reverse("subject-detail", kwargs={"pk": subject.id}))
+
+		assert _load(user, "2099-06-01") == (0, 0)
+
+	def test_nested_create_adds_to_ledger(self, auth_client, user):
+		res = auth_client.post(
+			reverse("activity-list"),
+			{
+				"title": "Plan",
+				"course_name": "Math",
+				"due_date": "2099-12-31",
+				"status": "pending",
+				"subtasks": [
+					{"name": "A", "estimated_hours": 2, "target_date": "2099-06-01"},
+					{"name": "B", "estimated_hours": 5, "target_date": "2099-06-01"},
+				],
+			},
+			format="json",
+		)
+
+		assert res.status_code == status.HTTP_201_CREATED, res.data
+		assert _load(user, "2099-06-01") == (7, 2)
+
+	def test_conflict_detected_from_ledger(self, auth_client, user):
+		user.max_daily_hours = 4
+		user.save()
+		activity = _make_activity(user)
+		_create_subtask(auth_client, activity, hours=3)
+		_create_subtask(auth_client, activity, hours=3)
+
+		res = auth_client.get(reverse("conflict-list"))
+
+		conflict = Conflict.objects.get(user=user, affected_date="2099-06-01")
+		assert (conflict.status, conflict.planned_hours) == ("pending", 6)
+		assert [row["id"] for row in res.data] == [conflict.id]
+
+
+@pytest.mark.django_db
+class TestDailyLoadConsistency:
+	def test_no_drift_after_api_writes(self, auth_client, user):
+		activity = _make_activity(user)
+		first = _create_subtask(auth_client, activity, hours=3)
+		_create_subtask(auth_client, activity, hours=2, target_date="2099-06-03")
+		auth_client.patch(_subtask_url(activity.id, first), {"estimated_hours": 6}, format="json")
+
+		assert ledger.find_drift(user) == []
+
+	def test_check_command_reports_drift(self, user):
+		activity = _make_activity(user)
+		Subtask.objects.create(
+			activity_id=activity,
+			name="Written behind the ledger's back",
+			estimated_hours=4,
+			target_date="2099-06-01",
+			status="pending",
+			ordering=1,
+		)
+
+		with pytest.raises(CommandError):
+			call_command("rebuild_daily_load", "--check", stdout=StringIO())
+
+	def test_rebuild_command_fixes_drift(self, user):
+		activity = _make_activity(user)
+		Subtask.objects.create(
+			activity_id=activity,
+			name="Written behind the ledger's back",
+			estimated_hours=4,
+			target_date="2099-06-01",
+			status="pending",
+			ordering=1,
+		)
+		DailyLoad.objects.create(user=user, date="2099-07-01", planned_hours=9, subtask_count=1)
+
+		call_command("rebuild_daily_load", stdout=StringIO())
+
+		assert _load(user, "2099-06-01") == (4, 1)
+		assert not DailyLoad.objects.filter(date="2099-07-01").exists()
+		assert ledger.find_drift() == []
+
+
+@pytest.mark.skipif(connection.vendor != "postgresql", reason="needs row locks")
+@pytest.mark.django_db(transaction=True)
+class TestConcurrentSubtaskWrites:
+	def test_concurrent_patches_apply_one_after_the_other(self, user):
+		activity = _make_activity(user)
+		subtask = Subtask.objects.create(
+			activity_id=activity,
+			name="Task",
+			estimated_hours=2,
+			target_date="2099-06-01",
+			status="pending",
+			ordering=1,
+		)
+		ledger.add_subtasks(Subtask.objects.filter(pk=subtask.pk))
+		url = _subtask_url(activity.id, subtask.id)
+
+		_concurrently(
+			user, ("patch", url, {"estimated_hours": 5}), ("patch", url, {"estimated_hours": 7})
+		)
+
+		subtask.refresh_from_db()
+		assert _load(user, "2099-06-01") == (subtask.estimated_hours, 1)
+		assert ledger.find_drift() == []
+
+	def test_concurrent_deletes_subtract_once(self, user):
+		activity = _make_activity(user)
+		kept, deleted = (
+			Subtask.objects.create(
+				activity_id=activity,
+				name=name,
+				estimated_hours=2,
+				target_date="2099-06-01",
+				status="pending",
+				ordering=ordering,
+			)
+			for ordering, name in enumerate(("Kept", "Deleted"))
+		)
+		ledger.add_subtasks(Subtask.objects.filter(activity_id=activity))
+		url = _subtask_url(activity.id, deleted.id)
+
+		_concurrently(user, ("delete", url, None), ("delete", url, None))
+
+		assert _load(user, "2099-06-01") == (kept.estimated_hours, 1)
+		assert ledger.find_drift() == []
@@ -0,0 +1,142 @@
+"""
+Tests for GET /dashboard/summary/.
+
+The summary aggregates completion, hours and overdue counts per activity, per
+subject and overall in the database, with a query count that does not depend
+on how many activities or subtasks the user has.
+"""
+
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from planner.models import Activity, Conflict, Subject, Subtask
+
+SUMMARY_URL = reverse("dashboard-summary")
+
+# Helpers
+
+
+def _make_activity(user, title, *, subject=None, course_name="Course", status="pending"):
+	return Activity.objects.create(
+		user=user,
+		subject=subject,
+		title=title,
+		course_name=subject.name if subject else course_name,
+		description="desc",
+		due_date="2099-12-31",
+		status=status,
+	)
+
+
+def _add_subtasks(activity, *specs):
+	"""Add one subtask per ``(hours, status, days_from_today)`` spec."""
+	today = timezone.localdate()
+	Subtask.objects.bulk_create(
+		[
+			Subtask(
+				activity_id=activity,
+				name=f"Task {i}",
+				estimated_hours=hours,
+				target_date=today + timedelta(days=offset),
+				status=subtask_status,
+				ordering=i,
+			)
+			for i, (hours, subtask_status, offset) in enumerate(specs)
+		]
+	)
+
+
+def _counters(row):
+	return (
+		row["total_subtasks"],
+		row["completed_subtasks"],
+		row["total_hours"],
+		row["completed_hours"],
+		row["overdue_subtasks"],
+		row["completion_percent"],
+	)
+
+
+# Tests
+
+
+@pytest.mark.django_db
+class TestDashboardSummary:
+	def test_aggregates(self, auth_client, user):
+		physics = Subject.objects.create(name="Physics")
+		lab = _make_activity(user, "Lab", subject=physics)
+		_add_subtasks(lab, (2, "completed", -3), (3, "pending", -1), (5, "pending", 2))
+		exam = _make_activity(user, "Exam", subject=physics)
+		_add_subtasks(exam, (4, "completed", 0))
+		_make_activity(user, "Essay", course_name="History", status="completed")
+		Conflict.objects.create(
+			user=user,
+			affected_date=timezone.localdate(),
+			type="overload",
+			planned_hours=9,
+			max_allowed_hours=8,
+			status="pending",
+		)
+
+		res = auth_client.get(SUMMARY_URL)
+
+		assert res.status_code == status.HTTP_200_OK
+		totals = res.data["totals"]
+		assert (totals["activities"], totals["completed_activities"]) == (3, 2)
+		assert _counters(totals) == (4, 2, 14, 6, 1, 50)
+		assert res.data["pending_conflicts"] == 1
+		activities = {row["title"]: row for row in res.data["activities"]}
+		assert _counters(activities["Lab"]) == (3, 1, 10, 2, 1, 33)
+		assert _counters(activities["Essay"]) == (0, 0, 0, 0, 0, 0)
+		subjects = {row["course_name"]: row for row in res.data["subjects"]}
+		assert (subjects["Physics"]["subject_id"], subjects["Physics"]["activities"]) == (
+			physics.id,
+			2,
+		)
+		assert _counters(subjects["Physics"]) == (4, 2, 14, 6, 1, 50)
+		assert subjects["History"]["subject_id"] is None
+
+	def test_empty_account(self, auth_client):
+		res = auth_client.get(SUMMARY_URL)
+
+		assert _counters(res.data["totals"]) == (0, 0, 0, 0, 0, 0)
+		assert (res.data["activities"], res.data["subjects"]) == ([], [])
+
+	def test_other_users_data_is_excluded(self, auth_client, other_user):
+		_add_subtasks(_make_activity(other_user, "Theirs"), (3, "pending", 1))
+
+		res = auth_client.get(SUMMARY_URL)
+
+		assert res.data["totals"]["activities"] == 0
+
+	def test_query_count_does_not_grow_with_data(self, auth_client, user):
+		def count_queries():
+			with CaptureQueriesContext(connection) as queries:
+				res = auth_client.get(SUMMARY_URL)
+			assert res.status_code == status.HTTP_200_OK
+			return len(queries)
+
+		_add_subtasks(_make_activity(user, "First"), (1, "pending", 1))
+		few = count_queries()
+		for i in range(10):
+			subject = Subject.objects.create(name=f"Subject {i}")
+			_add_subtasks(
+				_make_activity(user, f"Activity {i}", subject=subject),
+				*[(1, "completed", -day) for day in range(5)],
+			)
+
+		assert count_queries() == few
+
+	def test_supports_conditional_get(self, auth_client, user):
+		etag = auth_client.get(SUMMARY_URL)["ETag"]
+
+		assert (
+			auth_client.get(SUMMARY_URL, HTTP_IF_NONE_MATCH=etag).status_code
+			== status.HTTP_304_NOT_MODIFIED
+		)
@@ -0,0 +1,91 @@
+"""
+Tests for creating an activity together with its nested subtasks.
+
+The plan is written with one bulk INSERT inside the activity's transaction, and
+the ledger and conflict queue are updated in batches, so the query count does
+not grow with the number of subtasks or dates.
+"""
+
+from datetime import date, timedelta
+from unittest import mock
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from planner import ledger
+from planner.models import Activity, ConflictCheck, DailyLoad, Subtask
+
+ACTIVITIES_URL = reverse("activity-list")
+START = date(2099, 6, 1)
+PLAN_SIZE = 40
+
+# Helpers
+
+
+def _plan(n_subtasks, *, n_days):
+	return {
+		"title": "Study plan",
+		"course_name": "Math",
+		"due_date": "2099-12-31",
+		"status": "pending",
+		"subtasks": [
+			{
+				"name": f"Step {i}",
+				"estimated_hours": 1 + i % 3,
+				"target_date": str(START + timedelta(days=i % n_days)),
+			}
+			for i in range(n_subtasks)
+		],
+	}
+
+
+def _create(client, payload):
+	with CaptureQueriesContext(connection) as queries:
+		res = client.post(ACTIVITIES_URL, payload, format="json")
+	assert res.status_code == status.HTTP_201_CREATED, res.data
+	return res, len(queries)
+
+
+# Tests
+
+
+@pytest.mark.django_db
+class TestNestedCreate:
+	def test_query_count_does_not_grow_with_plan_size(self, auth_client):
+		# The first write of a user also creates their data-version row.
+		_create(auth_client, _plan(1, n_days=1))
+		_, small = _create(auth_client, _plan(2, n_days=2))
+
+		_, large = _create(auth_client, _plan(PLAN_SIZE, n_days=20))
+
+		assert large == small
+
+	def test_plan_is_stored_with_ledger_and_checks(self, auth_client, user):
+		res, _ = _create(auth_client, _plan(PLAN_SIZE, n_days=20))
+
+		assert Subtask.objects.filter(activity_id=res.data["id"]).count() == PLAN_SIZE
+		assert DailyLoad.objects.filter(user=user).count() == ConflictCheck.objects.count()
+		assert ledger.find_drift(user) == []
+
+	def test_response_counters_match_the_plan(self, auth_client):
+		payload = _plan(PLAN_SIZE, n_days=20)
+
+		res, _ = _create(auth_client, payload)
+
+		expected_hours = sum(s["estimated_hours"] for s in payload["subtasks"])
+		assert (res.data["total_subtasks_count"], res.data["total_estimated_hours"]) == (
+			PLAN_SIZE,
+			expected_hours,
+		)
+		assert len(res.data["subtasks"]) == PLAN_SIZE
+
+	def test_failure_stores_nothing(self, auth_client):
+		with mock.patch("planner.views.ledger.add_subtasks", side_effect=RuntimeError):
+			res = auth_client.post(ACTIVITIES_URL, _plan(PLAN_SIZE, n_days=20), format="json")
+
+		assert res.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+		assert not Activity.objects.exists()
+		assert not Subtask.objects.exists()
@@ -0,0 +1,241 @@
+"""
+Tests for the daily progress rollups and GET /progress/.
+
+Writes that insert Progress entries add their status transitions, completions
+and completed hours to a per-user, per-day, per-subject rollup row, which
+/progress/ reads back for a date range.
+"""
+
+from datetime import date, timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from planner.models import Activity, ProgressRollup, Subject, Subtask
+from planner.rollups import COUNTERS
+
+PROGRESS_URL = reverse("progress")
+
+# Helpers
+
+
+def _make_subtask(user, *, subject=None, hours=3):
+	activity = Activity.objects.create(
+		user=user,
+		subject=subject,
+		title="Activity",
+		course_name="Course",
+		description="desc",
+		due_date="2099-12-31",
+		status="pending",
+	)
+	return Subtask.objects.create(
+		activity_id=activity,
+		name="Task",
+		estimated_hours=hours,
+		target_date="2099-06-01",
+		status="pending",
+		ordering=0,
+	)
+
+
+def _patch(client, subtask, data):
+	res = client.patch(
+		reverse(
+			"activity-subtask-detail",
+			kwargs={"activity_id": subtask.activity_id_id, "subtask_id": subtask.id},
+		),
+		data,
+		format="json",
+	)
+	assert res.status_code == status.HTTP_200_OK, res.data
+	return res
+
+
+def _counts(row):
+	return (row["completed_subtasks"], row["hours_completed"], row["transitions"])
+
+
+# Tests
+
+
+@pytest.mark.django_db
+class TestProgressRollups:
+	def test_completion_is_rolled_up(self, auth_client, user):
+		subtask = _make_subtask(user, hours=3)
+
+		_patch(auth_client, subtask, {"status": "in_progress"})
+		_patch(auth_client, subtask, {"status": "completed"})
+
+		rollup = ProgressRollup.objects.get()
+		assert (rollup.user_id, rollup.date, rollup.subject_id) == (
+			user.id,
+			timezone.localdate(),
+			None,
+		)
+		assert (rollup.completed_subtasks, rollup.hours_completed, rollup.transitions) == (1, 3, 2)
+
+	def test_entries_without_status_change_are_not_transitions(self, auth_client, user):
+		subtask = _make_subtask(user)
+
+		_patch(auth_client, subtask, {"note": "Still on it"})
+		_patch(auth_client, subtask, {"estimated_hours": 5})
+
+		assert not ProgressRollup.objects.exists()
+
+	def test_batch_updates_are_rolled_up_per_subject(self, auth_client, user):
+		physics = Subject.objects.create(name="Physics")
+		first = _make_subtask(user, subject=physics, hours=2)
+		second = _make_subtask(user, subject=physics, hours=4)
+		loose = _make_subtask(user, hours=1)
+
+		res = auth_client.post(
+			reverse("subtask-batch"),
+			{
+				"operations": [
+					{"id": s.id, "action": "update", "changes": {"status": "completed"}}
+					for s in (first, second, loose)
+				]
+			},
+			format="json",
+		)
+
+		assert res.status_code == status.HTTP_200_OK, res.data
+		rollups = dict(
+			ProgressRollup.objects.values_list("subject_id", "hours_completed").order_by("id")
+		)
+		assert rollups == {physics.id: 6, None: 1}
+
+
+@pytest.mark.django_db
+class TestProgressEndpoint:
+	def test_range_is_zero_filled_and_totalled(self, auth_client, user):
+		physics = Subject.objects.create(name="Physics")
+		first_day = date(2099, 1, 1)
+		ProgressRollup.objects.create(
+			user=user, date=first_day, subject=physics, completed_subtasks=2, hours_completed=5
+		)
+		ProgressRollup.objects.create(user=user, date=first_day + timedelta(days=2), transitions=4)
+
+		res = auth_client.get(PROGRESS_URL, {"from": "2099-01-01", "to": "2099-01-03"})
+
+		assert res.status_code == status.HTTP_200_OK
+		assert _counts(res.data["totals"]) == (2, 5, 4)
+		assert [_counts(day) for day in res.data["days"]] == [(2, 5, 0), (0, 0, 0), (0, 0, 4)]
+		assert [(s["subject_id"], s["subject_name"]) for s in res.data["subjects"]] == [
+			(physics.id, "Physics"),
+			(None, None),
+		]
+
+	def test_subject_delete_keeps_its_progress(self, auth_client, user, other_user):
+		physics = Subject.objects.create(name="Physics")
+		first_day = date(2099, 1, 1)
+		second_day = first_day + timedelta(days=1)
+		ProgressRollup.objects.create(
+			user=user, date=first_day, subject=physics, completed_subtasks=2, hours_completed=5
+		)
+		ProgressRollup.objects.create(user=user, date=second_day, subject=physics, transitions=3)
+		ProgressRollup.objects.create(
+			user=user, date=first_day, completed_subtasks=1, transitions=1
+		)
+		ProgressRollup.objects.create(
+			user=other_user, date=first_day, subject=physics, transitions=2
+		)
+		params = {"from": "2099-01-01", "to": "2099-01-02"}
+		before = auth_client.get(PROGRESS_URL, params).data
+
+		res = auth_client.delete(reverse("subject-detail", kwargs={"pk": physics.id}))
+
+		assert res.status_code == status.HTTP_204_NO_CONTENT
+		after = auth_client.get(PROGRESS_URL, params).data
+		assert (after["totals"], after["days"]) == (before["totals"], before["days"])
+		assert set(
+			ProgressRollup.objects.values_list("user_id", "date", "subject_id", *COUNTERS)
+		) == {
+			(user.id, first_day, None, 3, 5, 1),
+			(user.id, second_day, None, 0, 0, 3),
+			(other_user.id, first_day, None, 0, 0, 2),
+		}
+
+	def test_orm_subject_delete_folds_too(self, user):
+		# The admin and the shell delete through the ORM, not the API.
+		physics = Subject.objects.create(name="Physics")
+		chemistry = Subject.objects.create(name="Chemistry")
+		day = date(2099, 1, 1)
+		ProgressRollup.objects.create(user=user, date=day, subject=physics, transitions=2)
+		ProgressRollup.objects.create(user=user, date=day, subject=chemistry, transitions=3)
+		ProgressRollup.objects.create(user=user, date=day, transitions=1)
+
+		Subject.objects.filter(pk__in=[physics.id, chemistry.id]).delete()
+
+		assert list(ProgressRollup.objects.values_list("subject_id", "transitions")) == [(None, 6)]
+
+	def test_subject_filter(self, auth_client, user):
+		physics = Subject.objects.create(name="Physics")
+		today = timezone.localdate()
+		ProgressRollup.objects.create(user=user, date=today, subject=physics, transitions=1)
+		ProgressRollup.objects.create(user=user, date=today, transitions=7)
+
+		res = auth_client.get(PROGRESS_URL, {"subject": physics.id})
+
+		assert _counts(res.data["totals"]) == (0, 0, 1)
+
+	def test_defaults_to_the_last_thirty_days(self, auth_client):
+		res = auth_client.get(PROGRESS_URL)
+
+		days = res.data["days"]
+		assert (days[0]["date"], days[-1]["date"]) == (
+			timezone.localdate() - timedelta(days=29),
+			timezone.localdate(),
+		)
+
+	def test_other_users_progress_is_not_visible(self, auth_client, other_user):
+		ProgressRollup.objects.create(
+			user=other_user, date=timezone.localdate(), completed_subtasks=1
+		)
+
+		res = auth_client.get(PROGRESS_URL)
+
+		assert _counts(res.data["totals"]) == (0, 0, 0)
+
+	def test_query_count_does_not_grow_with_history(self, auth_client, user):
+		today = timezone.localdate()
+
+		def count_queries():
+			with CaptureQueriesContext(connection) as queries:
+				res = auth_client.get(PROGRESS_URL, {"to": str(today)})
+			assert res.status_code == status.HTTP_200_OK
+			return len(queries)
+
+		few = count_queries()
+		ProgressRollup.objects.bulk_create(
+			[
+				ProgressRollup(user=user, date=today - timedelta(days=day), transitions=1)
+				for day in range(400)
+			]
+		)
+
+		assert count_queries() == few
+
+	@pytest.mark.parametrize(
+		("params", "field"),
+		[
+			({"from": "yesterday"}, "from"),
+			({"to": "2099-02-30"}, "to"),
+			({"from": "2099-01-02", "to": "2099-01-01"}, "from"),
+			({"from": "2097-01-01", "to": "2099-01-01"}, "to"),
+			({"subject": "0"}, "subject"),
+		],
+	)
+	def test_invalid_parameters_return_400(self, auth_client, params, field):
+		res = auth_client.get(PROGRESS_URL, params)
+
+		assert res.status_code == status.HTTP_400_BAD_REQUEST
+		assert field in res.data["errors"]
+
+	def test_requires_authentication(self, unauth_client):
+		assert unauth_client.get(PROGRESS_URL).status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,221 @@
+"""
+Per-endpoint query budgets.
+
+Every route in planner/urls.py declares how many SQL statements one request may
+run, and all of them share a ceiling on time spent in SQL. Each endpoint is
+called for a user seeded with few activities and for one seeded with many; both
+requests must stay within the budget and run the same number of queries, so a
+query per row (an N+1) fails here with the offending statements and the code
+that issued them.
+"""
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from planner import ledger, seed, urls
+from planner.models import Activity, Conflict, ProgressRollup, Subject, Subtask, User, UserSubject
+
+# Activities per user in the small and the large dataset.
+SIZES = (2, 40)
+SUBTASKS = 3
+DAYS = 30
+# Dates are drawn relative to today, so this seed always gives the small dataset
+# a pending conflict to read and resolve.
+SEED = 5
+
+# Milliseconds one request may spend in SQL on the test database; far above what
+# any endpoint needs, so only a runaway statement (a missing filter, a scan per
+# row) trips it.
+SQL_MS_BUDGET = 1000
+
+# Statements one request may run, per (route name, method). Every route needs one.
+BUDGETS = {
+	("api-root", "get"): 0,
+	("health", "get"): 0,
+	("db-pool", "get"): 0,
+	("today-cache", "get"): 0,
+	("today-cache", "delete"): 0,
+	("me", "get"): 0,
+	("me", "patch"): 4,
+	("register", "post"): 3,
+	("activity-list", "get"): 3,
+	("activity-list", "post"): 15,
+	("activity-detail", "get"): 2,
+	("activity-detail", "put"): 12,
+	("activity-detail", "patch"): 10,
+	("activity-detail", "delete"): 15,
+	("activity-subtasks", "get"): 2,
+	("activity-subtasks", "post"): 12,
+	("activity-subtask-detail", "patch"): 13,
+	("activity-subtask-detail", "delete"): 11,
+	("activity-subtask-move", "post"): 11,
+	("subtask-batch", "post"): 16,
+	("today", "get"): 2,
+	("progress", "get"): 2,
+	("dashboard-summary", "get"): 7,
+	("subject-list", "get"): 1,
+	("subject-list", "post"): 4,
+	("subject-detail", "get"): 1,
+	("subject-detail", "put"): 11,
+	("subject-detail", "patch"): 11,
+	("subject-detail", "delete"): 24,
+	("conflict-list", "get"): 3,
+	("conflict-detail", "get"): 2,
+	("conflict-resolve", "post"): 33,
+}
+
+# Helpers
+
+
+def _dataset(size):
+	"""Seed a user with ``size`` activities and return the objects the requests address."""
+	prefix = f"budget{size}"
+	shape = seed.Shape(users=1, activities=size, subtasks=SUBTASKS, days=DAYS, overload_ratio=1.0)
+	list(seed.generate(shape, seed.Writer(), seed=SEED, prefix=prefix))
+	user = User.objects.get(username=f"{prefix}-0")
+	user.is_staff = True
+	user.save(update_fields=["is_staff"])
+	# A subject of the user's own that every one of their activities belongs to.
+	subject = Subject.objects.create(name=f"Budget {size}")
+	UserSubject.objects.create(user=user, subject=subject)
+	Activity.objects.filter(user=user).update(subject=subject, course_name=subject.name)
+	# Progress the subject's delete folds into the null subject.
+	ProgressRollup.objects.create(
+		user=user, date=timezone.localdate(), subject=subject, transitions=1
+	)
+	activity = Activity.objects.filter(user=user).order_by("id").first()
+	first, second = activity.subtasks.order_by("ordering")[:2]
+	conflict = Conflict.objects.filter(user=user, status="pending").order_by("id").first()
+	overloading = Subtask.objects.filter(
+		user=user, target_date=conflict.affected_date, status__in=ledger.ACTIVE_STATUSES
+	).first()
+	return {
+		"size": size,
+		"user": user,
+		"subject": subject,
+		"activity": activity,
+		"subtasks": (first, second),
+		"conflict": conflict,
+		"overloading": overloading,
+	}
+
+
+def _activity_body(data):
+	today = timezone.localdate().isoformat()
+	return {
+		"title": "Essay",
+		"course_name": data["subject"].name,
+		"description": "",
+		"due_date": today,
+		"status": "pending",
+		"subtasks": [
+			{"name": "Draft", "estimated_hours": 2, "target_date": today},
+			{"name": "Review", "estimated_hours": 1, "target_date": today},
+		],
+	}
+
+
+def _request(route, method, data):
+	"""URL and body of a valid request to ``route`` for the seeded ``data``."""
+	activity, subject, conflict = data["activity"], data["subject"], data["conflict"]
+	first, second = data["subtasks"]
+	subtask_kwargs = {"activity_id": activity.id, "subtask_id": first.id}
+	today = timezone.localdate().isoformat()
+	requests = {
+		("me", "patch"): ({}, {"max_daily_hours": data["user"].max_daily_hours + 1}),
+		("register", "post"): (
+			{},
+			{
+				"username": f"new-{data['size']}",
+				"email": f"new-{data['size']}@example.com",
+				"password": "budget-password-1",
+				"password_confirm": "budget-password-1",
+			},
+		),
+		("activity-list", "post"): ({}, _activity_body(data)),
+		("activity-detail", "get"): ({"pk": activity.id}, None),
+		# PUT replaces the activity's own fields; subtasks are not writable through it.
+		("activity-detail", "put"): (
+			{"pk": activity.id},
+			{key: value for key, value in _activity_body(data).items() if key != "subtasks"},
+		),
+		("activity-detail", "patch"): ({"pk": activity.id}, {"title": "Renamed"}),
+		("activity-detail", "delete"): ({"pk": activity.id}, None),
+		("activity-subtasks", "get"): ({"activity_id": activity.id}, None),
+		("activity-subtasks", "post"): (
+			{"activity_id": activity.id},
+			{"name": "Extra", "estimated_hours": 1, "target_date": today},
+		),
+		("activity-subtask-detail", "patch"): (subtask_kwargs, {"estimated_hours": 2}),
+		("activity-subtask-detail", "delete"): (subtask_kwargs, None),
+		("activity-subtask-move", "post"): (subtask_kwargs, {"after": second.id}),
+		("subtask-batch", "post"): (
+			{},
+			{
+				"operations": [
+					{"id": first.id, "action": "update", "changes": {"status": "completed"}},
+					{"id": second.id, "action": "delete"},
+				]
+			},
+		),
+		("subject-list", "post"): ({}, {"name": f"New {data['size']}"}),
+		("subject-detail", "get"): ({"pk": subject.id}, None),
+		("subject-detail", "put"): ({"pk": subject.id}, {"name": f"Renamed {data['size']}"}),
+		("subject-detail", "patch"): ({"pk": subject.id}, {"name": f"Renamed {data['size']}"}),
+		("subject-detail", "delete"): ({"pk": subject.id}, None),
+		("conflict-detail", "get"): ({"pk": conflict.id}, None),
+		("conflict-resolve", "post"): (
+			{"pk": conflict.id},
+			{
+				"subtask_id": data["overloading"].id,
+				"action_type": "reduce_hours",
+				"new_hours": 1,
+			},
+		),
+	}
+	kwargs, body = requests.get((route, method), ({}, None))
+	return reverse(route, kwargs=kwargs), body
+
+
+def _routes():
+	"""Every (route name, method) planner/urls.py serves, without the format-suffix copies."""
+	for pattern in urls.urlpatterns:
+		if "format" in pattern.pattern.regex.groupindex:
+			continue
+		callback = pattern.callback
+		methods = getattr(callback, "actions", None) or [
+			method for method in callback.cls.http_method_names if hasattr(callback.cls, method)
+		]
+		yield from (
+			(pattern.name, method) for method in methods if method not in {"head", "options"}
+		)
+
+
+# Tests
+
+
+class TestBudgetTable:
+	def test_every_endpoint_has_a_budget(self):
+		assert set(_routes()) == set(BUDGETS)
+
+
+@pytest.mark.django_db
+class TestQueryBudgets:
+	@pytest.mark.parametrize(("route", "method"), sorted(BUDGETS))
+	def test_queries_stay_within_budget_at_any_size(self, route, method, query_budget):
+		counts = {}
+		for size in SIZES:
+			data = _dataset(size)
+			client = APIClient()
+			client.force_authenticate(user=data["user"])
+			url, body = _request(route, method, data)
+			label = f"{method.upper()} {url} with {size} activities"
+			with query_budget(BUDGETS[route, method], ms=SQL_MS_BUDGET, label=label) as recorder:
+				res = getattr(client, method)(url, body, format="json")
+			assert status.is_success(res.status_code), (label, res.status_code, res.data)
+			counts[size] = len(recorder.queries)
+
+		assert len(set(counts.values())) == 1, f"query count grows with the data: {counts}"
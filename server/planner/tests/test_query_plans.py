@@ -0,0 +1,226 @@
+"""
+EXPLAIN-based checks for the planner's hot queries.
+
+Each test runs a hot endpoint (or the conflict worker) exactly as it is served,
+captures every statement it sends to the database and EXPLAINs that SQL; it
+fails if any planner table is read with a full scan. On PostgreSQL sequential
+scans are disabled for the statement first, so a ``Seq Scan`` in the plan means
+no index can serve the query at all (tiny test tables would otherwise make a
+sequential scan the cheapest plan). On SQLite a plain ``SCAN <table>`` is a full
+scan.
+
+Also covers the one-conflict-per-user-and-date constraint.
+"""
+
+import re
+from datetime import date
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+from django.db import IntegrityError, connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from planner import conflicts
+from planner.models import (
+	Activity,
+	Conflict,
+	DailyLoad,
+	Subject,
+	Subtask,
+)
+
+DAY = date(2099, 6, 1)
+# Statements whose plan can read a table; INSERTs and savepoints cannot.
+EXPLAINED = {"SELECT", "UPDATE", "DELETE", "WITH"}
+
+# Helpers
+
+
+def _plan(sql: str) -> str:
+	"""The plan of ``sql``, with sequential scans disabled on PostgreSQL."""
+	with transaction.atomic(), connection.cursor() as cursor:
+		if connection.vendor == "postgresql":
+			cursor.execute("SET LOCAL enable_seqscan = off")
+			cursor.execute(f"EXPLAIN {sql}")
+			return "\n".join(row[0] for row in cursor.fetchall())
+		cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+		return "\n".join(row[-1] for row in cursor.fetchall())
+
+
+def _plan_scans(sql: str) -> list[str]:
+	"""Return the planner tables ``sql`` reads with a full scan."""
+	plan = _plan(sql)
+	if connection.vendor == "postgresql":
+		tables = re.findall(r"Seq Scan on (\w+)", plan)
+	else:
+		tables = re.findall(r"\bSCAN (\w+)\s*$", plan, re.MULTILINE)
+	return [table for table in tables if table.startswith("planner_")]
+
+
+def _sorts(sql: str) -> bool:
+	"""Whether ``sql`` sorts or groups its rows itself instead of reading them in index order."""
+	return re.search(r"\bSort\b|TEMP B-TREE", _plan(sql)) is not None
+
+
+def _capture(run) -> list[str]:
+	"""Run ``run()`` and return the SQL of every statement it issued."""
+	with CaptureQueriesContext(connection) as captured:
+		run()
+	return [query["sql"] for query in captured.captured_queries]
+
+
+def _full_scans(statements) -> dict[str, list[str]]:
+	"""Map each statement that reads a planner table with a full scan to those tables."""
+	scans = {}
+	for sql in statements:
+		if sql.split(None, 1)[0].upper() in EXPLAINED and (tables := _plan_scans(sql)):
+			scans[sql] = tables
+	return scans
+
+
+def _get(client, name, params=None, **kwargs) -> list[str]:
+	"""The statements GET ``name`` runs."""
+
+	def run():
+		res = client.get(reverse(name, kwargs=kwargs), params or {})
+		assert res.status_code == status.HTTP_200_OK, res.data
+
+	return _capture(run)
+
+
+@pytest.fixture
+def activity(user):
+	return Activity.objects.create(
+		user=user,
+		title="Activity",
+		course_name="Course",
+		description="desc",
+		due_date="2099-12-31",
+		status="pending",
+	)
+
+
+@pytest.fixture
+def subtask(activity):
+	return Subtask.objects.create(
+		activity_id=activity,
+		name="Task",
+		estimated_hours=1,
+		target_date=DAY,
+		status="pending",
+		ordering=1024,
+	)
+
+
+# Tests
+
+
+@pytest.mark.django_db
+class TestEndpointQueryPlans:
+	@pytest.mark.parametrize(
+		("name", "params"),
+		[
+			("today", None),
+			("today", {"status": "proximas", "n_days": 3, "limit": 1}),
+			("activity-list", None),
+			("activity-list", {"status": "pending", "limit": 1}),
+			("activity-list", {"has_overdue": "true"}),
+			("conflict-list", None),
+			("progress", None),
+			("dashboard-summary", None),
+		],
+	)
+	def test_reads(self, auth_client, subtask, name, params):
+		assert _full_scans(_get(auth_client, name, params)) == {}
+
+	def test_today_reads_through_the_live_activity_join(self, auth_client, subtask):
+		statements = _get(auth_client, "today")
+
+		assert any('JOIN "planner_activity"' in sql for sql in statements)
+		assert _full_scans(statements) == {}
+
+	@pytest.mark.parametrize("params", [{"limit": 2}, {"status": "pending", "limit": 2}])
+	def test_activity_page_reads_only_its_index_range(self, auth_client, user, params):
+		# A page must stop after ``limit`` index entries: no sort, no aggregation of
+		# all the user's activities before the LIMIT.
+		for day in range(1, 5):
+			Activity.objects.create(
+				user=user,
+				title="Activity",
+				course_name="Course",
+				description="desc",
+				due_date=date(2099, 1, day),
+				status="pending",
+			)
+		first = auth_client.get(reverse("activity-list"), params).data
+
+		for page in (params, parse_qs(urlsplit(first["next"]).query)):
+			statements = _get(auth_client, "activity-list", page)
+			(sql,) = [sql for sql in statements if sql.startswith('SELECT "planner_activity"')]
+
+			assert not _sorts(sql)
+			assert _full_scans([sql]) == {}
+
+	def test_subtask_list(self, auth_client, activity, subtask):
+		statements = _get(auth_client, "activity-subtasks", activity_id=activity.id)
+
+		assert _full_scans(statements) == {}
+
+	def test_subtask_write_and_conflict_checks(self, auth_client, user, activity):
+		user.max_daily_hours = 1
+		user.save()
+		url = reverse("activity-subtasks", kwargs={"activity_id": activity.id})
+		body = {"name": "Task", "estimated_hours": 2, "target_date": DAY.isoformat()}
+
+		write = _capture(lambda: auth_client.post(url, body, format="json"))
+		reconcile = _get(auth_client, "conflict-list")
+		auth_client.post(url, {**body, "target_date": "2099-06-02"}, format="json")
+		worker = _capture(conflicts.process_checks)
+
+		assert Conflict.objects.filter(user=user).count() == len((DAY, "2099-06-02"))
+		assert _full_scans([*write, *reconcile, *worker]) == {}
+
+	def test_subject_rename(self, auth_client, activity):
+		subject = Subject.objects.create(name="Physics")
+		Activity.objects.filter(pk=activity.pk).update(subject=subject, course_name="Physics")
+		url = reverse("subject-detail", kwargs={"pk": subject.id})
+
+		statements = _capture(lambda: auth_client.patch(url, {"name": "Chem"}, format="json"))
+
+		assert _full_scans(statements) == {}
+
+	def test_unindexed_filter_is_reported(self):
+		# Guards the capture and plan parsing: nothing indexes a subtask's name.
+		statements = _capture(lambda: list(Subtask.objects.filter(name="Task")))
+
+		assert list(_full_scans(statements).values()) == [["planner_subtask"]]
+
+
+@pytest.mark.django_db
+class TestConflictUniqueness:
+	def test_second_conflict_for_a_date_is_rejected(self, user):
+		fields = {
+			"user": user,
+			"affected_date": DAY,
+			"type": "overload",
+			"planned_hours": 9,
+			"max_allowed_hours": 8,
+		}
+		Conflict.objects.create(status="resolved", **fields)
+
+		with pytest.raises(IntegrityError), transaction.atomic():
+			Conflict.objects.create(status="pending", **fields)
+
+	def test_overload_reopens_the_dates_conflict(self, user):
+		user.max_daily_hours = 4
+		user.save()
+		DailyLoad.objects.create(user=user, date=DAY, planned_hours=6, subtask_count=1)
+		conflicts.evaluate_days(user, [DAY])
+		Conflict.objects.update(status="resolved")
+		DailyLoad.objects.update(planned_hours=7)
+
+		conflicts.evaluate_days(user, [DAY])
+
+		assert list(Conflict.objects.values_list("planned_hours", "status")) == [(7, "pending")]
@@ -0,0 +1,124 @@
+"""
+Tests for the synthetic dataset generator.
+
+`seed_planner` writes users, activities, subtasks and their progress history in
+batches, together with the derived rows (ledger, conflicts, rollups) the write
+path would have produced for them.
+"""
+
+from collections import Counter
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db.models import F
+from django.utils import timezone
+
+from planner import ledger
+from planner.models import (
+	Activity,
+	Conflict,
+	DailyLoad,
+	Progress,
+	ProgressRollup,
+	Subtask,
+	User,
+)
+
+USERS = 3
+ACTIVITIES = 6
+SUBTASKS = 4
+BATCH_SIZE = 50
+
+# Helpers
+
+
+def _seed(*args):
+	out = StringIO()
+	call_command(
+		"seed_planner",
+		f"--users={USERS}",
+		f"--activities={ACTIVITIES}",
+		f"--subtasks={SUBTASKS}",
+		f"--batch-size={BATCH_SIZE}",
+		*args,
+		stdout=out,
+	)
+	return out.getvalue()
+
+
+def _plan(prefix):
+	return list(
+		Subtask.objects.filter(user__username__startswith=f"{prefix}-")
+		.order_by("id")
+		.values_list("name", "estimated_hours", "target_date", "status", "ordering")
+	)
+
+
+# Tests
+
+
+@pytest.mark.django_db
+class TestSeedPlanner:
+	def test_creates_the_requested_shape(self):
+		out = _seed()
+
+		assert User.objects.filter(username__startswith="seed-").count() == USERS
+		assert Activity.objects.count() == USERS * ACTIVITIES
+		assert Subtask.objects.count() == USERS * ACTIVITIES * SUBTASKS
+		assert not Subtask.objects.exclude(user_id=F("activity_id__user_id")).exists()
+		assert not Activity.objects.filter(subject__isnull=True).exists()
+		assert not Activity.objects.exclude(course_name=F("subject__name")).exists()
+		assert f"Subtask: {USERS * ACTIVITIES * SUBTASKS}" in out
+
+	def test_seeded_users_can_log_in(self, unauth_client):
+		_seed("--password=secret-pass")
+
+		res = unauth_client.post(
+			"/api/token/", {"identifier": "seed-0", "password": "secret-pass"}, format="json"
+		)
+
+		assert "access" in res.data
+
+	def test_derived_rows_match_the_data(self):
+		_seed("--overload-ratio=0.5")
+
+		assert ledger.find_drift() == []
+		overloaded = {
+			(load.user_id, load.date)
+			for load in DailyLoad.objects.select_related("user")
+			if load.planned_hours > load.user.max_daily_hours
+		}
+		assert overloaded
+		assert set(Conflict.objects.values_list("user_id", "affected_date")) == overloaded
+		transitions = Counter(
+			(entry.user_id, timezone.localdate(entry.recorded_at), entry.activity.subject_id)
+			for entry in Progress.objects.select_related("activity")
+		)
+		assert {
+			(rollup.user_id, rollup.date, rollup.subject_id): rollup.transitions
+			for rollup in ProgressRollup.objects.all()
+		} == transitions
+
+	def test_same_seed_same_data(self):
+		_seed("--prefix=a", "--seed=7")
+		_seed("--prefix=b", "--seed=7")
+		_seed("--prefix=c", "--seed=8")
+
+		assert _plan("a") == _plan("b")
+		assert _plan("a") != _plan("c")
+
+	def test_without_overload(self):
+		_seed("--overload-ratio=0", "--days=365")
+
+		assert not Conflict.objects.exists()
+
+	def test_rejects_existing_prefix_and_bad_arguments(self):
+		_seed()
+
+		with pytest.raises(CommandError, match="already exist"):
+			_seed()
+		with pytest.raises(CommandError, match="--overload-ratio"):
+			_seed("--prefix=x", "--overload-ratio=2")
+		with pytest.raises(CommandError, match="--batch-size"):
+			_seed("--prefix=x", "--batch-size=0")
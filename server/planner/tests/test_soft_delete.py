@@ -0,0 +1,172 @@
+"""
+Tests for deferred activity deletion.
+
+Deleting an activity or a subject hides the activities at once and takes their
+load off the DailyLoad ledger; `purge_deleted` removes the rows afterwards in
+bounded batches.
+"""
+
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from planner import ledger, purge
+from planner.models import Activity, ConflictCheck, DailyLoad, Progress, Subject, Subtask
+
+TARGET_DATE = "2099-06-01"
+BATCH_SIZE = 2
+
+# Helpers
+
+
+def _make_activity(user, *, subject=None, subtasks=2):
+	activity = Activity.objects.create(
+		user=user,
+		subject=subject,
+		title="Activity",
+		course_name=subject.name if subject else "Course",
+		description="desc",
+		due_date="2099-12-31",
+		status="pending",
+	)
+	created = Subtask.objects.bulk_create(
+		[
+			Subtask(
+				activity_id=activity,
+				name=f"Task {i}",
+				estimated_hours=2,
+				target_date=TARGET_DATE,
+				status="pending",
+				ordering=i,
+			)
+			for i in range(subtasks)
+		]
+	)
+	ledger.add_subtasks(Subtask.objects.filter(activity_id=activity))
+	Progress.objects.bulk_create(
+		[
+			Progress(user=user, activity=activity, subtask=subtask, status="pending", note="")
+			for subtask in created
+		]
+	)
+	return activity
+
+
+def _delete(client, activity):
+	res = client.delete(reverse("activity-detail", kwargs={"pk": activity.id}))
+	assert res.status_code == status.HTTP_204_NO_CONTENT
+
+
+def _purge(*args):
+	out = StringIO()
+	call_command("purge_deleted", "--once", *args, stdout=out)
+	return out.getvalue()
+
+
+# Tests
+
+
+@pytest.mark.django_db
+class TestSoftDelete:
+	def test_delete_hides_the_activity_and_its_subtasks(self, auth_client, user):
+		activity = _make_activity(user)
+		subtask = activity.subtasks.first()
+		_delete(auth_client, activity)
+
+		assert (
+			auth_client.get(reverse("activity-detail", kwargs={"pk": activity.id})).status_code
+			== status.HTTP_404_NOT_FOUND
+		)
+		assert auth_client.get(reverse("activity-list")).data == []
+		today = auth_client.get(reverse("today"), {"n_days": 40000}).data
+		assert subtask.id not in {row["id"] for row in today["upcoming"]}
+		assert (
+			auth_client.patch(
+				reverse(
+					"activity-subtask-detail",
+					kwargs={"activity_id": activity.id, "subtask_id": subtask.id},
+				),
+				{"name": "Renamed"},
+				format="json",
+			).status_code
+			== status.HTTP_404_NOT_FOUND
+		)
+		# Rows are still there until the purger runs.
+		assert Subtask.objects.filter(activity_id=activity).exists()
+
+	def test_delete_takes_load_off_the_ledger_and_queues_one_check(self, auth_client, user):
+		activity = _make_activity(user)
+		ConflictCheck.objects.all().delete()
+
+		_delete(auth_client, activity)
+
+		load = DailyLoad.objects.get(user=user, date=TARGET_DATE)
+		assert (load.planned_hours, load.subtask_count) == (0, 0)
+		assert ConflictCheck.objects.filter(user=user).count() == 1
+		assert ledger.find_drift(user) == []
+
+	def test_subject_delete_hides_its_activities(self, auth_client, user, other_user):
+		physics = Subject.objects.create(name="Physics")
+		mine = _make_activity(user, subject=physics)
+		theirs = _make_activity(other_user, subject=physics)
+		kept = _make_activity(user)
+
+		res = auth_client.delete(reverse("subject-detail", kwargs={"pk": physics.id}))
+
+		assert res.status_code == status.HTTP_204_NO_CONTENT
+		assert list(Activity.objects.values_list("id", flat=True)) == [kept.id]
+		assert set(Activity.all_objects.filter(deleted_at__isnull=False)) == {mine, theirs}
+
+
+@pytest.mark.django_db
+class TestPurge:
+	def test_purge_removes_rows_in_bounded_batches(self, auth_client, user):
+		subtasks = 5
+		activity = _make_activity(user, subtasks=subtasks)
+		kept = _make_activity(user)
+		_delete(auth_client, activity)
+
+		assert purge.purge_batch(BATCH_SIZE) == BATCH_SIZE
+		assert Progress.objects.filter(activity=activity).count() == subtasks - BATCH_SIZE
+		while purge.purge_batch(BATCH_SIZE):
+			pass
+
+		assert not Activity.all_objects.filter(pk=activity.pk).exists()
+		assert not Subtask.objects.filter(activity_id=activity.pk).exists()
+		assert not Progress.objects.filter(activity=activity.pk).exists()
+		assert Subtask.objects.filter(activity_id=kept).exists()
+
+	def test_batch_query_count_does_not_grow_with_size(self, auth_client, user):
+		activity = _make_activity(user, subtasks=50)
+		_delete(auth_client, activity)
+
+		with CaptureQueriesContext(connection) as small:
+			purge.purge_batch(5)
+		with CaptureQueriesContext(connection) as large:
+			purge.purge_batch(40)
+
+		assert len(large) == len(small)
+
+	def test_command_purges_everything(self, auth_client, user):
+		_delete(auth_client, _make_activity(user, subtasks=3))
+
+		out = _purge("--batch-size", str(BATCH_SIZE))
+
+		assert "Purged 7 row(s)." in out
+		assert not Activity.all_objects.exists()
+		assert not Subtask.objects.exists()
+
+	def test_command_with_nothing_to_purge(self, user):
+		_make_activity(user)
+
+		assert "Purged 0 row(s)." in _purge()
+		assert Subtask.objects.exists()
+
+	def test_rejects_non_positive_batch_size(self):
+		with pytest.raises(CommandError):
+			_purge("--batch-size", "0")
@@ -0,0 +1,204 @@
+"""
+Tests for the Subject foreign key as the reference between activities and
+subjects: linking on write, FK-only rename and delete propagation, and the
+batched link_activity_subjects backfill command.
+"""
+
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from planner import versions
+from planner.models import Activity, Subject, UserSubject
+
+# Helpers
+
+
+def _make_activity(user, course_name, *, subject=None):
+	return Activity.objects.create(
+		user=user,
+		subject=subject,
+		title="Activity",
+		course_name=course_name,
+		description="desc",
+		due_date="2099-12-31",
+		status="pending",
+	)
+
+
+def _subject(user, name):
+	"""A subject assigned to ``user``, so their activities can link to it."""
+	subject = Subject.objects.create(name=name)
+	UserSubject.objects.create(user=user, subject=subject)
+	return subject
+
+
+def _client(user):
+	client = APIClient()
+	client.force_authenticate(user=user)
+	return client
+
+
+def _create_activity(client, course_name):
+	res = client.post(
+		reverse("activity-list"),
+		{"title": "Lab", "course_name": course_name, "due_date": "2099-12-31", "status": "pending"},
+		format="json",
+	)
+	assert res.status_code == status.HTTP_201_CREATED, res.data
+	return Activity.objects.get(id=res.data["id"])
+
+
+def _link(*args):
+	out = StringIO()
+	call_command("link_activity_subjects", *args, stdout=out)
+	return out.getvalue()
+
+
+# Tests
+
+
+@pytest.mark.django_db
+class TestSubjectLinksOnWrite:
+	def test_create_links_the_subject_named_like_the_course(self, auth_client, user):
+		physics = _subject(user, "Physics")
+
+		assert _create_activity(auth_client, "Physics").subject_id == physics.id
+
+	def test_created_subject_belongs_to_its_creator(self, auth_client, user):
+		res = auth_client.post(reverse("subject-list"), {"name": "Physics"}, format="json")
+
+		assert res.status_code == status.HTTP_201_CREATED
+		assert _create_activity(auth_client, "Physics").subject_id == res.data["id"]
+
+	def test_changing_the_course_relinks(self, auth_client, user):
+		physics = Subject.objects.create(name="Physics")
+		activity = _make_activity(user, "Physics", subject=physics)
+
+		auth_client.patch(
+			reverse("activity-detail", kwargs={"pk": activity.id}),
+			{"course_name": "Unlisted"},
+			format="json",
+		)
+
+		activity.refresh_from_db()
+		assert (activity.course_name, activity.subject_id) == ("Unlisted", None)
+
+	def test_rename_only_touches_linked_activities(self, auth_client, user, other_user):
+		physics = Subject.objects.create(name="Physics")
+		linked = _make_activity(user, "Physics", subject=physics)
+		namesake = _make_activity(other_user, "Physics")
+
+		auth_client.patch(
+			reverse("subject-detail", kwargs={"pk": physics.id}), {"name": "Física"}, format="json"
+		)
+
+		linked.refresh_from_db()
+		namesake.refresh_from_db()
+		assert (linked.course_name, namesake.course_name) == ("Física", "Physics")
+
+	def test_delete_only_removes_linked_activities(self, auth_client, user, other_user):
+		physics = Subject.objects.create(name="Physics")
+		_make_activity(user, "Physics", subject=physics)
+		namesake = _make_activity(other_user, "Physics")
+
+		auth_client.delete(reverse("subject-detail", kwargs={"pk": physics.id}))
+
+		assert list(Activity.objects.values_list("id", flat=True)) == [namesake.id]
+
+	def test_other_users_namesake_subject_is_never_linked(self, auth_client, user, other_user):
+		other = _client(other_user)
+		physics = other.post(reverse("subject-list"), {"name": "Physics"}, format="json").data
+		theirs = _create_activity(other, "Physics")
+		mine = _create_activity(auth_client, "Physics")
+		_link()
+		url = reverse("subject-detail", kwargs={"pk": physics["id"]})
+
+		other.patch(url, {"name": "Física"}, format="json")
+		other.delete(url)
+
+		mine.refresh_from_db()
+		theirs.refresh_from_db()
+		assert (mine.subject_id, mine.course_name, mine.deleted_at) == (None, "Physics", None)
+		assert theirs.deleted_at is not None
+
+
+@pytest.mark.django_db
+class TestLinkActivitySubjectsCommand:
+	def test_links_in_batches(self, user):
+		physics = _subject(user, "Physics")
+		activities = [_make_activity(user, "Physics") for _ in range(5)]
+		unknown = _make_activity(user, "Unlisted")
+
+		out = _link("--batch-size", "2")
+
+		assert set(
+			Activity.objects.exclude(id=unknown.id).values_list("subject_id", flat=True)
+		) == {physics.id}
+		assert Activity.objects.get(id=unknown.id).subject_id is None
+		assert out.count("linked=") == len(activities) // 2 + 1
+		assert "Linked 5 activity(ies)" in out
+
+	def test_resumes_after_id(self, user):
+		physics = _subject(user, "Physics")
+		first = _make_activity(user, "Physics")
+		second = _make_activity(user, "Physics")
+
+		_link("--after-id", str(first.id))
+
+		first.refresh_from_db()
+		second.refresh_from_db()
+		assert (first.subject_id, second.subject_id) == (None, physics.id)
+
+	def test_create_missing(self, user, other_user):
+		mine = _make_activity(user, "Unlisted")
+		theirs = _make_activity(other_user, "Unlisted")
+		Subject.objects.create(name="Unlisted")
+
+		_link("--create-missing")
+
+		mine.refresh_from_db()
+		theirs.refresh_from_db()
+		assert (mine.subject.name, theirs.subject.name) == ("Unlisted", "Unlisted")
+		assert mine.subject_id != theirs.subject_id
+		assert set(UserSubject.objects.values_list("user_id", "subject_id")) >= {
+			(user.id, mine.subject_id),
+			(other_user.id, theirs.subject_id),
+		}
+
+	def test_skips_subjects_the_owner_does_not_have(self, user, other_user):
+		_subject(other_user, "Physics")
+		activity = _make_activity(user, "Physics")
+
+		_link()
+
+		activity.refresh_from_db()
+		assert activity.subject_id is None
+
+	def test_prefers_the_oldest_namesake_subject(self, user):
+		oldest = _subject(user, "Physics")
+		_subject(user, "Physics")
+		Subject.objects.create(name="Physics")
+		activity = _make_activity(user, "Physics")
+
+		_link()
+
+		activity.refresh_from_db()
+		assert activity.subject_id == oldest.id
+
+	def test_bumps_data_versions(self, user):
+		_subject(user, "Physics")
+		_make_activity(user, "Physics")
+		before = versions.current(user)
+
+		_link()
+
+		assert versions.current(user) > before
+
+	def test_rejects_non_positive_batch_size(self):
+		with pytest.raises(CommandError):
+			_link("--batch-size", "0")
@@ -0,0 +1,269 @@
+"""
+Tests for POST /subtasks/batch/.
+
+A batch updates and deletes subtasks across activities in one transaction with
+bulk statements, records Progress entries for the updates and queues a single
+conflict pass over every affected date.
+"""
+
+import threading
+import time
+from datetime import date, timedelta
+from unittest import mock
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from planner import ledger
+from planner.models import Activity, Conflict, ConflictCheck, Progress, Subtask
+from planner.views import SubtaskBatchView
+
+BATCH_URL = reverse("subtask-batch")
+START = date(2099, 6, 1)
+# How long each concurrent batch holds its rows before writing them.
+RACE_WINDOW_SECONDS = 0.3
+
+# Helpers
+
+
+def _make_activity(user, title="Activity"):
+	return Activity.objects.create(
+		user=user,
+		title=title,
+		course_name="Course",
+		description="desc",
+		due_date="2099-12-31",
+		status="pending",
+	)
+
+
+def _make_subtasks(activity, n, *, hours=2, status="pending"):
+	subtasks = Subtask.objects.bulk_create(
+		[
+			Subtask(
+				activity_id=activity,
+				name=f"Task {i}",
+				estimated_hours=hours,
+				target_date=START + timedelta(days=i),
+				status=status,
+				ordering=i,
+			)
+			for i in range(n)
+		]
+	)
+	ledger.rebuild(activity.user)
+	return subtasks
+
+
+def _post(client, operations):
+	return client.post(BATCH_URL, {"operations": operations}, format="json")
+
+
+# Tests
+
+
+@pytest.mark.django_db
+class TestSubtaskBatch:
+	def test_updates_and_deletes_across_activities(self, auth_client, user):
+		first, second = _make_subtasks(_make_activity(user, "A"), 2)
+		(third,) = _make_subtasks(_make_activity(user, "B"), 1)
+
+		res = _post(
+			auth_client,
+			[
+				{"id": first.id, "action": "update", "changes": {"target_date": "2099-07-01"}},
+				{
+					"id": third.id,
+					"action": "update",
+					"changes": {"status": "completed"},
+					"note": " Done ",
+				},
+				{"id": second.id, "action": "delete"},
+			],
+		)
+
+		assert res.status_code == status.HTTP_200_OK, res.data
+		assert [s["id"] for s in res.data["updated"]] == [first.id, third.id]
+		assert res.data["deleted"] == [second.id]
+		first.refresh_from_db()
+		third.refresh_from_db()
+		assert (str(first.target_date), third.status) == ("2099-07-01", "completed")
+		assert not Subtask.objects.filter(id=second.id).exists()
+		assert list(Progress.objects.order_by("id").values_list("subtask_id", "note")) == [
+			(first.id, ""),
+			(third.id, "Done"),
+		]
+		assert ledger.find_drift(user) == []
+
+	def test_rescheduling_postponed_subtask_resets_it(self, auth_client, user):
+		(subtask,) = _make_subtasks(_make_activity(user), 1, status="postponed")
+
+		_post(
+			auth_client,
+			[{"id": subtask.id, "action": "update", "changes": {"target_date": "2099-07-01"}}],
+		)
+
+		subtask.refresh_from_db()
+		assert subtask.status == "pending"
+
+	def test_affected_dates_are_queued_once(self, auth_client, user):
+		subtasks = _make_subtasks(_make_activity(user), 3)
+		ConflictCheck.objects.all().delete()
+
+		_post(
+			auth_client,
+			[
+				{"id": s.id, "action": "update", "changes": {"target_date": "2099-07-01"}}
+				for s in subtasks
+			],
+		)
+
+		queued = set(ConflictCheck.objects.values_list("date", flat=True))
+		assert queued == {date(2099, 7, 1), *(s.target_date for s in subtasks)}
+
+	def test_moving_load_onto_one_day_raises_a_conflict(self, auth_client, user, sync_conflicts):
+		user.max_daily_hours = 5
+		user.save()
+		subtasks = _make_subtasks(_make_activity(user), 3)
+
+		_post(
+			auth_client,
+			[
+				{"id": s.id, "action": "update", "changes": {"target_date": "2099-07-01"}}
+				for s in subtasks
+			],
+		)
+
+		conflict = Conflict.objects.get(user=user, status="pending")
+		assert (conflict.affected_date, conflict.planned_hours) == (date(2099, 7, 1), 6)
+
+	def test_query_count_does_not_grow_with_operations(self, auth_client, user):
+		subtasks = _make_subtasks(_make_activity(user), 24)
+		_post(auth_client, [{"id": subtasks[0].id, "action": "delete"}])
+
+		def run(batch):
+			operations = [
+				{"id": s.id, "action": "update", "changes": {"estimated_hours": 1}}
+				for s in batch[:-1]
+			]
+			operations.append({"id": batch[-1].id, "action": "delete"})
+			with CaptureQueriesContext(connection) as queries:
+				res = _post(auth_client, operations)
+			assert res.status_code == status.HTTP_200_OK, res.data
+			return len(queries)
+
+		assert run(subtasks[1:4]) == run(subtasks[4:24])
+
+	def test_updates_write_only_the_fields_they_change(self, auth_client, user):
+		first, second = _make_subtasks(_make_activity(user), 2)
+
+		with CaptureQueriesContext(connection) as queries:
+			res = _post(
+				auth_client,
+				[
+					{"id": first.id, "action": "update", "changes": {"status": "completed"}},
+					{"id": second.id, "action": "update", "changes": {"name": "Renamed"}},
+				],
+			)
+
+		assert res.status_code == status.HTTP_200_OK, res.data
+		updates = [
+			query["sql"]
+			for query in queries.captured_queries
+			if query["sql"].startswith('UPDATE "planner_subtask"')
+		]
+		assert len(updates) == len((first, second))
+		assert not any('"name"' in sql and '"status"' in sql for sql in updates)
+		assert all('"target_date"' not in sql for sql in updates)
+
+
+@pytest.mark.django_db
+class TestSubtaskBatchValidation:
+	def test_other_users_subtask_returns_404_and_writes_nothing(
+		self, auth_client, user, other_user
+	):
+		(mine,) = _make_subtasks(_make_activity(user), 1)
+		(theirs,) = _make_subtasks(_make_activity(other_user), 1)
+
+		res = _post(
+			auth_client,
+			[{"id": mine.id, "action": "delete"}, {"id": theirs.id, "action": "delete"}],
+		)
+
+		assert res.status_code == status.HTTP_404_NOT_FOUND
+		assert set(Subtask.objects.values_list("id", flat=True)) == {mine.id, theirs.id}
+
+	def test_invalid_change_returns_422_and_writes_nothing(self, auth_client, user):
+		first, second = _make_subtasks(_make_activity(user), 2)
+
+		res = _post(
+			auth_client,
+			[
+				{"id": first.id, "action": "update", "changes": {"name": "Renamed"}},
+				{"id": second.id, "action": "update", "changes": {"status": "archived"}},
+			],
+		)
+
+		assert res.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+		assert "status" in res.data["errors"]["operations"]["1"]
+		first.refresh_from_db()
+		assert first.name == "Task 0"
+		assert not Progress.objects.exists()
+
+	@pytest.mark.parametrize(
+		"operations",
+		[
+			[],
+			[{"id": 1, "action": "archive"}],
+			[{"id": 1, "action": "update"}],
+			[{"id": 1, "action": "delete"}, {"id": 1, "action": "delete"}],
+		],
+	)
+	def test_malformed_batch_returns_422(self, auth_client, operations):
+		res = _post(auth_client, operations)
+
+		assert res.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+	def test_requires_authentication(self, unauth_client):
+		res = _post(unauth_client, [{"id": 1, "action": "delete"}])
+
+		assert res.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.skipif(connection.vendor != "postgresql", reason="needs row locks")
+@pytest.mark.django_db(transaction=True)
+class TestConcurrentBatches:
+	def test_concurrent_batches_keep_the_ledger_in_step(self, user):
+		(subtask,) = _make_subtasks(_make_activity(user), 1)
+		barrier = threading.Barrier(2)
+		validate = SubtaskBatchView._validate_changes
+
+		def slow_validate(*args):
+			# Without row locks both batches would read 2h before either writes.
+			time.sleep(RACE_WINDOW_SECONDS)
+			return validate(*args)
+
+		def send(hours):
+			client = APIClient()
+			client.force_authenticate(user=user)
+			barrier.wait()
+			try:
+				_post(
+					client,
+					[{"id": subtask.id, "action": "update", "changes": {"estimated_hours": hours}}],
+				)
+			finally:
+				connection.close()
+
+		threads = [threading.Thread(target=send, args=(hours,)) for hours in (5, 7)]
+		with mock.patch.object(SubtaskBatchView, "_validate_changes", side_effect=slow_validate):
+			for thread in threads:
+				thread.start()
+			for thread in threads:
+				thread.join()
+
+		assert ledger.find_drift() == []
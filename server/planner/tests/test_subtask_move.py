@@ -0,0 +1,156 @@
+"""
+Tests for POST /activities/<id>/subtasks/<id>/move/.
+
+Subtasks use sparse ordering keys: a move normally writes only the moved row,
+and siblings are renumbered only when there is no free key between neighbours.
+"""
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from planner import ordering
+from planner.models import Activity, Progress, Subtask
+
+# Helpers
+
+
+def _make_activity(user):
+	return Activity.objects.create(
+		user=user,
+		title="Activity",
+		course_name="Course",
+		description="desc",
+		due_date="2099-12-31",
+		status="pending",
+	)
+
+
+def _make_subtasks(activity, keys):
+	return Subtask.objects.bulk_create(
+		[
+			Subtask(
+				activity_id=activity,
+				name=f"S{i}",
+				estimated_hours=1,
+				target_date="2099-06-01",
+				status="pending",
+				ordering=key,
+			)
+			for i, key in enumerate(keys)
+		]
+	)
+
+
+def _move(client, subtask, after):
+	return client.post(
+		reverse(
+			"activity-subtask-move",
+			kwargs={"activity_id": subtask.activity_id_id, "subtask_id": subtask.id},
+		),
+		{"after": after},
+		format="json",
+	)
+
+
+def _listed_names(client, activity):
+	res = client.get(reverse("activity-subtasks", kwargs={"activity_id": activity.id}))
+	return [row["name"] for row in res.data]
+
+
+def _orderings(activity):
+	return dict(Subtask.objects.filter(activity_id=activity).values_list("name", "ordering"))
+
+
+# Tests
+
+
+@pytest.mark.django_db
+class TestSubtaskMove:
+	def test_move_between_siblings_writes_one_row(self, auth_client, user):
+		activity = _make_activity(user)
+		a, _, c = _make_subtasks(activity, [ordering.GAP, 2 * ordering.GAP, 3 * ordering.GAP])
+
+		with CaptureQueriesContext(connection) as queries:
+			res = _move(auth_client, c, after=a.id)
+
+		assert res.status_code == status.HTTP_200_OK
+		writes = [q for q in queries if q["sql"].startswith('UPDATE "planner_subtask"')]
+		assert len(writes) == 1
+		assert _listed_names(auth_client, activity) == ["S0", "S2", "S1"]
+		assert _orderings(activity)["S1"] == 2 * ordering.GAP
+
+	def test_move_to_top_and_bottom(self, auth_client, user):
+		activity = _make_activity(user)
+		a, b, c = _make_subtasks(activity, [ordering.GAP, 2 * ordering.GAP, 3 * ordering.GAP])
+
+		_move(auth_client, c, after=None)
+		_move(auth_client, a, after=b.id)
+
+		assert _listed_names(auth_client, activity) == ["S2", "S1", "S0"]
+
+	def test_dense_keys_are_rebalanced(self, auth_client, user):
+		activity = _make_activity(user)
+		a, _, c = _make_subtasks(activity, [1, 2, 3])
+
+		res = _move(auth_client, c, after=a.id)
+
+		assert res.status_code == status.HTTP_200_OK
+		assert _listed_names(auth_client, activity) == ["S0", "S2", "S1"]
+		assert sorted(_orderings(activity).values()) == [
+			ordering.GAP,
+			2 * ordering.GAP,
+			3 * ordering.GAP,
+		]
+
+	def test_repeated_moves_into_the_same_gap_stay_ordered(self, auth_client, user):
+		activity = _make_activity(user)
+		first, *rest = _make_subtasks(activity, [ordering.GAP * (i + 1) for i in range(15)])
+
+		# Keep squeezing the last subtask right after the first one.
+		expected = [first.name]
+		for subtask in reversed(rest):
+			_move(auth_client, subtask, after=first.id)
+			expected.insert(1, subtask.name)
+
+		assert _listed_names(auth_client, activity) == expected
+
+	def test_move_does_not_record_progress(self, auth_client, user):
+		activity = _make_activity(user)
+		a, b = _make_subtasks(activity, [ordering.GAP, 2 * ordering.GAP])
+
+		_move(auth_client, a, after=b.id)
+
+		assert not Progress.objects.exists()
+
+	def test_anchor_from_another_activity_returns_422(self, auth_client, user):
+		(subtask,) = _make_subtasks(_make_activity(user), [ordering.GAP])
+		(elsewhere,) = _make_subtasks(_make_activity(user), [ordering.GAP])
+
+		res = _move(auth_client, subtask, after=elsewhere.id)
+
+		assert res.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+		assert "after" in res.data["errors"]
+
+	def test_missing_after_returns_422(self, auth_client, user):
+		(subtask,) = _make_subtasks(_make_activity(user), [ordering.GAP])
+
+		res = auth_client.post(
+			reverse(
+				"activity-subtask-move",
+				kwargs={"activity_id": subtask.activity_id_id, "subtask_id": subtask.id},
+			),
+			{},
+			format="json",
+		)
+
+		assert res.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+	def test_other_users_subtask_returns_404(self, auth_client, other_user):
+		(subtask,) = _make_subtasks(_make_activity(other_user), [ordering.GAP])
+
+		res = _move(auth_client, subtask, after=None)
+
+		assert res.status_code == status.HTTP_404_NOT_FOUND
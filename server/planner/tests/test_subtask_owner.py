@@ -0,0 +1,145 @@
+"""
+Tests for the owner copied onto Subtask.
+
+Every subtask stores its activity's user, so per-user subtask queries filter a
+single table. The copy is filled in on save and bulk_create and follows the
+activity when it changes hands.
+"""
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from planner import ledger, versions
+from planner.models import Activity, ConflictCheck, DailyLoad, Subtask
+
+# Helpers
+
+
+def _make_activity(user):
+	return Activity.objects.create(
+		user=user,
+		title="Activity",
+		course_name="Course",
+		description="desc",
+		due_date="2099-12-31",
+		status="pending",
+	)
+
+
+def _subtask(**fields):
+	return Subtask(
+		name="Task",
+		estimated_hours=1,
+		target_date="2099-06-01",
+		status="pending",
+		ordering=0,
+		**fields,
+	)
+
+
+# Tests
+
+
+@pytest.mark.django_db
+class TestSubtaskOwner:
+	def test_api_create_sets_owner(self, auth_client, user):
+		activity = _make_activity(user)
+
+		res = auth_client.post(
+			reverse("activity-subtasks", kwargs={"activity_id": activity.id}),
+			{"name": "Task", "estimated_hours": 1, "target_date": "2099-06-01"},
+			format="json",
+		)
+
+		assert res.status_code == status.HTTP_201_CREATED
+		assert Subtask.objects.get(id=res.data["id"]).user_id == user.id
+
+	def test_nested_create_sets_owner(self, auth_client, user):
+		auth_client.post(
+			reverse("activity-list"),
+			{
+				"title": "Activity",
+				"course_name": "Course",
+				"due_date": "2099-12-31",
+				"status": "pending",
+				"subtasks": [
+					{"name": "A", "estimated_hours": 1, "target_date": "2099-06-01"},
+					{"name": "B", "estimated_hours": 1, "target_date": "2099-06-02"},
+				],
+			},
+			format="json",
+		)
+
+		assert set(Subtask.objects.values_list("user_id", flat=True)) == {user.id}
+
+	def test_bulk_create_with_loaded_activity_needs_no_lookup(
+		self, user, django_assert_num_queries
+	):
+		activity = _make_activity(user)
+
+		with django_assert_num_queries(1):
+			(subtask,) = Subtask.objects.bulk_create([_subtask(activity_id=activity)])
+
+		assert subtask.user_id == user.id
+
+	def test_bulk_create_by_activity_id_looks_owners_up_once(
+		self, user, other_user, django_assert_num_queries
+	):
+		mine, theirs = _make_activity(user), _make_activity(other_user)
+
+		with django_assert_num_queries(2):
+			created = Subtask.objects.bulk_create(
+				[
+					_subtask(activity_id_id=mine.id),
+					_subtask(activity_id_id=theirs.id),
+					_subtask(activity_id_id=mine.id),
+				]
+			)
+
+		assert [s.user_id for s in created] == [user.id, other_user.id, user.id]
+
+	def test_owner_follows_activity_transfer(self, user, other_user):
+		activity = _make_activity(user)
+		Subtask.objects.bulk_create(
+			[_subtask(activity_id=activity), _subtask(activity_id=activity)]
+		)
+		activity = Activity.objects.get(pk=activity.pk)
+
+		activity.user = other_user
+		activity.save()
+
+		assert set(Subtask.objects.values_list("user_id", flat=True)) == {other_user.id}
+
+	def test_transfer_moves_the_load_and_bumps_both_owners(self, user, other_user):
+		activity = _make_activity(user)
+		Subtask.objects.bulk_create(
+			[_subtask(activity_id=activity), _subtask(activity_id=activity)]
+		)
+		ledger.add_subtasks(activity.subtasks.all())
+		ConflictCheck.objects.all().delete()
+		activity = Activity.objects.get(pk=activity.pk)
+		mine, theirs = versions.current(user), versions.current(other_user)
+
+		activity.user = other_user
+		activity.save()
+
+		assert ledger.find_drift() == []
+		assert set(DailyLoad.objects.values_list("user_id", "planned_hours", "subtask_count")) == {
+			(user.id, 0, 0),
+			(other_user.id, 2, 2),
+		}
+		assert set(ConflictCheck.objects.values_list("user_id", flat=True)) == {
+			user.id,
+			other_user.id,
+		}
+		assert versions.current(user) > mine
+		assert versions.current(other_user) > theirs
+
+	def test_saving_without_transfer_leaves_subtasks_alone(self, user, django_assert_num_queries):
+		activity = _make_activity(user)
+		activity = Activity.objects.get(pk=activity.pk)
+		activity.title = "Renamed"
+
+		with django_assert_num_queries(1):
+			activity.save()
@@ -0,0 +1,154 @@
+"""
+Query-count tests for the subtask routes.
+
+Every route under /activities/<id>/subtasks/ loads its Activity (and subtask)
+through a request-scoped identity map, so the parent activity is fetched once
+per request however many times the view, the serializer context and the
+handler ask for it.
+"""
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from planner.models import Activity, Subtask
+
+# Queries per route, counting the transaction statements, ledger writes and the
+# data-version bump alongside the lookups.
+LIST_QUERIES = 2
+CREATE_QUERIES = 9
+PATCH_QUERIES = 13
+DELETE_QUERIES = 11
+MOVE_QUERIES = 8
+
+# Helpers
+
+
+def _make_activity(user):
+	return Activity.objects.create(
+		user=user,
+		title="Activity",
+		course_name="Course",
+		description="desc",
+		due_date="2099-12-31",
+		status="pending",
+	)
+
+
+def _make_subtasks(activity, n):
+	return Subtask.objects.bulk_create(
+		[
+			Subtask(
+				activity_id=activity,
+				name=f"Task {i}",
+				estimated_hours=1,
+				target_date="2099-06-01",
+				status="pending",
+				ordering=(i + 1) * 1024,
+			)
+			for i in range(n)
+		]
+	)
+
+
+def _detail_url(subtask, name="activity-subtask-detail"):
+	return reverse(name, kwargs={"activity_id": subtask.activity_id_id, "subtask_id": subtask.id})
+
+
+def _activity_selects(queries):
+	return [
+		q["sql"]
+		for q in queries
+		if q["sql"].startswith("SELECT") and 'FROM "planner_activity"' in q["sql"]
+	]
+
+
+def _run(request):
+	"""Run ``request()`` and return its response and the queries it issued."""
+	with CaptureQueriesContext(connection) as queries:
+		res = request()
+	return res, queries
+
+
+# Tests
+
+
+@pytest.mark.django_db
+class TestSubtaskRouteQueries:
+	@pytest.fixture(autouse=True)
+	def _setup(self, auth_client, user):
+		self.client = auth_client
+		self.activity = _make_activity(user)
+		self.subtasks = _make_subtasks(self.activity, 3)
+		# Create the user's data-version row so the first write is not special.
+		self.client.post(
+			reverse("activity-subtasks", kwargs={"activity_id": self.activity.id}),
+			{"name": "Warm-up", "estimated_hours": 1, "target_date": "2099-06-01"},
+			format="json",
+		)
+
+	def test_list(self):
+		res, queries = _run(
+			lambda: self.client.get(
+				reverse("activity-subtasks", kwargs={"activity_id": self.activity.id})
+			)
+		)
+
+		assert res.status_code == status.HTTP_200_OK
+		assert len(_activity_selects(queries)) == 1
+		assert len(queries) == LIST_QUERIES
+
+	def test_create(self):
+		res, queries = _run(
+			lambda: self.client.post(
+				reverse("activity-subtasks", kwargs={"activity_id": self.activity.id}),
+				{"name": "New", "estimated_hours": 2, "target_date": "2099-06-02"},
+				format="json",
+			)
+		)
+
+		assert res.status_code == status.HTTP_201_CREATED
+		assert len(_activity_selects(queries)) == 1
+		assert len(queries) == CREATE_QUERIES
+
+	def test_partial_update(self):
+		res, queries = _run(
+			lambda: self.client.patch(
+				_detail_url(self.subtasks[0]),
+				{"target_date": "2099-06-03", "note": "moved"},
+				format="json",
+			)
+		)
+
+		assert res.status_code == status.HTTP_200_OK
+		assert len(_activity_selects(queries)) == 1
+		assert len(queries) == PATCH_QUERIES
+
+	def test_destroy(self):
+		res, queries = _run(lambda: self.client.delete(_detail_url(self.subtasks[0])))
+
+		assert res.status_code == status.HTTP_204_NO_CONTENT
+		assert len(_activity_selects(queries)) == 1
+		assert len(queries) == DELETE_QUERIES
+
+	def test_move(self):
+		first, _, last = self.subtasks
+		res, queries = _run(
+			lambda: self.client.post(
+				_detail_url(last, "activity-subtask-move"), {"after": first.id}, format="json"
+			)
+		)
+
+		assert res.status_code == status.HTTP_200_OK
+		assert len(_activity_selects(queries)) == 1
+		assert len(queries) == MOVE_QUERIES
+
+	def test_unknown_activity_is_404_after_one_lookup(self):
+		res, queries = _run(
+			lambda: self.client.get(reverse("activity-subtasks", kwargs={"activity_id": 999999}))
+		)
+
+		assert res.status_code == status.HTTP_404_NOT_FOUND
+		assert len(queries) == 1
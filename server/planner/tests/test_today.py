@@ -8,6 +8,8 @@ Covers:
 - Ordering within each group
 - n_days query parameter handling
 - Empty-list responses
+- Single-query bucketing
+- Per-bucket cursor pagination
 """
 
 from datetime import timedelta
@@ -21,6 +23,7 @@ from planner.models import Activity, Subtask
 
 TODAY_URL = reverse("today")
 DEFAULT_N_DAYS = 7
+PAGE_LIMIT = 2
 
 
 # ──────────────────────────────────────────────
@@ -356,3 +359,135 @@ class TestTodayResponseStructure:
 			"updated_at",
 		}
 		assert expected_fields.issubset(set(subtask.keys()))
+
+
+# ──────────────────────────────────────────────
+#  8. Query count
+# ──────────────────────────────────────────────
+
+
+@pytest.mark.django_db
+class TestTodayQueryCount:
+	"""All three buckets are fetched with a single query, after the ETag's version lookup."""
+
+	def test_all_buckets_fetched_in_one_query(self, auth_client, user, django_assert_num_queries):
+		today = timezone.localdate()
+		act = _create_activity(user)
+		for offset in (-3, -1, 0, 0, 2, 5):
+			_create_subtask(act, name=f"D{offset}", target_date=today + timedelta(days=offset))
+
+		with django_assert_num_queries(2):
+			response = auth_client.get(TODAY_URL)
+
+		assert response.status_code == status.HTTP_200_OK
+		assert [s["name"] for s in response.data["overdue"]] == ["D-3", "D-1"]
+		assert [s["name"] for s in response.data["today"]] == ["D0", "D0"]
+		assert [s["name"] for s in response.data["upcoming"]] == ["D2", "D5"]
+
+	def test_status_filter_still_one_query(self, auth_client, user, django_assert_num_queries):
+		today = timezone.localdate()
+		act = _create_activity(user)
+		_create_subtask(act, name="Late", target_date=today - timedelta(days=1))
+		_create_subtask(act, name="Now", target_date=today)
+
+		with django_assert_num_queries(2):
+			response = auth_client.get(TODAY_URL, {"status": "hoy"})
+
+		assert response.data["overdue"] == []
+		assert [s["name"] for s in response.data["today"]] == ["Now"]
+
+
+# ──────────────────────────────────────────────
+#  9. Per-bucket cursor pagination
+# ──────────────────────────────────────────────
+
+
+@pytest.mark.django_db
+class TestTodayPagination:
+	"""Each bucket is paginated with its own keyset cursor."""
+
+	def test_limit_caps_each_bucket_and_returns_next_cursor(self, auth_client, user):
+		today = timezone.localdate()
+		act = _create_activity(user)
+		for hours in (1, 2, 3):
+			_create_subtask(act, name=f"T{hours}", target_date=today, estimated_hours=hours)
+		_create_subtask(act, name="Late", target_date=today - timedelta(days=1))
+
+		response = auth_client.get(TODAY_URL, {"limit": PAGE_LIMIT})
+
+		assert response.status_code == status.HTTP_200_OK
+		assert [s["name"] for s in response.data["today"]] == ["T1", "T2"]
+		assert [s["name"] for s in response.data["overdue"]] == ["Late"]
+		assert response.data["meta"]["limit"] == PAGE_LIMIT
+		assert response.data["meta"]["next"]["today"] is not None
+		assert response.data["meta"]["next"]["overdue"] is None
+		assert response.data["meta"]["next"]["upcoming"] is None
+
+	def test_following_cursors_walks_the_whole_bucket(self, auth_client, user):
+		today = timezone.localdate()
+		act = _create_activity(user)
+		expected = []
+		for offset in (1, 1, 2, 3, 3):
+			subtask = _create_subtask(
+				act, name=f"U{len(expected)}", target_date=today + timedelta(days=offset)
+			)
+			expected.append(subtask.name)
+
+		seen, cursor = [], None
+		while True:
+			params = {"limit": PAGE_LIMIT, "status": "proximas"}
+			if cursor is not None:
+				params["upcoming_cursor"] = cursor
+			response = auth_client.get(TODAY_URL, params)
+			seen += [s["name"] for s in response.data["upcoming"]]
+			cursor = response.data["meta"]["next"]["upcoming"]
+			if cursor is None:
+				break
+
+		assert seen == expected
+
+	def test_cursor_only_advances_its_own_bucket(self, auth_client, user):
+		today = timezone.localdate()
+		act = _create_activity(user)
+		_create_subtask(act, name="Late", target_date=today - timedelta(days=1))
+		_create_subtask(act, name="A", target_date=today, estimated_hours=1)
+		_create_subtask(act, name="B", target_date=today, estimated_hours=2)
+		first = auth_client.get(TODAY_URL, {"limit": 1})
+
+		response = auth_client.get(
+			TODAY_URL, {"limit": 1, "today_cursor": first.data["meta"]["next"]["today"]}
+		)
+
+		assert [s["name"] for s in response.data["today"]] == ["B"]
+		assert [s["name"] for s in response.data["overdue"]] == ["Late"]
+
+	def test_paginated_request_is_still_one_query(
+		self, auth_client, user, django_assert_num_queries
+	):
+		today = timezone.localdate()
+		act = _create_activity(user)
+		for offset in (-2, -1, 0, 0, 1, 2):
+			_create_subtask(act, target_date=today + timedelta(days=offset))
+		first = auth_client.get(TODAY_URL, {"limit": 1})
+
+		with django_assert_num_queries(2):
+			auth_client.get(
+				TODAY_URL,
+				{
+					"limit": 1,
+					"overdue_cursor": first.data["meta"]["next"]["overdue"],
+					"today_cursor": first.data["meta"]["next"]["today"],
+				},
+			)
+
+	@pytest.mark.parametrize("limit", ["0", "-1", "abc", "201"])
+	def test_invalid_limit_returns_400(self, auth_client, limit):
+		response = auth_client.get(TODAY_URL, {"limit": limit})
+		assert response.status_code == status.HTTP_400_BAD_REQUEST
+		assert "limit" in response.data["errors"]
+
+	@pytest.mark.parametrize("cursor", ["garbage", "bm90LWEtY3Vyc29y"])
+	def test_invalid_cursor_returns_400(self, auth_client, cursor):
+		response = auth_client.get(TODAY_URL, {"today_cursor": cursor})
+		assert response.status_code == status.HTTP_400_BAD_REQUEST
+		assert "today_cursor" in response.data["errors"]
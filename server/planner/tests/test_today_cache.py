@@ -0,0 +1,181 @@
+"""
+Tests for the per-user /today/ response cache.
+
+Payloads are cached per user, data version, filters and local date; writes
+invalidate them by bumping the data version and the date rolls them over at
+midnight.
+"""
+
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.core.cache import caches
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from planner import today_cache
+from planner.models import Activity
+
+TODAY_URL = reverse("today")
+STATS_URL = reverse("today-cache")
+
+# Helpers
+
+
+def _make_activity(user, *, title="Test Activity"):
+	return Activity.objects.create(
+		user=user,
+		title=title,
+		course_name="Test Course",
+		description="desc",
+		due_date="2099-12-31",
+		status="pending",
+	)
+
+
+def _create_subtask(client, activity, *, name="Task", target_date=None):
+	res = client.post(
+		reverse("activity-subtasks", kwargs={"activity_id": activity.id}),
+		{
+			"name": name,
+			"estimated_hours": 1,
+			"target_date": str(target_date or timezone.localdate()),
+		},
+		format="json",
+	)
+	assert res.status_code == status.HTTP_201_CREATED, res.data
+	return res.data["id"]
+
+
+def _names(res, bucket="today"):
+	return [s["name"] for s in res.data[bucket]]
+
+
+# Tests
+
+
+@pytest.mark.django_db
+class TestTodayCache:
+	def test_repeat_request_is_served_from_cache(
+		self, auth_client, user, django_assert_num_queries
+	):
+		_create_subtask(auth_client, _make_activity(user), name="A")
+		first = auth_client.get(TODAY_URL)
+
+		# Only the data-version lookup behind the cache key.
+		with django_assert_num_queries(1):
+			second = auth_client.get(TODAY_URL)
+
+		assert (first["X-Cache"], second["X-Cache"]) == ("MISS", "HIT")
+		assert second.data == first.data
+
+	def test_filters_are_cached_separately(self, auth_client):
+		auth_client.get(TODAY_URL)
+
+		res = auth_client.get(TODAY_URL, {"status": "hoy"})
+
+		assert res["X-Cache"] == "MISS"
+
+	def test_users_do_not_share_entries(self, auth_client, user, other_user):
+		_create_subtask(auth_client, _make_activity(user), name="Mine")
+		auth_client.get(TODAY_URL)
+		other_client = APIClient()
+		other_client.force_authenticate(user=other_user)
+
+		res = other_client.get(TODAY_URL)
+
+		assert res["X-Cache"] == "MISS"
+		assert _names(res) == []
+
+	def test_subtask_write_invalidates(self, auth_client, user):
+		activity = _make_activity(user)
+		_create_subtask(auth_client, activity, name="A")
+		auth_client.get(TODAY_URL)
+
+		_create_subtask(auth_client, activity, name="B")
+		res = auth_client.get(TODAY_URL)
+
+		assert res["X-Cache"] == "MISS"
+		assert _names(res) == ["A", "B"]
+
+	def test_activity_update_invalidates(self, auth_client, user):
+		activity = _make_activity(user)
+		_create_subtask(auth_client, activity)
+		auth_client.get(TODAY_URL)
+
+		auth_client.patch(
+			reverse("activity-detail", kwargs={"pk": activity.id}),
+			{"title": "Renamed"},
+			format="json",
+		)
+		res = auth_client.get(TODAY_URL)
+
+		assert res.data["today"][0]["activity"]["title"] == "Renamed"
+
+	def test_activity_delete_invalidates(self, auth_client, user):
+		activity = _make_activity(user)
+		_create_subtask(auth_client, activity)
+		auth_client.get(TODAY_URL)
+
+		auth_client.delete(reverse("activity-detail", kwargs={"pk": activity.id}))
+
+		assert _names(auth_client.get(TODAY_URL)) == []
+
+	def test_midnight_rolls_entries_over(self, auth_client, user):
+		_create_subtask(auth_client, _make_activity(user), name="A")
+		auth_client.get(TODAY_URL)
+		tomorrow = timezone.localdate() + timedelta(days=1)
+
+		with mock.patch("planner.views.timezone.localdate", return_value=tomorrow):
+			res = auth_client.get(TODAY_URL)
+
+		assert res["X-Cache"] == "MISS"
+		assert (_names(res, "overdue"), _names(res)) == (["A"], [])
+
+	def test_errors_are_not_cached(self, auth_client):
+		auth_client.get(TODAY_URL, {"n_days": -1})
+
+		res = auth_client.get(TODAY_URL, {"n_days": -1})
+
+		assert res.status_code == status.HTTP_400_BAD_REQUEST
+		assert res["X-Cache"] == "MISS"
+
+
+@pytest.mark.django_db
+class TestTodayCacheStats:
+	def test_counts_hits_and_misses(self, auth_client):
+		auth_client.get(TODAY_URL)
+		auth_client.get(TODAY_URL)
+		auth_client.get(TODAY_URL)
+
+		assert today_cache.stats() == {"hits": 2, "misses": 1, "hit_rate": 2 / 3}
+
+	def test_stats_endpoint_reports_and_resets(self, auth_client, user):
+		user.is_staff = True
+		user.save()
+		auth_client.get(TODAY_URL)
+		auth_client.get(TODAY_URL)
+
+		res = auth_client.get(STATS_URL)
+
+		assert res.status_code == status.HTTP_200_OK
+		assert res.data == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+		assert auth_client.delete(STATS_URL).status_code == status.HTTP_204_NO_CONTENT
+		assert auth_client.get(STATS_URL).data == {"hits": 0, "misses": 0, "hit_rate": 0.0}
+
+	def test_counts_do_not_depend_on_the_cache(self, auth_client):
+		# Clearing or culling the cache drops payloads, not the counters.
+		auth_client.get(TODAY_URL)
+		caches[today_cache.CACHE_ALIAS].clear()
+
+		auth_client.get(TODAY_URL)
+
+		assert today_cache.stats() == {"hits": 0, "misses": 2, "hit_rate": 0.0}
+
+	def test_stats_endpoint_is_staff_only(self, auth_client, unauth_client):
+		assert auth_client.get(STATS_URL).status_code == status.HTTP_403_FORBIDDEN
+		assert auth_client.delete(STATS_URL).status_code == status.HTTP_403_FORBIDDEN
+		assert unauth_client.get(STATS_URL).status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,85 @@
+"""
+Per-user response cache for GET /today/.
+
+Entries are keyed by the request's ETag, which already combines the user, their
+data version, the query parameters and the local date. Every write that touches
+the user's subtasks or activities bumps the data version, so it invalidates all
+of that user's cached payloads at once. The date in the key rolls entries over
+at midnight. Stale entries are never read again and simply expire.
+
+With the default local-memory backend the cache is per process. Set
+``PLANNER_TODAY_CACHE_DIR`` to share a file-based cache between workers.
+
+Hits and misses are counted in the memory of the process that serves the
+request, and GET /health/today-cache/ reports that worker's counters when
+sizing the cache. They are not kept in the cache itself: a local-memory cache
+is out of reach of any other process, and the file-based backend's ``incr`` is
+not atomic across workers.
+"""
+
+import threading
+from collections import Counter
+
+from django.core.cache import caches
+from rest_framework import status
+from rest_framework.response import Response
+
+CACHE_ALIAS = "today"
+
+_counts = Counter()
+_counts_lock = threading.Lock()
+
+
+def _count(stat: str) -> None:
+	with _counts_lock:
+		_counts[stat] += 1
+
+
+def respond(key: str, build) -> Response:
+	"""Serve the payload cached under ``key``, or call ``build()`` and cache its response."""
+	cache = caches[CACHE_ALIAS]
+	data = cache.get(f"today:{key}")
+	if data is not None:
+		return _hit(data)
+
+	_count("misses")
+	response = build()
+	if response.status_code == status.HTTP_200_OK:
+		cache.set(f"today:{key}", response.data)
+	response["X-Cache"] = "MISS"
+	return response
+
+
+async def arespond(key: str, build) -> Response:
+	"""``respond`` for async views: awaits the cache and ``build()``."""
+	cache = caches[CACHE_ALIAS]
+	data = await cache.aget(f"today:{key}")
+	if data is not None:
+		return _hit(data)
+
+	_count("misses")
+	response = await build()
+	if response.status_code == status.HTTP_200_OK:
+		await cache.aset(f"today:{key}", response.data)
+	response["X-Cache"] = "MISS"
+	return response
+
+
+def _hit(data) -> Response:
+	_count("hits")
+	response = Response(data)
+	response["X-Cache"] = "HIT"
+	return response
+
+
+def stats() -> dict:
+	"""Return this process's hit and miss counters and the resulting hit rate."""
+	with _counts_lock:
+		counts = {"hits": _counts["hits"], "misses": _counts["misses"]}
+	total = counts["hits"] + counts["misses"]
+	return {**counts, "hit_rate": counts["hits"] / total if total else 0.0}
+
+
+def reset_stats() -> None:
+	with _counts_lock:
+		_counts.clear()
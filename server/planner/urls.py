@@ -4,10 +4,15 @@ from rest_framework.routers import DefaultRouter
 from .views import (
 	ActivityViewSet,
 	ConflictViewSet,
+	DashboardSummaryView,
+	DatabasePoolView,
 	MeView,
+	ProgressView,
 	RegisterView,
 	SubjectViewSet,
+	SubtaskBatchView,
 	SubtaskViewSet,
+	TodayCacheStatsView,
 	TodayView,
 	health_check,
 )
@@ -25,7 +30,9 @@ subtask_list = SubtaskViewSet.as_view(
 )
 
 urlpatterns = [
-	path("health/", health_check),
+	path("health/", health_check, name="health"),
+	path("health/db-pool/", DatabasePoolView.as_view(), name="db-pool"),
+	path("health/today-cache/", TodayCacheStatsView.as_view(), name="today-cache"),
 	path("me/", MeView.as_view(), name="me"),
 	path("register/", RegisterView.as_view(), name="register"),
 	path(
@@ -38,7 +45,15 @@ urlpatterns = [
 		SubtaskViewSet.as_view({"delete": "destroy", "patch": "partial_update"}),
 		name="activity-subtask-detail",
 	),
+	path(
+		"activities/<int:activity_id>/subtasks/<int:subtask_id>/move/",
+		SubtaskViewSet.as_view({"post": "move"}),
+		name="activity-subtask-move",
+	),
+	path("subtasks/batch/", SubtaskBatchView.as_view(), name="subtask-batch"),
 	path("today/", TodayView.as_view(), name="today"),
+	path("progress/", ProgressView.as_view(), name="progress"),
+	path("dashboard/summary/", DashboardSummaryView.as_view(), name="dashboard-summary"),
 ]
 
 urlpatterns += router.urls
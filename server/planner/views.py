@@ -1,28 +1,77 @@
 import logging
+from collections import defaultdict
 from datetime import date, timedelta
-
-from django.db import transaction
-from django.db.models import Count, Q, Sum
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.db import connection, transaction
+from django.db.models import (
+	Case,
+	Count,
+	Exists,
+	IntegerField,
+	OuterRef,
+	Prefetch,
+	Q,
+	Subquery,
+	Sum,
+	Value,
+	When,
+)
+from django.db.models.functions import Coalesce
 from django.http import Http404
 from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiExample, OpenApiParameter, extend_schema, inline_serializer
 from rest_framework import serializers as drf_serializers
 from rest_framework import status, viewsets
 from rest_framework.decorators import action, api_view
-from rest_framework.exceptions import NotFound, ValidationError
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.exceptions import NotFound, ParseError, ValidationError
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from rest_framework_simplejwt.views import TokenObtainPairView
 
-from .models import Activity, Conflict, Progress, Subject, Subtask, User
+from . import (
+	conflicts,
+	dashboard,
+	ledger,
+	loaders,
+	ordering,
+	purge,
+	rollups,
+	subjects,
+	today_cache,
+	versions,
+)
+from .async_views import AsyncDispatchMixin, AsyncReadMixin
+from .models import (
+	Activity,
+	Conflict,
+	Progress,
+	ProgressRollup,
+	Subject,
+	Subtask,
+	User,
+	UserSubject,
+)
+from .pagination import (
+	ActivityPagination,
+	decode_cursor,
+	encode_cursor,
+	parse_limit,
+	rows_after,
+)
 from .serializers import (
 	ActivitySerializer,
 	ConflictResolveSerializer,
 	ConflictSerializer,
 	SubjectSerializer,
+	SubtaskBatchSerializer,
+	SubtaskMoveSerializer,
+	SubtaskOperationSerializer,
 	SubtaskSerializer,
 	TodaySubtaskSerializer,
 	UserRegistrationSerializer,
@@ -32,37 +81,94 @@ from .serializers import (
 
 logger = logging.getLogger(__name__)
 
+_ACTIVITY_STATUSES = ("pending", "completed", "in_progress", "postponed")
 
-def _evaluate_day_conflicts(user, target_date: date) -> None:
-	"""Create, update, or auto-resolve a Conflict for a given user/date after any subtask change."""
-	total: int = int(
-		Subtask.objects.filter(
-			activity_id__user=user,
-			target_date=target_date,
-			status__in=["pending", "in_progress"],
-		).aggregate(total=Sum("estimated_hours"))["total"]
-		or 0
-	)
-	if total > user.max_daily_hours:
-		conflict = Conflict.objects.filter(user=user, affected_date=target_date).first()
-		if conflict:
-			conflict.planned_hours = total
-			conflict.max_allowed_hours = user.max_daily_hours
-			conflict.status = "pending"
-			conflict.save(update_fields=["planned_hours", "max_allowed_hours", "status"])
-		else:
-			Conflict.objects.create(
-				user=user,
-				affected_date=target_date,
-				type="overload",
-				planned_hours=total,
-				max_allowed_hours=user.max_daily_hours,
-				status="pending",
-			)
-	else:
-		Conflict.objects.filter(user=user, affected_date=target_date, status="pending").update(
-			status="resolved"
-		)
+
+def _record_subtask_change(user_id: int, before=None, after=None) -> None:
+	"""Move a subtask's load on the ledger and bump its owner's data version."""
+	ledger.record_change(user_id, before=before, after=after)
+	versions.bump([user_id])
+
+
+def _log_progress(entries: list[Progress], previous_statuses: dict[int, str]) -> None:
+	"""Insert Progress entries and add them to the daily rollups."""
+	Progress.objects.bulk_create(entries)
+	rollups.record(entries, previous_statuses)
+
+
+def _positive_int_param(params, name: str) -> int:
+	try:
+		value = int(params[name])
+		if value <= 0:
+			raise ValueError
+	except ValueError as err:
+		raise ParseError({"errors": {name: "Must be a positive integer."}}) from err
+	return value
+
+
+def _conditional_get(etag_func):
+	"""
+	Answer a GET handler with 304 Not Modified when the request's If-None-Match
+	matches ``etag_func(request)``; otherwise run the handler and tag its response.
+	Responses are marked private and must be revalidated, so browsers re-send the
+	ETag on every poll instead of serving a stale copy. The validator is also set
+	as ``request.etag`` so the handler can key a response cache by it.
+	"""
+
+	def tag(response, etag):
+		if response.status_code in {status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED}:
+			response.headers["ETag"] = etag
+			patch_cache_control(response, private=True, no_cache=True)
+		return response
+
+	def decorator(handler):
+		if iscoroutinefunction(handler):
+
+			@wraps(handler)
+			async def async_wrapper(view, request, *args, **kwargs):
+				etag = request.etag = await sync_to_async(etag_func)(request)
+				response = get_conditional_response(request, etag=etag)
+				if response is None:
+					response = await handler(view, request, *args, **kwargs)
+				return tag(response, etag)
+
+			return async_wrapper
+
+		@wraps(handler)
+		def wrapper(view, request, *args, **kwargs):
+			etag = request.etag = etag_func(request)
+			response = get_conditional_response(request, etag=etag)
+			if response is None:
+				response = handler(view, request, *args, **kwargs)
+			return tag(response, etag)
+
+		return wrapper
+
+	return decorator
+
+
+def _today_etag(request) -> str:
+	# The buckets move at midnight without any write, so the date is part of the tag.
+	return versions.etag(request, timezone.localdate())
+
+
+def _activities_etag(request) -> str:
+	# ?has_overdue= compares target dates with today, so that listing rolls over too.
+	if "has_overdue" in request.query_params:
+		return _today_etag(request)
+	return versions.etag(request)
+
+
+def _conflicts_etag(request) -> str:
+	# Evaluate queued checks first so the tag covers conflicts they change.
+	conflicts.reconcile(request.user)
+	return versions.etag(request)
+
+
+def _dashboard_etag(request) -> str:
+	# Counts pending conflicts and overdue subtasks, so both of the above apply.
+	conflicts.reconcile(request.user)
+	return versions.etag(request, timezone.localdate())
 
 
 @api_view(["GET"])
@@ -72,10 +178,85 @@ def _evaluate_day_conflicts(user, target_date: date) -> None:
 	responses={200: OpenApiTypes.OBJECT},
 	examples=[OpenApiExample("Health example", value={"status": "ok"}, response_only=True)],
 )
-def health_check():
+def health_check(_request):
 	return Response({"status": "ok"})
 
 
+class DatabasePoolView(APIView):
+	"""
+	GET /health/db-pool/ → connection reuse mode and, when pooled, the pool counters.
+	"""
+
+	permission_classes = [IsAdminUser]
+
+	@extend_schema(
+		summary="Database pool statistics",
+		description=(
+			"Staff only. Report how the serving worker process reuses database connections "
+			"(see config/database.py): `pooled` is false for persistent per-thread connections, "
+			"which report their `conn_max_age`; a pooled worker returns psycopg's pool "
+			"counters (`pool_size`, `pool_available`, `requests_waiting`, ...). Counters are "
+			"per worker process."
+		),
+		responses=OpenApiTypes.OBJECT,
+		examples=[
+			OpenApiExample(
+				"Pooled",
+				value={
+					"pooled": True,
+					"pool_min": 2,
+					"pool_max": 5,
+					"pool_size": 3,
+					"pool_available": 2,
+					"requests_waiting": 0,
+					"requests_num": 1250,
+				},
+				response_only=True,
+			),
+		],
+	)
+	def get(self, request):
+		pool = getattr(connection, "pool", None)
+		if pool is None:
+			return Response(
+				{"pooled": False, "conn_max_age": connection.settings_dict["CONN_MAX_AGE"]}
+			)
+		return Response({"pooled": True, **pool.get_stats()})
+
+
+class TodayCacheStatsView(APIView):
+	"""
+	GET    /health/today-cache/ → hit/miss counters of the /today/ cache in this worker.
+	DELETE /health/today-cache/ → zero them.
+	"""
+
+	permission_classes = [IsAdminUser]
+
+	@extend_schema(
+		summary="Today cache statistics",
+		description=(
+			"Staff only. Report how often GET /today/ was served from the response cache by "
+			"the worker process that serves this request (see planner/today_cache.py). "
+			"Counters are per worker process and start at zero when it starts."
+		),
+		responses=OpenApiTypes.OBJECT,
+		examples=[
+			OpenApiExample(
+				"Counters",
+				value={"hits": 900, "misses": 100, "hit_rate": 0.9},
+				response_only=True,
+			),
+		],
+	)
+	def get(self, request):
+		return Response(today_cache.stats())
+
+	@extend_schema(summary="Reset today cache statistics", responses={204: None})
+	def delete(self, request):
+		today_cache.reset_stats()
+		return Response(status=status.HTTP_204_NO_CONTENT)
+
+
 class EmailOrUsernameTokenObtainPairSerializer(TokenObtainPairSerializer):
 	# Keep `username` optional for backward compatibility and accept `identifier` too.
 	username = drf_serializers.CharField(required=False, allow_blank=True, write_only=True)
@@ -122,7 +303,7 @@ class RegisterView(APIView):
 		return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class MeView(APIView):
+class MeView(AsyncDispatchMixin, APIView):
 	permission_classes = [IsAuthenticated]
 
 	@extend_schema(
@@ -148,6 +329,10 @@ class MeView(APIView):
 		serializer = UserSerializer(request.user)
 		return Response(serializer.data)
 
+	async def aget(self, request):
+		# The user was loaded by authentication; serializing it needs no query.
+		return self.get(request)
+
 	@extend_schema(
 		summary="Update current user",
 		description="Partially update the authenticated user's profile (e.g. max_daily_hours).",
@@ -170,22 +355,16 @@ class MeView(APIView):
 		serializer.save()
 		new_max: int = serializer.instance.max_daily_hours
 
-		# When the daily cap changes, re-evaluate every date that has subtasks —
+		# When the daily cap changes, mark every date that has planned load as dirty —
 		# not just dates with pending conflicts, because a previously-resolved
 		# conflict may need to become pending again if the cap was lowered.
 		if old_max != new_max:
-			affected_dates = list(
-				Subtask.objects.filter(activity_id__user=request.user)
-				.values_list("target_date", flat=True)
-				.distinct()
-			)
-			for d in affected_dates:
-				_evaluate_day_conflicts(request.user, d)
+			conflicts.mark_user_dirty(request.user)
 
 		return Response(UserSerializer(serializer.instance).data)
 
 
-class ActivityViewSet(viewsets.ModelViewSet):
+class ActivityViewSet(AsyncReadMixin, viewsets.ModelViewSet):
 	"""
 	Activities endpoints (authenticated user only).
 
@@ -226,18 +405,78 @@ class ActivityViewSet(viewsets.ModelViewSet):
 
 	serializer_class = ActivitySerializer
 	permission_classes = [IsAuthenticated]
+	pagination_class = ActivityPagination
 
 	def get_queryset(self):
-		return Activity.objects.filter(user=self.request.user).annotate(
-			_total_subtasks=Count("subtasks"),
-			_completed_subtasks=Count("subtasks", filter=Q(subtasks__status="completed")),
+		# Counters and hours are correlated subqueries of the main query and the nested
+		# subtasks come from one prefetch, so listing takes the same queries for any
+		# number of activities. Unlike a JOIN with GROUP BY, the subqueries only run
+		# for the rows returned, so a keyset page reads its index range and stops.
+		per_activity = Subtask.objects.filter(activity_id=OuterRef("pk")).order_by()
+
+		def total(aggregate):
+			rows = per_activity.values("activity_id").annotate(value=aggregate).values("value")
+			return Coalesce(Subquery(rows), 0)
+
+		return (
+			Activity.objects.filter(user=self.request.user)
+			.annotate(
+				_total_subtasks=total(Count("id")),
+				_completed_subtasks=total(Count("id", filter=Q(status="completed"))),
+				_total_estimated_hours=total(Sum("estimated_hours")),
+			)
+			.prefetch_related(
+				Prefetch("subtasks", queryset=Subtask.objects.order_by("ordering", "id"))
+			)
 		)
 
+	def filter_queryset(self, queryset):
+		if self.action != "list":
+			return queryset
+		params = self.request.query_params
+
+		status_param = params.get("status")
+		if status_param is not None:
+			if status_param not in _ACTIVITY_STATUSES:
+				raise ParseError(
+					{"errors": {"status": f"Must be one of: {', '.join(_ACTIVITY_STATUSES)}"}}
+				)
+			queryset = queryset.filter(status=status_param)
+
+		if "subject" in params:
+			# Only linked activities; unlinked ones are linked by link_activity_subjects.
+			queryset = queryset.filter(subject_id=_positive_int_param(params, "subject"))
+
+		for param, lookup in (("due_from", "due_date__gte"), ("due_to", "due_date__lte")):
+			if param in params:
+				try:
+					queryset = queryset.filter(**{lookup: date.fromisoformat(params[param])})
+				except ValueError as err:
+					raise ParseError({"errors": {param: "Must be a date (YYYY-MM-DD)."}}) from err
+
+		has_overdue = params.get("has_overdue")
+		if has_overdue is not None:
+			if has_overdue not in {"true", "false"}:
+				raise ParseError({"errors": {"has_overdue": "Must be true or false."}})
+			overdue = Subtask.objects.filter(
+				activity_id=OuterRef("pk"), target_date__lt=timezone.localdate()
+			).exclude(status="completed")
+			queryset = queryset.filter(
+				Exists(overdue) if has_overdue == "true" else ~Exists(overdue)
+			)
+
+		return queryset
+
 	def perform_create(self, serializer):
-		activity = serializer.save(user=self.request.user)
-		affected_dates = list(activity.subtasks.values_list("target_date", flat=True).distinct())
-		for affected_date in affected_dates:
-			_evaluate_day_conflicts(self.request.user, affected_date)
+		with transaction.atomic():
+			activity = serializer.save(user=self.request.user)
+			ledger.add_subtasks(activity.subtasks.all())
+			versions.bump([self.request.user.id])
+
+	def perform_update(self, serializer):
+		with transaction.atomic():
+			serializer.save()
+			versions.bump([self.request.user.id])
 
 	@extend_schema(
 		summary="Create activity",
@@ -294,12 +533,7 @@ class ActivityViewSet(viewsets.ModelViewSet):
 	def destroy(self, request, *args, **kwargs):
 		try:
 			activity = self.get_object()
-			affected_dates = list(
-				activity.subtasks.values_list("target_date", flat=True).distinct()
-			)
-			activity.delete()
-			for affected_date in affected_dates:
-				_evaluate_day_conflicts(request.user, affected_date)
+			purge.soft_delete(Activity.objects.filter(pk=activity.pk))
 			return Response(status=status.HTTP_204_NO_CONTENT)
 
 		except Http404 as err:
@@ -362,14 +596,73 @@ class ActivityViewSet(viewsets.ModelViewSet):
 		if not serializer.is_valid():
 			return Response(serializer.errors, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
 
-		serializer.save()
+		self.perform_update(serializer)
 		return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 	@extend_schema(
 		summary="List activities",
 		description=(
 			"Return a list of activities for the authenticated user, including progress counters."
+			"\n\nPass `limit` and/or `cursor` to page through the list in (due_date, id) order; "
+			"the response is then `{next, previous, results}` where `next` is the URL of the "
+			"following page. Without them every matching activity is returned as a plain list."
 		),
+		parameters=[
+			OpenApiParameter(
+				"status",
+				OpenApiTypes.STR,
+				OpenApiParameter.QUERY,
+				required=False,
+				enum=list(_ACTIVITY_STATUSES),
+				description="Only activities with this status.",
+			),
+			OpenApiParameter(
+				"subject",
+				OpenApiTypes.INT,
+				OpenApiParameter.QUERY,
+				required=False,
+				description="Only activities linked to this subject id.",
+			),
+			OpenApiParameter(
+				"due_from",
+				OpenApiTypes.DATE,
+				OpenApiParameter.QUERY,
+				required=False,
+				description="Only activities due on or after this date.",
+			),
+			OpenApiParameter(
+				"due_to",
+				OpenApiTypes.DATE,
+				OpenApiParameter.QUERY,
+				required=False,
+				description="Only activities due on or before this date.",
+			),
+			OpenApiParameter(
+				"has_overdue",
+				OpenApiTypes.BOOL,
+				OpenApiParameter.QUERY,
+				required=False,
+				description="true: only activities with an unfinished subtask before today; "
+				"false: only those without one.",
+			),
+			OpenApiParameter(
+				"limit",
+				OpenApiTypes.INT,
+				OpenApiParameter.QUERY,
+				required=False,
+				description=(
+					f"Page size (1-{ActivityPagination.max_limit}, "
+					f"default {ActivityPagination.default_limit})."
+				),
+			),
+			OpenApiParameter(
+				"cursor",
+				OpenApiTypes.STR,
+				OpenApiParameter.QUERY,
+				required=False,
+				description="Continue from a previous page's `next` link.",
+			),
+		],
 		responses=ActivitySerializer(many=True),
 		examples=[
 			OpenApiExample(
@@ -389,9 +682,14 @@ class ActivityViewSet(viewsets.ModelViewSet):
 			),
 		],
 	)
+	@_conditional_get(_activities_etag)
 	def list(self, request, *args, **kwargs):
 		return super().list(request, *args, **kwargs)
 
+	@_conditional_get(_activities_etag)
+	async def alist(self, request, *args, **kwargs):
+		return await super().alist(request, *args, **kwargs)
+
 	@extend_schema(
 		summary="Update activity",
 		description="Replace an activity's fields (PUT).",
@@ -471,16 +769,25 @@ class SubtaskViewSet(viewsets.ModelViewSet):
 
 	def get_activity(self):
 		try:
-			return Activity.objects.get(
-				id=self.kwargs["activity_id"],
-				user=self.request.user,
-			)
+			return loaders.activity(self.request, self.kwargs["activity_id"])
 		except Activity.DoesNotExist as err:
 			raise NotFound(detail="There is no activity with the given id") from err
 
+	def get_object(self, *, lock=False):
+		"""The subtask of the URL; with ``lock``, re-read under a row lock (see loaders)."""
+		load = loaders.lock_subtask if lock else loaders.subtask
+		try:
+			return load(self.request, self.get_activity(), self.kwargs["subtask_id"])
+		except Subtask.DoesNotExist as err:
+			raise NotFound(
+				detail={
+					"errors": {"resource": "There is no subtask with such id for this activity"}
+				}
+			) from err
+
 	def get_queryset(self):
 		activity = self.get_activity()
-		return Subtask.objects.filter(activity_id=activity).order_by("ordering")
+		return Subtask.objects.filter(activity_id=activity).order_by("ordering", "id")
 
 	def get_serializer_context(self):
 		context = super().get_serializer_context()
@@ -563,8 +870,9 @@ class SubtaskViewSet(viewsets.ModelViewSet):
 
 		try:
 			serializer.is_valid(raise_exception=True)
-			serializer.save(activity_id=activity)
-			_evaluate_day_conflicts(request.user, serializer.instance.target_date)
+			with transaction.atomic():
+				serializer.save(activity_id=activity)
+				_record_subtask_change(request.user.id, after=ledger.load_of(serializer.instance))
 			return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 		except ValidationError as err:
@@ -598,23 +906,11 @@ class SubtaskViewSet(viewsets.ModelViewSet):
 		],
 	)
 	def destroy(self, request, activity_id=None, subtask_id=None):
-		activity = self.get_activity()
-
-		try:
-			subtask = Subtask.objects.get(
-				id=subtask_id,
-				activity_id=activity,  # ✅ FIXED
-			)
-		except Subtask.DoesNotExist as err:
-			raise NotFound(
-				detail={
-					"errors": {"resource": "There is no subtask with such id for this activity"}
-				}
-			) from err
-
-		target_date = subtask.target_date
-		subtask.delete()
-		_evaluate_day_conflicts(request.user, target_date)
+		with transaction.atomic():
+			# A concurrent DELETE waits here and then finds nothing to subtract.
+			subtask = self.get_object(lock=True)
+			_record_subtask_change(request.user.id, before=ledger.load_of(subtask))
+			subtask.delete()
 		return Response(status=status.HTTP_204_NO_CONTENT)
 
 	@extend_schema(
@@ -745,20 +1041,6 @@ class SubtaskViewSet(viewsets.ModelViewSet):
 		],
 	)
 	def partial_update(self, request, activity_id=None, subtask_id=None):
-		activity = self.get_activity()
-
-		try:
-			subtask = Subtask.objects.get(
-				id=subtask_id,
-				activity_id=activity,
-			)
-		except Subtask.DoesNotExist as err:
-			raise NotFound(
-				detail={
-					"errors": {"resource": "There is no subtask with such id for this activity"}
-				}
-			) from err
-
 		# Extract note before passing to SubtaskSerializer (Subtask has no note field)
 		data = request.data.copy()
 		raw_note = data.pop("note", "")
@@ -767,43 +1049,255 @@ class SubtaskViewSet(viewsets.ModelViewSet):
 			raw_note = raw_note[0] if raw_note else ""
 		note: str = (raw_note or "").strip()
 
-		# Auto-reset postponed subtasks to pending when rescheduled.
-		if subtask.status == "postponed" and "target_date" in data:
-			data["status"] = "pending"
+		with transaction.atomic():
+			# The ledger delta is computed from the locked row, so a concurrent write
+			# to this subtask applies after this one instead of from the same load.
+			subtask = self.get_object(lock=True)
+
+			# Auto-reset postponed subtasks to pending when rescheduled.
+			if subtask.status == "postponed" and "target_date" in data:
+				data["status"] = "pending"
+
+			old_load, old_status = ledger.load_of(subtask), subtask.status
+			serializer = self.get_serializer(subtask, data=data, partial=True)
+			try:
+				serializer.is_valid(raise_exception=True)
+				with transaction.atomic():
+					serializer.save()
+					_record_subtask_change(
+						request.user.id, before=old_load, after=ledger.load_of(serializer.instance)
+					)
+					_log_progress(
+						[
+							Progress(
+								user=request.user,
+								activity=subtask.activity_id,
+								subtask=subtask,
+								status=serializer.instance.status,
+								note=note,
+							)
+						],
+						{subtask.pk: old_status},
+					)
+				return Response(serializer.data, status=status.HTTP_200_OK)
+			except ValidationError as e:
+				logger.warning("Subtask validation error on PATCH", extra={"errors": e.detail})
+				return Response(e.detail, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+			except Exception:
+				logger.exception("Unexpected error updating subtask")
+				return Response(
+					{"errors": {"server": "Internal server error"}},
+					status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+				)
+
+	@extend_schema(
+		summary="Move subtask",
+		description=(
+			"Reorder a subtask within its activity by placing it right after another "
+			"subtask (`after`), or first with `after: null`. Only the moved subtask is "
+			"written, except when its neighbours' ordering keys leave no room between "
+			"them; then the activity's subtasks are renumbered in one statement. "
+			"No Progress entry is recorded."
+		),
+		request=SubtaskMoveSerializer,
+		responses={200: SubtaskSerializer},
+		parameters=[
+			OpenApiParameter(
+				"activity_id", OpenApiTypes.INT, OpenApiParameter.PATH, description="Activity id"
+			),
+			OpenApiParameter(
+				"subtask_id", OpenApiTypes.INT, OpenApiParameter.PATH, description="Subtask id"
+			),
+		],
+		examples=[
+			OpenApiExample("Move after subtask 7", value={"after": 7}, request_only=True),
+			OpenApiExample("Move to the top", value={"after": None}, request_only=True),
+		],
+	)
+	def move(self, request, activity_id=None, subtask_id=None):
+		subtask = self.get_object()
+
+		serializer = SubtaskMoveSerializer(data=request.data)
+		if not serializer.is_valid():
+			return Response(serializer.errors, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
 
-		old_date = subtask.target_date
-		serializer = self.get_serializer(subtask, data=data, partial=True)
 		try:
-			serializer.is_valid(raise_exception=True)
 			with transaction.atomic():
-				serializer.save()
-				Progress.objects.create(
-					user=request.user,
+				ordering.move(subtask, serializer.validated_data["after"])
+				versions.bump([request.user.id])
+		except Subtask.DoesNotExist:
+			return Response(
+				{"errors": {"after": "There is no other subtask with such id in this activity"}},
+				status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+			)
+		return Response(SubtaskSerializer(subtask).data, status=status.HTTP_200_OK)
+
+
+class SubtaskBatchView(APIView):
+	"""
+	POST /subtasks/batch/ → update and delete many of the user's subtasks at once.
+	"""
+
+	permission_classes = [IsAuthenticated]
+
+	@extend_schema(
+		summary="Batch subtask changes",
+		description=(
+			"Apply a list of operations to subtasks of any of the user's activities in one "
+			"transaction. Each operation is either `update` (with `changes`, any fields "
+			"accepted by the subtask PATCH, and an optional `note`) or `delete`.\n\n"
+			"Operations are validated as a whole: if any subtask is missing (404) or any "
+			"change is invalid (422) nothing is written. Updates record a Progress entry like "
+			"the subtask PATCH, and postponed subtasks that are rescheduled go back to pending. "
+			"Conflicts are re-evaluated once for all affected dates."
+		),
+		request=SubtaskBatchSerializer,
+		responses={
+			200: inline_serializer(
+				name="SubtaskBatchResult",
+				fields={
+					"updated": SubtaskSerializer(many=True),
+					"deleted": drf_serializers.ListField(child=drf_serializers.IntegerField()),
+				},
+			)
+		},
+		examples=[
+			OpenApiExample(
+				"Reschedule and clean up",
+				value={
+					"operations": [
+						{"id": 11, "action": "update", "changes": {"target_date": "2026-03-09"}},
+						{
+							"id": 12,
+							"action": "update",
+							"changes": {"status": "completed"},
+							"note": "Done early",
+						},
+						{"id": 13, "action": "delete"},
+					]
+				},
+				request_only=True,
+			),
+		],
+	)
+	def post(self, request):
+		batch = SubtaskBatchSerializer(data=request.data)
+		if not batch.is_valid():
+			return Response(batch.errors, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+		operations = batch.validated_data["operations"]
+
+		with transaction.atomic():
+			# Validation and ledger deltas work on locked rows, so concurrent writes to
+			# these subtasks wait for the batch instead of racing it. Locking in id order
+			# keeps two batches from deadlocking.
+			subtasks = (
+				Subtask.objects.filter(user=request.user)
+				.live()
+				.select_related("activity_id")
+				.select_for_update(of=("self",))
+				.order_by("pk")
+				.in_bulk([operation["id"] for operation in operations])
+			)
+			missing = [
+				operation["id"] for operation in operations if operation["id"] not in subtasks
+			]
+			if missing:
+				return Response(
+					{"errors": {"operations": f"No subtask of yours with id(s): {missing}"}},
+					status=status.HTTP_404_NOT_FOUND,
+				)
+
+			changes, errors = self._validate_changes(operations, subtasks)
+			if errors:
+				return Response(
+					{"errors": {"operations": errors}},
+					status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+				)
+
+			updated, deleted = self._apply(request.user, operations, subtasks, changes)
+		return Response(
+			{"updated": SubtaskSerializer(updated, many=True).data, "deleted": deleted},
+			status=status.HTTP_200_OK,
+		)
+
+	@staticmethod
+	def _validate_changes(operations, subtasks):
+		"""Validate every update against its subtask; errors are keyed by operation index."""
+		changes, errors = {}, {}
+		for index, operation in enumerate(operations):
+			if operation["action"] != SubtaskOperationSerializer.ACTION_UPDATE:
+				continue
+			subtask = subtasks[operation["id"]]
+			data = dict(operation["changes"])
+			# Auto-reset postponed subtasks to pending when rescheduled (as PATCH does).
+			if subtask.status == "postponed" and "target_date" in data:
+				data["status"] = "pending"
+			serializer = SubtaskSerializer(
+				subtask, data=data, partial=True, context={"activity": subtask.activity_id}
+			)
+			if serializer.is_valid():
+				changes[subtask.pk] = serializer.validated_data
+			else:
+				errors[str(index)] = serializer.errors.get("errors", serializer.errors)
+		return changes, errors
+
+	@staticmethod
+	def _apply(user, operations, subtasks, changes):
+		"""
+		Write all operations with bulk statements, inside the transaction holding the
+		rows' locks. Updates are grouped by the fields they change, so no statement
+		writes a field an operation did not touch.
+		"""
+		now = timezone.now()
+		moves, updated, deleted, entries = [], [], [], []
+		previous_statuses = {}
+		by_fields: dict[tuple[str, ...], list[Subtask]] = defaultdict(list)
+		for operation in operations:
+			subtask = subtasks[operation["id"]]
+			before = ledger.load_of(subtask)
+			if operation["action"] == SubtaskOperationSerializer.ACTION_DELETE:
+				moves.append((before, None))
+				deleted.append(subtask.pk)
+				continue
+			previous_statuses[subtask.pk] = subtask.status
+			for field, value in changes[subtask.pk].items():
+				setattr(subtask, field, value)
+			subtask.updated_at = now
+			moves.append((before, ledger.load_of(subtask)))
+			updated.append(subtask)
+			by_fields[tuple(sorted({"updated_at", *changes[subtask.pk]}))].append(subtask)
+			entries.append(
+				Progress(
+					user=user,
 					activity=subtask.activity_id,
 					subtask=subtask,
-					status=serializer.instance.status,
-					note=note,
+					status=subtask.status,
+					note=operation["note"].strip(),
 				)
-			new_date: date = serializer.instance.target_date
-			_evaluate_day_conflicts(request.user, new_date)
-			if old_date != new_date:
-				_evaluate_day_conflicts(request.user, old_date)
-			return Response(serializer.data, status=status.HTTP_200_OK)
-		except ValidationError as e:
-			logger.warning("Subtask validation error on PATCH", extra={"errors": e.detail})
-			return Response(e.detail, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
-		except Exception:
-			logger.exception("Unexpected error updating subtask")
-			return Response(
-				{"errors": {"server": "Internal server error"}},
-				status=status.HTTP_500_INTERNAL_SERVER_ERROR,
 			)
 
+		for fields, group in by_fields.items():
+			Subtask.objects.bulk_update(group, fields)
+		_log_progress(entries, previous_statuses)
+		Subtask.objects.filter(pk__in=deleted).delete()
+		# One batch of ledger deltas, so the affected dates are queued for a
+		# single conflict pass.
+		ledger.record_changes(user.id, moves)
+		versions.bump([user.id])
+		return updated, deleted
+
 
 _VALID_TODAY_STATUSES = frozenset({"vencidas", "hoy", "proximas"})
+_TODAY_BUCKETS = ("overdue", "today", "upcoming")
+_TODAY_STATUS_BUCKETS = {"vencidas": "overdue", "hoy": "today", "proximas": "upcoming"}
+_TODAY_ORDERING = ("target_date", "estimated_hours", "id")
+TODAY_DEFAULT_LIMIT = 50
+TODAY_MAX_LIMIT = 200
 
+_TODAY_CURSOR_PARSERS = (date.fromisoformat, int, int)
 
-class TodayView(APIView):
+
+class TodayView(AsyncDispatchMixin, APIView):
 	permission_classes = [IsAuthenticated]
 
 	@staticmethod
@@ -838,32 +1332,84 @@ class TodayView(APIView):
 				"Invalid value. Must be one of: " + ", ".join(sorted(_VALID_TODAY_STATUSES)),
 			)
 
-		return n_days, course_id, status_param
+		page = self._parse_today_page(request)
+		if isinstance(page, Response):
+			return page
+
+		return n_days, course_id, status_param, page
+
+	def _parse_today_page(self, request):
+		try:
+			limit = parse_limit(
+				request.query_params.get("limit"), TODAY_DEFAULT_LIMIT, TODAY_MAX_LIMIT
+			)
+		except ValueError:
+			return self._bad_request(
+				"limit", f"Must be an integer between 1 and {TODAY_MAX_LIMIT}."
+			)
+
+		cursors = {}
+		for bucket in _TODAY_BUCKETS:
+			cursor_param = request.query_params.get(f"{bucket}_cursor")
+			if cursor_param is None:
+				continue
+			try:
+				after = decode_cursor(cursor_param, _TODAY_CURSOR_PARSERS)
+				cursors[bucket] = rows_after(_TODAY_ORDERING, after)
+			except ValueError:
+				return self._bad_request(f"{bucket}_cursor", "Invalid cursor.")
+
+		return limit, cursors
 
 	@staticmethod
-	def _build_today_buckets(qs, today, upcoming_limit, status_param):
-		show_all = status_param is None
-		overdue = (
-			list(qs.filter(target_date__lt=today).order_by("target_date", "estimated_hours"))
-			if show_all or status_param == "vencidas"
-			else []
-		)
-		today_tasks = (
-			list(qs.filter(target_date=today).order_by("estimated_hours"))
-			if show_all or status_param == "hoy"
-			else []
-		)
-		upcoming = (
-			list(
-				qs.filter(target_date__gt=today, target_date__lte=upcoming_limit).order_by(
-					"target_date", "estimated_hours"
+	def _today_rows(qs, today, upcoming_limit, status_param, page):
+		# Each requested bucket is a keyset page: the rows after its cursor in
+		# (target_date, estimated_hours, id) order, capped at limit + 1 so we know
+		# whether another page exists. The pages are combined into one query, each
+		# row is tagged with its bucket by a CASE expression and partitioned by
+		# _split_buckets.
+		limit, cursors = page
+		windows = {
+			"overdue": Q(target_date__lt=today),
+			"today": Q(target_date=today),
+			"upcoming": Q(target_date__gt=today, target_date__lte=upcoming_limit),
+		}
+		names = [_TODAY_STATUS_BUCKETS[status_param]] if status_param else _TODAY_BUCKETS
+		pages = Q()
+		for name in names:
+			page_ids = (
+				qs.filter(windows[name], cursors.get(name, Q()))
+				.order_by(*_TODAY_ORDERING)
+				.values("id")[: limit + 1]
+			)
+			pages |= Q(id__in=page_ids)
+		return (
+			qs.filter(pages)
+			.annotate(
+				bucket=Case(
+					When(target_date__lt=today, then=Value(0)),
+					When(target_date=today, then=Value(1)),
+					default=Value(2),
+					output_field=IntegerField(),
 				)
 			)
-			if show_all or status_param == "proximas"
-			else []
+			.order_by(*_TODAY_ORDERING)
 		)
 
-		return overdue, today_tasks, upcoming
+	@staticmethod
+	def _split_buckets(rows, limit):
+		buckets = {name: [] for name in _TODAY_BUCKETS}
+		for subtask in rows:
+			buckets[_TODAY_BUCKETS[subtask.bucket]].append(subtask)
+
+		next_cursors = dict.fromkeys(_TODAY_BUCKETS)
+		for name, rows_in_bucket in buckets.items():
+			if len(rows_in_bucket) > limit:
+				del rows_in_bucket[limit:]
+				last = rows_in_bucket[-1]
+				next_cursors[name] = encode_cursor(getattr(last, f) for f in _TODAY_ORDERING)
+
+		return buckets, next_cursors
 
 	@extend_schema(
 		summary="Today view",
@@ -874,6 +1420,9 @@ class TodayView(APIView):
 			"- `courseId`: filter by subject/course ID (positive integer).\n"
 			"- `status`: restrict to a single bucket — `vencidas`, `hoy`, or `proximas`.\n\n"
 			"Ordering: overdue → oldest first; today → least hours first; upcoming → nearest first."
+			"\n\nEach bucket is paginated independently: at most `limit` subtasks are returned per "
+			"bucket, and `meta.next.<bucket>` holds the cursor for the next page (null on the "
+			"last page). Pass it back as `overdue_cursor`, `today_cursor` or `upcoming_cursor`."
 		),
 		parameters=[
 			OpenApiParameter(
@@ -900,6 +1449,26 @@ class TodayView(APIView):
 					"Return only one bucket: vencidas (overdue), hoy (today), proximas (upcoming)."
 				),
 			),
+			OpenApiParameter(
+				"limit",
+				OpenApiTypes.INT,
+				OpenApiParameter.QUERY,
+				required=False,
+				description=(
+					f"Maximum subtasks per bucket (1-{TODAY_MAX_LIMIT}, "
+					f"default {TODAY_DEFAULT_LIMIT})."
+				),
+			),
+			*(
+				OpenApiParameter(
+					f"{bucket}_cursor",
+					OpenApiTypes.STR,
+					OpenApiParameter.QUERY,
+					required=False,
+					description=f"Continue the {bucket} bucket from meta.next.{bucket}.",
+				)
+				for bucket in _TODAY_BUCKETS
+			),
 		],
 		responses=OpenApiTypes.OBJECT,
 		examples=[
@@ -909,56 +1478,306 @@ class TodayView(APIView):
 					"overdue": [],
 					"today": [],
 					"upcoming": [],
-					"meta": {"n_days": 7, "filters": {"courseId": None, "status": None}},
+					"meta": {
+						"n_days": 7,
+						"limit": TODAY_DEFAULT_LIMIT,
+						"next": {"overdue": None, "today": None, "upcoming": None},
+						"filters": {"courseId": None, "status": None},
+					},
 				},
 				response_only=True,
 			),
 		],
 	)
+	@_conditional_get(_today_etag)
 	def get(self, request):
-		try:
-			parsed_filters = self._parse_today_filters(request)
-			if isinstance(parsed_filters, Response):
-				return parsed_filters
-			n_days, course_id, status_param = parsed_filters
+		return today_cache.respond(request.etag, lambda: self._today_response(request))
 
-			today = timezone.localdate()
-			upcoming_limit = today + timedelta(days=n_days)
+	@_conditional_get(_today_etag)
+	async def aget(self, request):
+		return await today_cache.arespond(request.etag, lambda: self._atoday_response(request))
 
-			# Base queryset — always scoped to the authenticated user
-			qs = Subtask.objects.filter(activity_id__user=request.user).select_related(
-				"activity_id"
+	def _today_response(self, request):
+		try:
+			query = self._today_query(request)
+			if isinstance(query, Response):
+				return query
+			rows, filters = query
+			return self._today_payload(rows.iterator(chunk_size=500), *filters)
+		except Exception:
+			return self._server_error()
+
+	async def _atoday_response(self, request):
+		try:
+			query = self._today_query(request)
+			if isinstance(query, Response):
+				return query
+			rows, filters = query
+			return self._today_payload(
+				[row async for row in rows.aiterator(chunk_size=500)], *filters
 			)
+		except Exception:
+			return self._server_error()
 
-			# Apply courseId filter at DB level
-			if course_id is not None:
-				qs = qs.filter(activity_id__subject_id=course_id)
+	def _today_query(self, request):
+		"""The query for the requested bucket pages and the parsed filters, or a 400."""
+		parsed_filters = self._parse_today_filters(request)
+		if isinstance(parsed_filters, Response):
+			return parsed_filters
+		n_days, course_id, status_param, page = parsed_filters
 
-			overdue, today_tasks, upcoming = self._build_today_buckets(
-				qs, today, upcoming_limit, status_param
-			)
+		today = timezone.localdate()
+		upcoming_limit = today + timedelta(days=n_days)
 
-			return Response(
-				{
-					"overdue": TodaySubtaskSerializer(overdue, many=True).data,
-					"today": TodaySubtaskSerializer(today_tasks, many=True).data,
-					"upcoming": TodaySubtaskSerializer(upcoming, many=True).data,
-					"meta": {
-						"n_days": n_days,
-						"filters": {
-							"courseId": course_id,
-							"status": status_param,
-						},
+		# Base queryset — always scoped to the authenticated user
+		qs = Subtask.objects.filter(user=request.user).live().select_related("activity_id")
+
+		# Apply courseId filter at DB level
+		if course_id is not None:
+			qs = qs.filter(activity_id__subject_id=course_id)
+
+		rows = self._today_rows(qs, today, upcoming_limit, status_param, page)
+		return rows, (n_days, course_id, status_param, page[0])
+
+	def _today_payload(self, rows, n_days, course_id, status_param, limit):
+		buckets, next_cursors = self._split_buckets(rows, limit)
+		return Response(
+			{
+				**{
+					name: TodaySubtaskSerializer(page, many=True).data
+					for name, page in buckets.items()
+				},
+				"meta": {
+					"n_days": n_days,
+					"limit": limit,
+					"next": next_cursors,
+					"filters": {
+						"courseId": course_id,
+						"status": status_param,
 					},
-				}
+				},
+			}
+		)
+
+	@staticmethod
+	def _server_error():
+		logger.exception("Unexpected error generating today view")
+		return Response(
+			{"errors": {"server": "Internal server error"}},
+			status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+		)
+
+
+class DashboardSummaryView(APIView):
+	"""
+	GET /dashboard/summary/ → completion, hours and overdue aggregates for the dashboard.
+	"""
+
+	permission_classes = [IsAuthenticated]
+
+	@extend_schema(
+		summary="Dashboard summary",
+		description=(
+			"Return the authenticated user's completion statistics, aggregated by the "
+			"database: overall totals, one row per activity and one per subject (activities "
+			"without a linked subject are grouped by course name), plus the number of "
+			"pending conflicts. A subtask is overdue when it is not completed and its target "
+			"date has passed. An activity is completed when all of its subtasks are, or when "
+			"it has none and its status is `completed`."
+		),
+		responses=OpenApiTypes.OBJECT,
+		examples=[
+			OpenApiExample(
+				"Summary",
+				value={
+					"totals": {
+						"activities": 1,
+						"completed_activities": 0,
+						"total_subtasks": 4,
+						"completed_subtasks": 1,
+						"total_hours": 10,
+						"completed_hours": 2,
+						"overdue_subtasks": 1,
+						"completion_percent": 25,
+					},
+					"pending_conflicts": 0,
+					"activities": [
+						{
+							"id": 1,
+							"title": "Parcial 1",
+							"status": "in_progress",
+							"due_date": "2026-03-10",
+							"subject_id": 1,
+							"course_name": "Cálculo III",
+							"total_subtasks": 4,
+							"completed_subtasks": 1,
+							"total_hours": 10,
+							"completed_hours": 2,
+							"overdue_subtasks": 1,
+							"completion_percent": 25,
+						}
+					],
+					"subjects": [
+						{
+							"subject_id": 1,
+							"course_name": "Cálculo III",
+							"activities": 1,
+							"total_subtasks": 4,
+							"completed_subtasks": 1,
+							"total_hours": 10,
+							"completed_hours": 2,
+							"overdue_subtasks": 1,
+							"completion_percent": 25,
+						}
+					],
+				},
+				response_only=True,
+			),
+		],
+	)
+	@_conditional_get(_dashboard_etag)
+	def get(self, request):
+		return Response(dashboard.summary(request.user, timezone.localdate()))
+
+
+PROGRESS_DEFAULT_DAYS = 30
+PROGRESS_MAX_DAYS = 366
+
+
+class ProgressView(APIView):
+	"""
+	GET /progress/ → the authenticated user's completed work per day and subject.
+	"""
+
+	permission_classes = [IsAuthenticated]
+
+	@staticmethod
+	def _parse_range(params) -> tuple[date, date]:
+		bounds = {}
+		for param in ("from", "to"):
+			if param in params:
+				try:
+					bounds[param] = date.fromisoformat(params[param])
+				except ValueError as err:
+					raise ParseError({"errors": {param: "Must be a date (YYYY-MM-DD)."}}) from err
+		end = bounds.get("to", timezone.localdate())
+		start = bounds.get("from", end - timedelta(days=PROGRESS_DEFAULT_DAYS - 1))
+		if start > end:
+			raise ParseError({"errors": {"from": "Must not be later than 'to'."}})
+		if (end - start).days >= PROGRESS_MAX_DAYS:
+			raise ParseError(
+				{"errors": {"to": f"The range may span at most {PROGRESS_MAX_DAYS} days."}}
 			)
+		return start, end
 
-		except Exception:
-			logger.exception("Unexpected error generating today view")
-			return Response(
-				{"errors": {"server": "Internal server error"}},
-				status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+	@extend_schema(
+		summary="Progress",
+		description=(
+			"Return completed subtasks, hours completed and status transitions of the "
+			"authenticated user for every day of a date range, with totals per subject and "
+			"for the whole range. Served from daily rollups, so the cost depends on the "
+			"range, not on how much history exists.\n\n"
+			f"- `from` / `to`: inclusive range (default: the last {PROGRESS_DEFAULT_DAYS} days "
+			f"up to today; at most {PROGRESS_MAX_DAYS} days).\n"
+			"- `subject`: only count activities linked to this subject id.\n\n"
+			"Activities without a subject are reported under `subject_id: null`."
+		),
+		parameters=[
+			OpenApiParameter(
+				"from",
+				OpenApiTypes.DATE,
+				OpenApiParameter.QUERY,
+				required=False,
+				description="First day of the range.",
+			),
+			OpenApiParameter(
+				"to",
+				OpenApiTypes.DATE,
+				OpenApiParameter.QUERY,
+				required=False,
+				description="Last day of the range (default: today).",
+			),
+			OpenApiParameter(
+				"subject",
+				OpenApiTypes.INT,
+				OpenApiParameter.QUERY,
+				required=False,
+				description="Only count activities linked to this subject id.",
+			),
+		],
+		responses=OpenApiTypes.OBJECT,
+		examples=[
+			OpenApiExample(
+				"Two days",
+				value={
+					"from": "2026-03-01",
+					"to": "2026-03-02",
+					"totals": {"completed_subtasks": 2, "hours_completed": 5, "transitions": 3},
+					"days": [
+						{
+							"date": "2026-03-01",
+							"completed_subtasks": 2,
+							"hours_completed": 5,
+							"transitions": 3,
+						},
+						{
+							"date": "2026-03-02",
+							"completed_subtasks": 0,
+							"hours_completed": 0,
+							"transitions": 0,
+						},
+					],
+					"subjects": [
+						{
+							"subject_id": 1,
+							"subject_name": "Cálculo III",
+							"completed_subtasks": 2,
+							"hours_completed": 5,
+							"transitions": 3,
+						}
+					],
+				},
+				response_only=True,
+			),
+		],
+	)
+	@_conditional_get(_today_etag)
+	def get(self, request):
+		start, end = self._parse_range(request.query_params)
+		rows = ProgressRollup.objects.filter(user=request.user, date__range=(start, end))
+		if "subject" in request.query_params:
+			rows = rows.filter(subject_id=_positive_int_param(request.query_params, "subject"))
+
+		def empty() -> dict[str, int]:
+			return dict.fromkeys(rollups.COUNTERS, 0)
+
+		totals = empty()
+		days = {start + timedelta(days=i): empty() for i in range((end - start).days + 1)}
+		per_subject = {}
+		for row in rows.select_related("subject").order_by("date", "subject_id"):
+			subject = per_subject.setdefault(
+				row.subject_id,
+				{
+					"subject_id": row.subject_id,
+					"subject_name": row.subject.name if row.subject else None,
+					**empty(),
+				},
 			)
+			for counter in rollups.COUNTERS:
+				value = getattr(row, counter)
+				totals[counter] += value
+				days[row.date][counter] += value
+				subject[counter] += value
+
+		return Response(
+			{
+				"from": start,
+				"to": end,
+				"totals": totals,
+				"days": [{"date": day, **counts} for day, counts in days.items()],
+				"subjects": list(per_subject.values()),
+			}
+		)
 
 
 class SubjectViewSet(viewsets.ModelViewSet):
@@ -1012,7 +1831,10 @@ class SubjectViewSet(viewsets.ModelViewSet):
 
 	@extend_schema(
 		summary="Create subject",
-		description="Create a new academic subject.",
+		description=(
+			"Create a new academic subject and assign it to the caller; their activities "
+			"whose course name matches it are linked to it."
+		),
 		request=SubjectSerializer,
 		responses={201: SubjectSerializer},
 		examples=[
@@ -1033,7 +1855,10 @@ class SubjectViewSet(viewsets.ModelViewSet):
 		if not serializer.is_valid():
 			return Response(serializer.errors, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
 
-		serializer.save()
+		with transaction.atomic():
+			subject = serializer.save()
+			# The creator's activities named like the subject link to it (see subjects.py).
+			UserSubject.objects.create(user=request.user, subject=subject)
 		return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 	@extend_schema(
@@ -1073,10 +1898,9 @@ class SubjectViewSet(viewsets.ModelViewSet):
 		serializer.save()
 		new_name = serializer.data["name"]
 
-		# Propagate rename to all activities that used this subject's name
+		# Propagate the rename to the activities linked to this subject
 		if old_name != new_name:
-			Activity.objects.filter(course_name=old_name).update(course_name=new_name)
-			Activity.objects.filter(subject=subject).update(course_name=new_name)
+			subjects.rename(subject, new_name)
 
 		return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -1117,16 +1941,18 @@ class SubjectViewSet(viewsets.ModelViewSet):
 		serializer.save()
 		new_name = serializer.data["name"]
 
-		# Propagate rename to all activities that used this subject's name
+		# Propagate the rename to the activities linked to this subject
 		if old_name != new_name:
-			Activity.objects.filter(course_name=old_name).update(course_name=new_name)
-			Activity.objects.filter(subject=subject).update(course_name=new_name)
+			subjects.rename(subject, new_name)
 
 		return Response(serializer.data, status=status.HTTP_200_OK)
 
 	@extend_schema(
 		summary="Delete subject",
-		description="Delete a subject and all its activities and subtasks (cascade).",
+		description=(
+			"Delete a subject and all its activities and subtasks (cascade). "
+			"Its /progress/ history is kept under no subject."
+		),
 		responses={204: None},
 		parameters=[
 			OpenApiParameter(
@@ -1137,28 +1963,11 @@ class SubjectViewSet(viewsets.ModelViewSet):
 	def destroy(self, request, *args, **kwargs):
 		try:
 			subject = self.get_object()
-			affected_dates = list(
-				Subtask.objects.filter(
-					activity_id__course_name=subject.name, activity_id__user=request.user
-				)
-				.values_list("target_date", flat=True)
-				.distinct()
-			)
-			affected_dates.extend(
-				list(
-					Subtask.objects.filter(
-						activity_id__subject=subject, activity_id__user=request.user
-					)
-					.values_list("target_date", flat=True)
-					.distinct()
-				)
-			)
-			# Cascade: delete all activities matching by name or FK (subtasks cascade automatically)
-			Activity.objects.filter(course_name=subject.name).delete()
-			Activity.objects.filter(subject=subject).delete()
-			subject.delete()
-			for affected_date in set(affected_dates):
-				_evaluate_day_conflicts(request.user, affected_date)
+			with transaction.atomic():
+				# Hide the linked activities now; purge_deleted removes them and their subtasks.
+				purge.soft_delete(Activity.objects.filter(subject=subject))
+				# Completed work stays in /progress/, under no subject (planner/signals.py).
+				subject.delete()
 			return Response(status=status.HTTP_204_NO_CONTENT)
 		except Http404 as err:
 			raise NotFound(detail={"errors": {"resource": "Subject not found"}}) from err
@@ -1170,7 +1979,7 @@ class SubjectViewSet(viewsets.ModelViewSet):
 			)
 
 
-class ConflictViewSet(viewsets.ReadOnlyModelViewSet):
+class ConflictViewSet(AsyncReadMixin, viewsets.ReadOnlyModelViewSet):
 	"""
 	Read-only endpoints for the authenticated user's pending overload conflicts.
 	GET /conflicts/      → list all pending conflicts
@@ -1189,7 +1998,7 @@ class ConflictViewSet(viewsets.ReadOnlyModelViewSet):
 		summary="List conflicts",
 		description=(
 			"Return all pending overload conflicts for the authenticated user. "
-			"Re-evaluates live state before responding."
+			"Re-evaluates the dates whose load changed since the last read before responding."
 		),
 		responses=ConflictSerializer(many=True),
 		examples=[
@@ -1209,18 +2018,16 @@ class ConflictViewSet(viewsets.ReadOnlyModelViewSet):
 			)
 		],
 	)
+	@_conditional_get(_conflicts_etag)
 	def list(self, request, *args, **kwargs):
-		# Re-evaluate every date that has subtasks before returning, so the
-		# response always reflects the current state (no stale resolved/pending).
-		dates = list(
-			Subtask.objects.filter(activity_id__user=request.user)
-			.values_list("target_date", flat=True)
-			.distinct()
-		)
-		for d in dates:
-			_evaluate_day_conflicts(request.user, d)
+		# The dates changed since the last read were re-evaluated while computing the
+		# ETag, so the response always reflects the current state.
 		return super().list(request, *args, **kwargs)
 
+	@_conditional_get(_conflicts_etag)
+	async def alist(self, request, *args, **kwargs):
+		return await super().alist(request, *args, **kwargs)
+
 	@extend_schema(
 		summary="Retrieve conflict",
 		description="Get a single conflict by id.",
@@ -1232,8 +2039,13 @@ class ConflictViewSet(viewsets.ReadOnlyModelViewSet):
 		],
 	)
 	def retrieve(self, request, *args, **kwargs):
+		conflicts.reconcile(request.user)
 		return super().retrieve(request, *args, **kwargs)
 
+	async def aretrieve(self, request, *args, **kwargs):
+		await sync_to_async(conflicts.reconcile)(request.user)
+		return await super().aretrieve(request, *args, **kwargs)
+
 	@extend_schema(
 		summary="Resolve conflict",
 		description=(
@@ -1259,6 +2071,7 @@ class ConflictViewSet(viewsets.ReadOnlyModelViewSet):
 	)
 	@action(detail=True, methods=["post"], url_path="resolve")
 	def resolve(self, request, pk=None):
+		conflicts.reconcile(request.user)
 		conflict = self.get_object()
 
 		if conflict.status == "resolved":
@@ -1275,17 +2088,22 @@ class ConflictViewSet(viewsets.ReadOnlyModelViewSet):
 		action_type: str = data["action_type"]
 		subtask_id: int = data["subtask_id"]
 
-		try:
-			subtask = Subtask.objects.get(id=subtask_id, activity_id__user=request.user)
-		except Subtask.DoesNotExist:
-			return Response(
-				{"errors": {"subtask_id": "Subtask not found or does not belong to you."}},
-				status=status.HTTP_404_NOT_FOUND,
-			)
-
-		old_date: date = subtask.target_date
-
 		with transaction.atomic():
+			# Locked so the ledger delta below starts from the committed load.
+			try:
+				subtask = (
+					Subtask.objects.live()
+					.select_for_update(of=("self",))
+					.get(id=subtask_id, user=request.user)
+				)
+			except Subtask.DoesNotExist:
+				return Response(
+					{"errors": {"subtask_id": "Subtask not found or does not belong to you."}},
+					status=status.HTTP_404_NOT_FOUND,
+				)
+
+			old_date: date = subtask.target_date
+			old_load = ledger.load_of(subtask)
 			if action_type == "reduce_hours":
 				subtask.estimated_hours = data["new_hours"]
 				subtask.save(update_fields=["estimated_hours", "updated_at"])
@@ -1295,6 +2113,7 @@ class ConflictViewSet(viewsets.ReadOnlyModelViewSet):
 				subtask.target_date = new_date
 				subtask.save(update_fields=["target_date", "updated_at"])
 				description = f"Rescheduled subtask from {old_date} to {new_date}."
+			_record_subtask_change(request.user.id, before=old_load, after=ledger.load_of(subtask))
 
 			from .models import ConflictResolution
 
@@ -1304,11 +2123,9 @@ class ConflictViewSet(viewsets.ReadOnlyModelViewSet):
 				defaults={"action": action_type, "description": description},
 			)
 
-		# Re-evaluate the affected date(s). _evaluate_day_conflicts decides
+		# Re-evaluate the affected date(s) the ledger marked dirty. This decides
 		# whether to keep the conflict pending (still overloaded) or resolve it.
-		_evaluate_day_conflicts(request.user, old_date)
-		if action_type == "reschedule":
-			_evaluate_day_conflicts(request.user, data["new_date"])
+		conflicts.reconcile(request.user)
 
 		# Return the conflict's current state so the frontend knows whether
 		# it's fully resolved or still pending with updated planned_hours.